@@ -23,10 +23,10 @@ velocity = particles >> DOMAIN.staggered_grid()
 pressure = DOMAIN.scalar_grid()
 scene = particles & _OBSTACLE_POINTS * (0, 0)  # only for plotting
 
-for _ in view(display='scene', play=False).range():
+for frame in view(display='scene', play=False).range():
     div_free_velocity, _, occupied = flip.make_incompressible(velocity + DT * GRAVITY, DOMAIN, particles, ACCESSIBLE_MASK)
     particles = flip.map_velocity_to_particles(particles, div_free_velocity, occupied, previous_velocity_grid=velocity)
     particles = advect.runge_kutta_4(particles, div_free_velocity, DT, accessible=ACCESSIBLE_MASK, occupied=occupied)
-    particles = flip.respect_boundaries(particles, DOMAIN, [OBSTACLE])
+    particles = flip.respect_boundaries(particles, DOMAIN, [OBSTACLE], sort=frame % 10 == 0)
     velocity = particles >> DOMAIN.staggered_grid()
     scene = particles & _OBSTACLE_POINTS * (0, 0)
@@ -12,12 +12,12 @@ c1 = 0.1  # adiabatic coefficient [0, None]
 # Numerical Parameters
 arakawa_coeff = 1  # Poisson bracket coefficient
 kappa_coeff = 1  # background flow dy coefficient
-nu = 0.0005  # coefficient of hyperdiffusion
+nu = 0.0005  # coefficient of hyperdiffusion in grid units
 N = 3  # laplace**(2*N) diffusion
 # Derived
 L = 2 * np.pi / k0  # Box Size
 dx = L / x  # Grid Spacing
-nu = (-1) ** (N + 1) * nu  # Smoothing coefficient & sign
+nu = (-1) ** (N + 1) * nu * dx ** N  # Smoothing coefficient & sign, field.laplace divides by dx**2
 # Packing
 PARAMS = dict(c1=c1, nu=nu, N=N, arak=arakawa_coeff, kappa=kappa_coeff)
 
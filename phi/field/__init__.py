@@ -7,6 +7,8 @@ The most important field types are:
 
 * `CenteredGrid` embeds a tensor in the physical space. Uses linear interpolation between grid points.
 * `StaggeredGrid` samples the vector components at face centers instead of at cell centers.
+* `SparseGrid` only stores the values of active tiles, e.g. for narrow-band liquids.
+* `AMRGrid` refines a `CenteredGrid` locally using nested levels of patches.
 * `Noise` is a function that produces a procedurally generated noise field
 
 Use `grid()` to create a `Grid` from data or by sampling another `Field` or `phi.geom.Geometry`.
@@ -21,6 +23,8 @@ from ._field import Field, SampledField, unstack, sample, reduce_sample
 from ._constant import ConstantField
 from ._mask import HardGeometryMask, SoftGeometryMask as GeometryMask, SoftGeometryMask
 from ._grid import Grid, CenteredGrid, StaggeredGrid
+from ._sparse import SparseGrid
+from ._amr import AMRGrid
 from ._point_cloud import PointCloud
 from ._noise import Noise
 from ._angular_velocity import AngularVelocity
@@ -29,6 +33,7 @@ from phi.math import (
     stop_gradient,
     jit_compile, jit_compile_linear, functional_gradient,
     solve_linear, solve_nonlinear, minimize,
+    parallel_map,
     l2_loss, l1_loss, frequency_loss,
 )
 from ._field_math import (
@@ -46,6 +51,7 @@ from ._field_math import (
     integrate,
 )
 from ._field_io import write, read
+from ._checkpoint import write_checkpoint, read_checkpoint
 from ._scene import Scene
 
 __all__ = [key for key in globals().keys() if not key.startswith('_')]
@@ -0,0 +1,516 @@
+import copy
+from typing import Any, Callable, Tuple
+
+import numpy as np
+
+from phi import math
+from phi.geom import Box, Geometry
+from ._field import SampledField, Field, reduce_sample
+from ._grid import CenteredGrid
+from ._mask import HardGeometryMask
+from ..geom._box import Cuboid
+from ..geom._stack import GeometryStack
+from ..math import Shape, Tensor, extrapolation as extrapolation_
+from ..math._shape import spatial, channel, collection, EMPTY_SHAPE
+
+
+class AMRGrid(SampledField):
+    """
+    Block-structured adaptive mesh refinement (AMR) grid with values sampled at the cell centers.
+
+    The grid consists of multiple levels of `CenteredGrid` patches.
+    Level 0 covers the whole domain at the base resolution.
+    Each finer level halves the cell size and consists of rectangular patches made up of blocks of `block_size` cells.
+    Patches of level *l+1* are properly nested inside level *l*, leaving at least one coarse cell between the fine patches and the boundary of the coarser level.
+
+    The values of all cells, including the coarse cells covered by finer patches, are stored in a single `Tensor` with the collection dimension `cells`.
+    Covered coarse cells hold the average of their children, see `AMRGrid.average_down()`.
+    The patch hierarchy is structural and stored as NumPy arrays.
+    It is shared between all grids created using `with_values()`.
+
+    `phi.field.divergence()`, `phi.field.spatial_gradient()` and `phi.field.laplace()` use finite volume fluxes.
+    At coarse-fine interfaces, the flux of the coarse face is replaced by the sum of the fluxes of the fine faces covering it, so that the operators are conservative.
+    Fluxes across coarse-fine interfaces use a two-point approximation between the fine cell and the coarse cell, which is only first-order accurate but keeps the composite Laplace operator symmetric.
+    `phi.physics.fluid.make_incompressible()` solves the composite pressure equation on all levels at once.
+    """
+
+    def __init__(self,
+                 values: Any,
+                 extrapolation: float or math.Extrapolation = 0.,
+                 bounds: Box = None,
+                 resolution: Shape = None,
+                 criterion: Callable = None,
+                 levels: int = 1,
+                 block_size: int = 8,
+                 buffer: int = 1,
+                 **resolution_: int):
+        """
+        Args:
+            values: Values of the grid.
+                Has to be one of the following:
+
+                * `Field`: samples the field at the cell centers of all levels
+                * `phi.math.Tensor` with the spatial dimensions of the base resolution: interpolated to finer levels
+                * `phi.geom.Geometry`: sets inside values to 1, outside to 0
+                * `Number`: uses the value for all cells
+                * Function `values(x)` where `x` is a `phi.math.Tensor` representing the physical location.
+
+            extrapolation: Boundary condition of the domain, either constant or `phi.math.extrapolation.BOUNDARY`.
+            bounds: Physical size and location of the grid as `phi.geom.Box`.
+            resolution: Resolution of level 0 as purely spatial `phi.math.Shape`. Must be divisible by `block_size`.
+            criterion: Refinement criterion `criterion(grid: CenteredGrid) -> Tensor` returning a boolean `Tensor` that marks the cells of `grid` to refine.
+                `grid` is one patch of the grid.
+                Required if `levels > 1`.
+            levels: Number of refinement levels including the base level.
+            block_size: Number of cells per dimension in each block. Patches are composed of blocks. Must be even.
+            buffer: Number of cells by which flagged regions are grown before being covered by blocks.
+            **resolution_: Spatial dimensions as keyword arguments.
+        """
+        if not isinstance(extrapolation, math.Extrapolation):
+            extrapolation = extrapolation_.ConstantExtrapolation(extrapolation)
+        assert isinstance(extrapolation, extrapolation_.ConstantExtrapolation) or extrapolation == extrapolation_.BOUNDARY, f"AMR grids support constant and boundary extrapolation but got {extrapolation}"
+        if resolution is None and not resolution_:
+            assert isinstance(values, (Tensor, CenteredGrid)), "Grid resolution must be specified when 'values' is not a Tensor or CenteredGrid."
+            resolution = values.resolution if isinstance(values, CenteredGrid) else values.shape.spatial
+            bounds = bounds or (values.bounds if isinstance(values, CenteredGrid) else None)
+        else:
+            resolution = (resolution or EMPTY_SHAPE) & spatial(**resolution_)
+        bounds = bounds or Box(0, math.wrap(resolution, channel('vector')))
+        if isinstance(values, Tensor):
+            values = CenteredGrid(values, bounds=bounds, extrapolation=extrapolation_.BOUNDARY)
+        hierarchy = _Hierarchy(resolution, bounds, block_size, [(0, np.zeros(resolution.rank, int), np.array(resolution.sizes))])
+        SampledField.__init__(self, hierarchy.elements(), _sample_values(values, hierarchy), extrapolation)
+        self._hierarchy = hierarchy
+        for level in range(levels - 1):
+            assert criterion is not None, "A refinement criterion is required to create multiple levels"
+            self._hierarchy = self._hierarchy.refined(level, self._flags(criterion, level), buffer)
+            self._elements = self._hierarchy.elements()
+            self._values = _sample_values(values, self._hierarchy)
+        self._values = self.average_down().values
+
+    @property
+    def shape(self):
+        return self._values.shape
+
+    @property
+    def resolution(self) -> Shape:
+        """ Resolution of level 0. """
+        return self._hierarchy.resolution
+
+    @property
+    def bounds(self) -> Box:
+        return self._hierarchy.bounds
+
+    box = bounds
+
+    @property
+    def level_count(self) -> int:
+        return self._hierarchy.level_count
+
+    @property
+    def levels(self) -> Tuple[Tuple[CenteredGrid, ...], ...]:
+        """ Patches of all levels as `CenteredGrid`s, ordered from coarse to fine. Level 0 contains a single grid covering the domain. """
+        patches = [self._hierarchy.patch_grid(self._values, i, self._extrapolation) for i in range(len(self._hierarchy.patches))]
+        return tuple(tuple(p for p, (level, _, _) in zip(patches, self._hierarchy.patches) if level == l) for l in range(self.level_count))
+
+    @property
+    def cell_volumes(self) -> Tensor:
+        return math.wrap(self._hierarchy.volumes, collection('cells'))
+
+    @property
+    def covered(self) -> Tensor:
+        """ Boolean `Tensor` marking the cells that are covered by a finer level. """
+        return math.wrap(self._hierarchy.covered, collection('cells'))
+
+    def with_values(self, values):
+        assert values.shape.only(self._values.shape.non_batch.non_channel) == self._values.shape.non_batch.non_channel, f"Values {values.shape} do not match the cells {self._values.shape}"
+        result = copy.copy(self)
+        result._values = values
+        return result
+
+    def with_extrapolation(self, extrapolation: math.Extrapolation):
+        result = copy.copy(self)
+        result._extrapolation = extrapolation
+        return result
+
+    def __value_attrs__(self):
+        return '_values', '_extrapolation'
+
+    def __variable_attrs__(self):
+        return '_values',
+
+    def __getitem__(self, item: dict) -> 'AMRGrid':
+        assert 'cells' not in item and not any(dim in self.resolution for dim in item), f"AMR grids cannot be sliced along spatial dimensions but got {item}"
+        return self.with_values(self._values[item]).with_extrapolation(self._extrapolation[item])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}[{self._values.shape.non_collection & self.resolution}, levels={self.level_count}, patches={len(self._hierarchy.patches)}, cells={self._hierarchy.cell_count}, extrapolation={self._extrapolation}]"
+
+    def average_down(self) -> 'AMRGrid':
+        """
+        Replaces the values of covered cells by the mean of their children using `phi.field.downsample2x()`, starting at the finest level.
+
+        Returns:
+            `AMRGrid` with consistent values on all levels.
+        """
+        from ._field_math import downsample2x
+        values = self._values
+        for level in reversed(range(1, self.level_count)):
+            patches = [i for i, (l, _, _) in enumerate(self._hierarchy.patches) if l == level]
+            restricted = [downsample2x(self._hierarchy.patch_grid(values, i, extrapolation_.BOUNDARY)) for i in patches]
+            restricted = math.concat([math.join_dimensions(g.values, self.resolution.names, collection('cells')) for g in restricted], collection('cells'))
+            values = _take(math.concat([values, restricted], collection('cells')), self._hierarchy.restriction_indices(level), collection('cells'))
+        return self.with_values(values)
+
+    def regrid(self, criterion: Callable, levels: int = None, buffer: int = 1) -> 'AMRGrid':
+        """
+        Rebuilds the patches of all refined levels using `criterion`.
+
+        Cells that exist in both the old and new hierarchy keep their values.
+        New fine cells are initialized from the next coarser level using `phi.field.upsample2x()`.
+
+        Args:
+            criterion: Refinement criterion `criterion(grid: CenteredGrid) -> Tensor`, see `AMRGrid.__init__()`.
+            levels: Number of levels of the new grid. Defaults to the current number of levels.
+            buffer: Number of cells by which flagged regions are grown.
+
+        Returns:
+            New `AMRGrid`.
+        """
+        levels = self.level_count if levels is None else levels
+        result = self.with_values(self._values)
+        for level in range(levels - 1):
+            hierarchy = result._hierarchy.refined(level, result._flags(criterion, level), buffer)
+            values = math.concat([result._values, self._values, result._prolongate(hierarchy, level + 1)], collection('cells'))
+            values = _take(values, hierarchy.transfer_indices(result._hierarchy, self._hierarchy, level + 1), collection('cells'))
+            result._hierarchy, result._elements, result._values = hierarchy, hierarchy.elements(), values
+        return result.average_down()
+
+    def _flags(self, criterion: Callable, level: int) -> np.ndarray:
+        flags = np.zeros(self._hierarchy.cell_count, bool)
+        for i, (l, _, _) in enumerate(self._hierarchy.patches):
+            if l == level:
+                grid = self._hierarchy.patch_grid(self._values, i, self._extrapolation)
+                cells = math.join_dimensions(math.expand(math.wrap(criterion(grid)), grid.resolution), self.resolution.names, collection('cells'))
+                cells = math.any(cells, cells.shape.non_collection) if cells.shape.non_collection else cells
+                flags[self._hierarchy.offsets[i]:self._hierarchy.offsets[i + 1]] = cells.numpy('cells')
+        return flags
+
+    def _prolongate(self, hierarchy: '_Hierarchy', level: int) -> Tensor:
+        """ Interpolates the values of all cells of `level` in `hierarchy` from the existing coarser level of this grid. """
+        from ._field_math import upsample2x
+        prolongated = []
+        for level_, lower, upper in hierarchy.patches:
+            if level_ == level:
+                coarse_lower, coarse_upper = lower // 2 - 1, upper // 2 + 1
+                region = spatial(**{dim: int(n) for dim, n in zip(self.resolution.names, coarse_upper - coarse_lower)})
+                cells = np.stack(np.meshgrid(*[np.arange(lo, up) for lo, up in zip(coarse_lower, coarse_upper)], indexing='ij'), -1)
+                coarse = _take(self._values, self._hierarchy.find(level - 1, cells, clamp=True), region)
+                fine = upsample2x(CenteredGrid(coarse, extrapolation=extrapolation_.BOUNDARY)).values
+                fine = fine[{dim: slice(2, -2) for dim in self.resolution.names}]
+                prolongated.append(math.join_dimensions(fine, self.resolution.names, collection('cells')))
+        return math.concat(prolongated, collection('cells'))
+
+    def _sample(self, geometry: Geometry) -> Tensor:
+        if isinstance(geometry, GeometryStack):
+            sampled = [self._sample(g) for g in geometry.geometries]
+            return math.stack(sampled, geometry.stack_dim)
+        points = geometry.center
+        result = None
+        for i, (level, _, _) in enumerate(self._hierarchy.patches):
+            grid = self._hierarchy.patch_grid(self._values, i, self._extrapolation if level == 0 else extrapolation_.BOUNDARY)
+            sampled = reduce_sample(grid, geometry)
+            result = sampled if result is None else math.where(grid.bounds.lies_inside(points), sampled, result)
+        return result
+
+    def _padded_values(self) -> Tensor:
+        """ Values followed by the ghost value used for constant extrapolation. """
+        ghost_value = self._extrapolation.value if isinstance(self._extrapolation, extrapolation_.ConstantExtrapolation) else 0
+        with math.choose_backend(self._values):
+            ghost = math.zeros(self._values.shape.without('cells') & collection(cells=1)) + ghost_value
+        return math.concat([self._values, ghost], collection('cells'))
+
+    def _apply(self, stencil: tuple, values: Tensor) -> Tensor:
+        indices, coefficients = stencil
+        gathered = _take(values, indices, collection(cells=indices.shape[0], stencil_=indices.shape[1]))
+        return math.sum(gathered * math.wrap(coefficients, collection('cells,stencil_')), 'stencil_')
+
+    def _divergence(self, volume_weighted=False) -> 'AMRGrid':
+        """ With `volume_weighted=True`, returns the net fluxes of all cells without averaging down. """
+        ghost = self._extrapolation != extrapolation_.BOUNDARY
+        values = self._padded_values()
+        components = [self._apply(self._hierarchy.stencil('difference', dim, ghost, volume_weighted), values.vector[dim]) for dim in range(self.resolution.rank)]
+        result = self.with_values(sum(components)).with_extrapolation(self._extrapolation.spatial_gradient())
+        return result if volume_weighted else result.average_down()
+
+    def _gradient(self, stack_dim: Shape, average_down=True) -> 'AMRGrid':
+        ghost = self._extrapolation != extrapolation_.BOUNDARY
+        values = self._padded_values()
+        components = [self._apply(self._hierarchy.stencil('difference', dim, ghost), values) for dim in range(self.resolution.rank)]
+        result = self.with_values(math.stack(components, stack_dim)).with_extrapolation(self._extrapolation.spatial_gradient())
+        return result.average_down() if average_down else result
+
+    def _laplace(self, volume_weighted=False) -> 'AMRGrid':
+        """ With `volume_weighted=True`, returns the symmetric composite operator multiplied by the cell volumes, without averaging down. """
+        ghost = self._extrapolation != extrapolation_.BOUNDARY
+        values = self._padded_values()
+        laplace = sum([self._apply(self._hierarchy.stencil('laplace', dim, ghost, volume_weighted), values) for dim in range(self.resolution.rank)])
+        result = self.with_values(laplace).with_extrapolation(self._extrapolation.spatial_gradient())
+        return result if volume_weighted else result.average_down()
+
+
+class _Hierarchy:
+    """
+    Static patch structure of an `AMRGrid`.
+    Patches are given as `(level, lower, upper)` in cell indices of their level.
+    """
+
+    def __init__(self, resolution: Shape, bounds: Box, block_size: int, patches: list):
+        assert block_size % 2 == 0, f"block_size must be even but got {block_size}"
+        assert all(n % block_size == 0 for n in resolution.sizes), f"Resolution {resolution} must be divisible by the block size {block_size}"
+        self.resolution = resolution
+        self.bounds = bounds
+        self.block_size = block_size
+        self.patches = sorted(patches, key=lambda p: p[0])
+        self.level_count = self.patches[-1][0] + 1
+        self.lower = bounds.lower.numpy('vector') if 'vector' in bounds.lower.shape else np.zeros(resolution.rank) + bounds.lower.numpy()
+        self.size = bounds.size.numpy('vector') if 'vector' in bounds.size.shape else np.zeros(resolution.rank) + bounds.size.numpy()
+        self.offsets = np.cumsum([0] + [int(np.prod(upper - lower)) for _, lower, upper in self.patches])
+        self.cell_count = int(self.offsets[-1])
+        self.block_maps = [np.full(self.level_resolution(l) // block_size, -1, np.int64) for l in range(self.level_count)]
+        cell_level, cell_index = [], []
+        for i, (level, lower, upper) in enumerate(self.patches):
+            self.block_maps[level][tuple(slice(lo // block_size, up // block_size) for lo, up in zip(lower, upper))] = i
+            cell_level.append(np.full(int(np.prod(upper - lower)), level))
+            cell_index.append(np.stack(np.meshgrid(*[np.arange(lo, up) for lo, up in zip(lower, upper)], indexing='ij'), -1).reshape(-1, resolution.rank))
+        self.cell_level = np.concatenate(cell_level)
+        self.cell_index = np.concatenate(cell_index)
+        self.covered = np.zeros(self.cell_count, bool)
+        for level in range(self.level_count - 1):
+            at_level = self.cell_level == level
+            self.covered[at_level] = self.find(level + 1, self.cell_index[at_level] * 2) >= 0
+        self.volumes = np.prod(self.size / self.level_resolution(self.cell_level[:, None]), -1)
+        self._cache = {}
+
+    def level_resolution(self, level) -> np.ndarray:
+        return np.array(self.resolution.sizes) * 2 ** np.asarray(level)
+
+    def dx(self, level) -> np.ndarray:
+        return self.size / self.level_resolution(level)
+
+    def find(self, level: int, index: np.ndarray, clamp=False) -> np.ndarray:
+        """ Returns the flat cell indices of the given cells of `level`, or -1 where the cell does not exist. """
+        resolution = self.level_resolution(level)
+        if clamp:
+            index = np.clip(index, 0, resolution - 1)
+        inside = np.all((index >= 0) & (index < resolution), -1)
+        index = np.where(inside[..., None], index, 0)
+        patch = self.block_maps[level][tuple(np.moveaxis(index // self.block_size, -1, 0))]
+        result = np.full(index.shape[:-1], -1, np.int64)
+        valid = inside & (patch >= 0)
+        for i in np.unique(patch[valid]):
+            _, lower, upper = self.patches[i]
+            selected = valid & (patch == i)
+            result[selected] = self.offsets[i] + np.ravel_multi_index(tuple((index[selected] - lower).T), tuple(upper - lower))
+        return result
+
+    def elements(self) -> Cuboid:
+        dx = self.dx(self.cell_level[:, None])
+        center = self.lower + (self.cell_index + 0.5) * dx
+        return Cuboid(math.wrap(center, collection('cells'), channel('vector')), math.wrap(dx / 2, collection('cells'), channel('vector')))
+
+    def patch_grid(self, values: Tensor, patch: int, extrapolation: math.Extrapolation) -> CenteredGrid:
+        level, lower, upper = self.patches[patch]
+        dx = self.dx(level)
+        resolution = spatial(**{dim: int(n) for dim, n in zip(self.resolution.names, upper - lower)})
+        patch_values = math.split_dimension(values.cells[int(self.offsets[patch]):int(self.offsets[patch + 1])], 'cells', resolution)
+        bounds = Box(math.wrap(self.lower + lower * dx, channel('vector')), math.wrap(self.lower + upper * dx, channel('vector')))
+        return CenteredGrid(patch_values, bounds=bounds, extrapolation=extrapolation)
+
+    def refined(self, level: int, flags: np.ndarray, buffer: int) -> '_Hierarchy':
+        """ Replaces all levels above `level` by a single level of patches covering the flagged cells of `level`. """
+        resolution = self.level_resolution(level)
+        exists, flagged = np.zeros(resolution, bool), np.zeros(resolution, bool)
+        at_level = self.cell_level == level
+        exists[tuple(self.cell_index[at_level].T)] = True
+        flagged[tuple(self.cell_index[at_level & flags].T)] = True
+        allowed = exists.copy()  # proper nesting: keep one coarse cell between the fine level and the boundary of this level
+        for axis in range(len(resolution)):
+            for shift in (-1, 1):
+                allowed &= np.pad(exists, [(1, 1) if a == axis else (0, 0) for a in range(len(resolution))], constant_values=True)[tuple(slice(1 + shift, 1 + shift + n) if a == axis else slice(None) for a, n in enumerate(resolution))]
+        flagged = _dilate(flagged, buffer)
+        coarse_block = self.block_size // 2
+        blocks = tuple(n // coarse_block for n in resolution)
+        block_flagged = flagged.reshape(sum([(n, coarse_block) for n in blocks], ())).any(tuple(range(1, 2 * len(blocks), 2)))
+        block_allowed = allowed.reshape(sum([(n, coarse_block) for n in blocks], ())).all(tuple(range(1, 2 * len(blocks), 2)))
+        patches = [p for p in self.patches if p[0] <= level]
+        patches += [(level + 1, lower * self.block_size, upper * self.block_size) for lower, upper in _rectangles(block_flagged & block_allowed)]
+        return _Hierarchy(self.resolution, self.bounds, self.block_size, patches)
+
+    def restriction_indices(self, level: int) -> np.ndarray:
+        """ Indices into `concat(values, restricted)` where `restricted` lists the averaged children of all patches of `level` in patch order. """
+        key = ('restrict', level)
+        if key not in self._cache:
+            indices = np.arange(self.cell_count)
+            offset = self.cell_count
+            for l, lower, upper in self.patches:
+                if l == level:
+                    coarse = np.stack(np.meshgrid(*[np.arange(lo // 2, up // 2) for lo, up in zip(lower, upper)], indexing='ij'), -1).reshape(-1, len(lower))
+                    indices[self.find(level - 1, coarse)] = offset + np.arange(len(coarse))
+                    offset += len(coarse)
+            self._cache[key] = indices
+        return self._cache[key]
+
+    def transfer_indices(self, previous: '_Hierarchy', original: '_Hierarchy', level: int) -> np.ndarray:
+        """
+        Indices into `concat(previous_values, original_values, prolongated)` yielding the values of this hierarchy.
+        `previous` must contain the same patches up to `level - 1`.
+        Cells of `level` are taken from `original` where they exist, else from `prolongated`.
+        """
+        indices = np.zeros(self.cell_count, np.int64)
+        for l in range(level):
+            at_level = self.cell_level == l
+            indices[at_level] = previous.find(l, self.cell_index[at_level])
+        at_level = self.cell_level == level
+        existing = original.find(level, self.cell_index[at_level]) if level < original.level_count else np.full(np.sum(at_level), -1)
+        indices[at_level] = np.where(existing >= 0, previous.cell_count + existing, previous.cell_count + original.cell_count + np.arange(len(existing)))
+        assert np.all(indices >= 0)
+        return indices
+
+    def faces(self, dim: int) -> tuple:
+        """
+        Lists all faces normal to `dim` between uncovered cells as `(lower, upper, area, distance)`.
+        Coarse-fine faces are listed once per fine face.
+        Boundary faces refer to the ghost index `cell_count`.
+        """
+        lower_cells, upper_cells, levels = [], [], []
+        for side in (-1, 1):
+            neighbor_index = self.cell_index.copy()
+            neighbor_index[:, dim] += side
+            same = np.full(self.cell_count, -1, np.int64)
+            coarser = np.full(self.cell_count, -1, np.int64)
+            for level in range(self.level_count):
+                at_level = self.cell_level == level
+                same[at_level] = self.find(level, neighbor_index[at_level])
+                if level > 0:
+                    coarser[at_level] = self.find(level - 1, neighbor_index[at_level] // 2)
+            outside = np.any((neighbor_index < 0) | (neighbor_index >= self.level_resolution(self.cell_level[:, None])), -1)
+            uncovered = ~self.covered
+            # --- faces between cells of the same level, listed from the lower cell ---
+            if side == 1:
+                select = uncovered & (same >= 0)
+                select[select] &= ~self.covered[same[select]]
+                lower_cells.append(np.flatnonzero(select))
+                upper_cells.append(same[select])
+                levels.append(self.cell_level[select])
+            # --- coarse-fine faces, listed from the fine cell ---
+            select = uncovered & (same < 0) & ~outside
+            assert np.all(coarser[select] >= 0), "Patches are not properly nested"
+            fine, coarse = np.flatnonzero(select), coarser[select]
+            lower_cells.append(fine if side == 1 else coarse)
+            upper_cells.append(coarse if side == 1 else fine)
+            levels.append(self.cell_level[select])
+            # --- domain boundary ---
+            select = uncovered & outside
+            cells = np.flatnonzero(select)
+            ghost = np.full(len(cells), self.cell_count)
+            lower_cells.append(cells if side == 1 else ghost)
+            upper_cells.append(ghost if side == 1 else cells)
+            levels.append(self.cell_level[select])
+        lower_cells, upper_cells, levels = np.concatenate(lower_cells), np.concatenate(upper_cells), np.concatenate(levels)
+        level_of = lambda cells: np.where(cells < self.cell_count, self.cell_level[np.minimum(cells, self.cell_count - 1)], levels)
+        lower_size, upper_size = self.dx(level_of(lower_cells)[:, None])[:, dim], self.dx(level_of(upper_cells)[:, None])[:, dim]
+        area = np.prod(np.delete(self.dx(levels[:, None]), dim, -1), -1)
+        return lower_cells, upper_cells, area, (lower_size + upper_size) / 2
+
+    def stencil(self, kind: str, dim: int, boundary_ghost: bool, volume_weighted=False) -> tuple:
+        """
+        Returns `(indices, coefficients)` of shape (cells, entries) such that the result for each cell is the sum over `coefficients * values[indices]`.
+
+        * `'difference'`: finite volume derivative along `dim` using the mean of the adjacent cells as face value.
+          Since the coefficients of each face are antisymmetric, the volume-weighted `difference` of a `difference` is symmetric.
+        * `'laplace'`: finite volume second derivative along `dim` using two-point face gradients.
+        """
+        key = (kind, dim, boundary_ghost, volume_weighted)
+        if key not in self._cache:
+            lower, upper, area, distance = self.faces(dim)
+            if kind == 'difference':  # face value = (lower + upper) / 2
+                rows = [lower, lower, upper, upper]
+                cols = [lower, upper, lower, upper]
+                coefficients = [area / 2, area / 2, -area / 2, -area / 2]
+            elif kind == 'laplace':  # face gradient = (upper - lower) / distance
+                rows = [lower, lower, upper, upper]
+                cols = [upper, lower, upper, lower]
+                coefficients = [area / distance, -area / distance, -area / distance, area / distance]
+            else:
+                raise ValueError(kind)
+            rows, cols, coefficients = np.concatenate(rows), np.concatenate(cols), np.concatenate(coefficients)
+            valid = rows < self.cell_count
+            rows, cols, coefficients = rows[valid], cols[valid], coefficients[valid]
+            if not boundary_ghost:  # the ghost cell mirrors the boundary cell
+                cols = np.where(cols == self.cell_count, rows, cols)
+            if not volume_weighted:
+                coefficients = coefficients / self.volumes[rows]
+            keys, inverse = np.unique(rows * (self.cell_count + 1) + cols, return_inverse=True)
+            coefficients = np.bincount(inverse, coefficients)
+            rows, cols = keys // (self.cell_count + 1), keys % (self.cell_count + 1)
+            slot = np.arange(len(rows)) - np.searchsorted(rows, rows)
+            indices = np.zeros((self.cell_count, max(1, int(slot.max(initial=0)) + 1)), np.int64)
+            table = np.zeros(indices.shape)
+            indices[rows, slot], table[rows, slot] = cols, coefficients
+            self._cache[key] = indices, table
+        return self._cache[key]
+
+
+def _take(values: Tensor, indices: np.ndarray, dims: Shape) -> Tensor:
+    """ Gathers `values` along the collection dimension `cells`. The result has the dimensions `dims` of `indices`. """
+    native = math.reshaped_native(values, [values.shape.batch, 'cells', values.shape.channel])
+    flat = math.reshaped_tensor(native, [values.shape.batch, spatial(cells_=values.shape.get_size('cells')), values.shape.channel], convert=False)
+    return math.gather(flat, math.wrap(np.asarray(indices)[..., None], dims, channel('vector')))
+
+
+def _sample_values(values: Any, hierarchy: _Hierarchy) -> Tensor:
+    elements = hierarchy.elements()
+    if isinstance(values, Geometry):
+        values = reduce_sample(HardGeometryMask(values), elements)
+    elif isinstance(values, Field):
+        values = reduce_sample(values, elements)
+    elif callable(values):
+        values = values(elements.center)
+        assert isinstance(values, math.Tensor), f"values function must return a Tensor but returned {type(values)}"
+    else:
+        values = math.expand(math.tensor(values), elements.shape.non_channel)
+    if values.dtype.kind not in (float, complex):
+        values = math.to_float(values)
+    return values
+
+
+def _dilate(mask: np.ndarray, width: int) -> np.ndarray:
+    for _ in range(width):
+        padded = np.pad(mask, 1)
+        mask = mask.copy()
+        for axis in range(mask.ndim):
+            for shift in (0, 2):
+                mask |= padded[tuple(slice(shift, shift + n) if a == axis else slice(1, 1 + n) for a, n in enumerate(mask.shape))]
+    return mask
+
+
+def _rectangles(mask: np.ndarray) -> list:
+    """ Greedily covers the `True` entries of `mask` by disjoint boxes. Returns a list of `(lower, upper)`. """
+    remaining = mask.copy()
+    result = []
+    for start in np.argwhere(mask):
+        if not remaining[tuple(start)]:
+            continue
+        upper = start + 1
+        for axis in range(mask.ndim):
+            while upper[axis] < mask.shape[axis]:
+                extended = upper.copy()
+                extended[axis] += 1
+                region = tuple(slice(lo, up) for lo, up in zip(start, extended))
+                if not remaining[region].all():
+                    break
+                upper = extended
+        remaining[tuple(slice(lo, up) for lo, up in zip(start, upper))] = False
+        result.append((start, upper))
+    return result
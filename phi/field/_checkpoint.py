@@ -0,0 +1,238 @@
+import numbers
+import os
+import pickle
+import random
+import struct
+import weakref
+from typing import Any, List
+
+import numpy as np
+
+from phi import math
+from ..math._tensors import Tensor, TensorLike, disassemble_tree, assemble_tree, disassemble_tensors, assemble_tensors
+from ..math.backend import BACKENDS, Backend, choose_backend, convert
+
+
+_MAGIC = b'PHICKPT1'
+_ALIGNMENT = 64
+
+
+def write_checkpoint(state: Any, file: str, base: str = None) -> str:
+    """
+    Writes a simulation state to a single uncompressed file from which it can be restored using `read_checkpoint()`.
+
+    `state` can be any tree of `tuple`, `list` and `dict` containing `Tensor`s, tensor-like objects such as fields, and other picklable objects.
+    The data of all tensors is stored as raw arrays, aligned so that they can be memory-mapped when reading.
+    All other objects, including the structure of tensor-like objects, are pickled.
+    The state of the random number generators of all backends and of the built-in `random` module is included.
+
+    With `base`, an incremental checkpoint is written.
+    Tensors that are unchanged since the checkpoint `base` was written or read are not written again.
+    Instead, the new checkpoint references the data in `base` or the file `base` references.
+    Tensors are considered unchanged if they hold the same native array as when `base` was written or read, or if they are equal to the corresponding tensor of `base`.
+    Native arrays must not be modified in-place between checkpoints.
+    Referenced files must be kept as long as checkpoints referencing them are in use.
+    `file` may be `base` or a file referenced by `base`, e.g. when alternating between two files.
+    Data referenced in the overwritten file is then copied into the new checkpoint.
+    Checkpoints referencing the overwritten file and states read from it become invalid.
+
+    See Also:
+        `read_checkpoint()`, `write()`.
+
+    Args:
+        state: Tree of tensors, tensor-like objects and picklable objects.
+            All tensors must hold concrete values, i.e. this function cannot be used while tracing.
+        file: Path of the checkpoint file. The extension `.ckpt` is appended if not present.
+        base: (Optional) Path of a previous checkpoint. If given, only tensors that differ from `base` are written.
+
+    Returns:
+        Path of the written file.
+    """
+    file = file if file.endswith('.ckpt') else file + '.ckpt'
+    tree, tensors = _disassemble(state)
+    assert math.all_available(*tensors), "Cannot write checkpoint while tracing"
+    natives, shapes = disassemble_tensors(tensors, expand=True)
+    base_header = _read_header(base) if base is not None else None
+    path = os.path.abspath(file)
+    directory = os.path.dirname(path)
+    entries = []
+    data = []
+    offset = 0
+    for i, native in enumerate(natives):
+        array = np.asarray(native) if isinstance(native, numbers.Number) else choose_backend(native).numpy(native)
+        source = _source(native, array, base_header, i)
+        if source is not None and source['file'] == path:  # file is overwritten
+            source = None
+        if source is None and _location(native) == path:  # data is memory-mapped from the file that is overwritten
+            array = np.array(array)
+        if source is not None:
+            entries.append(dict(source, file=os.path.relpath(source['file'], directory)))
+        elif array.dtype.kind in 'OUS':
+            entries.append(dict(value=array))
+        else:
+            entries.append(dict(file=None, offset=offset, dtype=array.dtype.str, shape=array.shape))
+            data.append((offset, array))
+            offset = _align(offset + array.nbytes)
+        entries[-1]['native'] = native
+    header = dict(tree=tree, shapes=shapes, entries=[{k: v for k, v in entry.items() if k != 'native'} for entry in entries], random_state=_get_random_state())
+    header_bytes = pickle.dumps(header)
+    data_start = _align(len(_MAGIC) + 16 + len(header_bytes))
+    with open(file, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(struct.pack('<QQ', len(header_bytes), data_start))
+        f.write(header_bytes)
+        for array_offset, array in data:
+            f.seek(data_start + array_offset)
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    for entry in entries:
+        if 'value' not in entry:
+            location = (path, data_start + entry['offset']) if entry['file'] is None else (os.path.normpath(os.path.join(directory, entry['file'])), entry['offset'])
+            _remember(entry['native'], *location)
+    return file
+
+
+def read_checkpoint(file: str, convert_to_backend=True, restore_random_state=True) -> Any:
+    """
+    Restores a simulation state written by `write_checkpoint()`.
+
+    The tensor data is memory-mapped, i.e. it is only loaded from disc when accessed.
+    The memory-mapped arrays are copy-on-write, modifying them does not alter the file.
+
+    See Also:
+        `write_checkpoint()`.
+
+    Args:
+        file: Path of the checkpoint file. The extension `.ckpt` is appended if not present.
+        convert_to_backend: Whether to convert the data to the default backend. This requires copying the data unless the default backend is NumPy.
+        restore_random_state: Whether to restore the state of the random number generators.
+
+    Returns:
+        State as passed to `write_checkpoint()`.
+    """
+    file = file if file.endswith('.ckpt') else file + '.ckpt'
+    header = _read_header(file)
+    natives = []
+    for entry in header['entries']:
+        if 'value' in entry:
+            natives.append(entry['value'])
+            continue
+        path, offset = _resolve(entry, header)
+        array = np.memmap(path, dtype=np.dtype(entry['dtype']), mode='c', offset=offset, shape=entry['shape']) if np.prod(entry['shape'], dtype=int) > 0 else np.zeros(entry['shape'], entry['dtype'])
+        native = convert(array) if convert_to_backend else array
+        _remember(native, path, offset)
+        natives.append(native)
+    tensors = assemble_tensors(natives, header['shapes'])
+    if restore_random_state:
+        _set_random_state(header['random_state'])
+    return _assemble(header['tree'], tensors if isinstance(tensors, list) else [tensors])
+
+
+class _Packed:
+    """ Placeholder for a `Tensor` or tensor-like object inside the pickled structure of a checkpoint. """
+
+    def __init__(self, tree, count: int):
+        self.tree = tree
+        self.count = count
+
+
+def _disassemble(obj) -> tuple:
+    if isinstance(obj, (Tensor, TensorLike)):
+        tree, tensors = disassemble_tree(obj)
+        return _Packed(tree, len(tensors)), tensors
+    elif isinstance(obj, (tuple, list)):
+        items = [_disassemble(item) for item in obj]
+        tree = [tree for tree, _ in items]
+        return (tuple(tree) if isinstance(obj, tuple) else tree), sum([tensors for _, tensors in items], [])
+    elif isinstance(obj, dict):
+        items = {key: _disassemble(item) for key, item in obj.items()}
+        return {key: tree for key, (tree, _) in items.items()}, sum([tensors for _, tensors in items.values()], [])
+    else:
+        return obj, []
+
+
+def _assemble(tree, tensors: List[Tensor]):
+    if isinstance(tree, _Packed):
+        values = [tensors.pop(0) for _ in range(tree.count)]
+        return assemble_tree(tree.tree, values)
+    elif isinstance(tree, (tuple, list)):
+        items = [_assemble(item, tensors) for item in tree]
+        return tuple(items) if isinstance(tree, tuple) else items
+    elif isinstance(tree, dict):
+        return {key: _assemble(item, tensors) for key, item in tree.items()}
+    else:
+        return tree
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _read_header(file: str) -> dict:
+    file = file if file.endswith('.ckpt') else file + '.ckpt'
+    with open(file, 'rb') as f:
+        assert f.read(len(_MAGIC)) == _MAGIC, f"{file} is not a checkpoint file"
+        header_length, data_start = struct.unpack('<QQ', f.read(16))
+        header = pickle.loads(f.read(header_length))
+    header['path'] = os.path.abspath(file)
+    header['data_start'] = data_start
+    return header
+
+
+def _resolve(entry: dict, header: dict) -> tuple:
+    """ Returns the absolute path and byte offset of the data of `entry`. """
+    if entry['file'] is None:
+        return header['path'], header['data_start'] + entry['offset']
+    return os.path.normpath(os.path.join(os.path.dirname(header['path']), entry['file'])), entry['offset']
+
+
+# --- Change detection for incremental checkpoints ---
+_LOCATIONS = {}  # id(native) -> (weakref to native, path, offset)
+
+
+def _remember(native, path: str, offset: int):
+    try:
+        reference = weakref.ref(native, lambda _, key=id(native): _LOCATIONS.pop(key, None))
+    except TypeError:  # Python numbers cannot be referenced weakly
+        return
+    _LOCATIONS[id(native)] = (reference, path, offset)
+
+
+def _location(native) -> str or None:
+    """ Returns the path of the checkpoint file holding the data of `native` or `None` if unknown. """
+    location = _LOCATIONS.get(id(native), None)
+    return location[1] if location is not None and location[0]() is native else None
+
+
+def _source(native, array: np.ndarray, base_header: dict or None, index: int) -> dict or None:
+    """ Returns the location of identical data in the checkpoint `base_header` or `None` if `native` has to be written. """
+    if base_header is None or index >= len(base_header['entries']):
+        return None
+    base_entry = base_header['entries'][index]
+    if 'value' in base_entry or array.dtype.str != base_entry['dtype'] or array.shape != tuple(base_entry['shape']):
+        return None
+    base_path, base_offset = _resolve(base_entry, base_header)
+    location = _LOCATIONS.get(id(native), None)
+    if location is not None and location[0]() is native:
+        if location[1:] == (base_path, base_offset):
+            return dict(file=base_path, offset=base_offset, dtype=array.dtype.str, shape=array.shape)
+    if array.size > 0:
+        stored = np.memmap(base_path, dtype=array.dtype, mode='r', offset=base_offset, shape=array.shape)
+        if not np.array_equal(stored, array):
+            return None
+    return dict(file=base_path, offset=base_offset, dtype=array.dtype.str, shape=array.shape)
+
+
+def _get_random_state() -> dict:
+    states = {'random': random.getstate()}
+    for backend in BACKENDS:
+        if backend.supports(Backend.get_random_state):
+            states[backend.name] = backend.get_random_state()
+    return states
+
+
+def _set_random_state(states: dict):
+    random.setstate(states['random'])
+    for backend in BACKENDS:
+        if backend.name in states and backend.supports(Backend.set_random_state):
+            backend.set_random_state(states[backend.name])
@@ -57,10 +57,14 @@ class Field:
           representation: SampledField: 
 
         Returns:
-          Field object of same type as `representation`
+          Field object of same type as `representation`.
+          Inactive points of a `PointCloud` keep their values.
 
         """
         resampled = reduce_sample(self, representation.elements)
+        active = getattr(representation, '_active', None)
+        if active is not None:  # inactive points of a PointCloud keep their data
+            resampled = math.where(active, resampled, representation.values)
         extrap = self.extrapolation if isinstance(self, SampledField) else representation.extrapolation
         return representation._op1(lambda old: extrap if isinstance(old, math.extrapolation.Extrapolation) else resampled)
 
@@ -1,13 +1,17 @@
+import zipfile
+
 import numpy as np
 
 from phi import math, geom
+from phi.math.backend import Backend, NUMPY
+from phi.math.backend._dtype import DType, from_numpy_dtype, to_numpy_dtype
 from ._field import SampledField
 from ._grid import Grid, CenteredGrid, StaggeredGrid, unstack_staggered_tensor
 from ._field_math import stack
 from ..math._tensors import NativeTensor
 
 
-def write(field: SampledField, file: str or math.Tensor):
+def write(field: SampledField, file: str or math.Tensor, compress=True):
     """
     Writes a field to disc using a NumPy file format.
     Depending on `file`, the data may be split up into multiple files.
@@ -23,23 +27,25 @@ def write(field: SampledField, file: str or math.Tensor):
             If `file` is a tensor, the dimensions of `field` are matched to the dimensions of `file`.
             Dimensions of `file` that are missing in `field` result in data duplication.
             Dimensions of `field` that are missing in `file` result in larger files.
+        compress: Whether to compress the data.
+            Uncompressed files are larger but `read(mmap=True)` can memory-map them instead of copying the data.
     """
     if isinstance(file, str):
-        write_single_field(field, file)
+        write_single_field(field, file, compress)
     elif isinstance(file, math.Tensor):
         if file.rank == 0:
-            write_single_field(field, file.native())
+            write_single_field(field, file.native(), compress)
         else:
             dim = file.shape.names[0]
             files = file.unstack(dim)
             fields = field.dimension(dim).unstack(file.shape.get_size(dim))
             for field_, file_ in zip(fields, files):
-                write(field_, file_)
+                write(field_, file_, compress)
     else:
         raise ValueError(file)
 
 
-def write_single_field(field: SampledField, file: str):
+def write_single_field(field: SampledField, file: str, compress=True):
     if isinstance(field, StaggeredGrid):
         data = field.staggered_tensor().numpy(field.values.shape.names)
     else:
@@ -49,12 +55,13 @@ def write_single_field(field: SampledField, file: str):
         lower = field.box.lower.numpy()
         upper = field.box.upper.numpy()
         extrap = field.extrapolation.to_dict()
-        np.savez_compressed(file, dim_names=dim_names, dim_types=field.values.shape.types, field_type=type(field).__name__, lower=lower, upper=upper, extrapolation=extrap, data=data)
+        save = np.savez_compressed if compress else np.savez
+        save(file, dim_names=dim_names, dim_types=field.values.shape.types, field_type=type(field).__name__, lower=lower, upper=upper, extrapolation=extrap, data=data)
     else:
         raise NotImplementedError(f"{type(field)} not implemented. Only Grid allowed.")
 
 
-def read(file: str or math.Tensor, convert_to_backend=True) -> SampledField:
+def read(file: str or math.Tensor, convert_to_backend=True, mmap=False) -> SampledField:
     """
     Loads a previously saved `SampledField` from disc.
 
@@ -65,39 +72,124 @@ def read(file: str or math.Tensor, convert_to_backend=True) -> SampledField:
         file: Single file as `str` or `Tensor` of string type.
             If `file` is a tensor, all contained files are loaded an stacked according to the dimensions of `file`.
         convert_to_backend: Whether to convert the read data to the data format of the default backend, e.g. TensorFlow tensors.
+        mmap: Whether to memory-map the data of uncompressed files instead of reading it.
+            The returned field then references the file, which must not be modified or overwritten while the field is in use.
 
     Returns:
         Loaded `SampledField`.
     """
     if isinstance(file, str):
-        return read_single_field(file, convert_to_backend=convert_to_backend)
+        return read_single_field(file, convert_to_backend=convert_to_backend, mmap=mmap)
     if isinstance(file, math.Tensor):
         if file.rank == 0:
-            return read_single_field(file.native(), convert_to_backend=convert_to_backend)
+            return read_single_field(file.native(), convert_to_backend=convert_to_backend, mmap=mmap)
         else:
             dim = file.shape[0]
             files = file.unstack(dim.name)
-            fields = [read(file_, convert_to_backend=convert_to_backend) for file_ in files]
+            fields = [read(file_, convert_to_backend=convert_to_backend, mmap=mmap) for file_ in files]
             return stack(fields, dim)
     else:
         raise ValueError(file)
 
 
-def read_single_field(file: str, convert_to_backend=True) -> SampledField:
-    stored = np.load(file, allow_pickle=True)
-    ftype = stored['field_type']
-    implemented_types = ('CenteredGrid', 'StaggeredGrid')
-    if ftype in implemented_types:
-        data = stored['data']
-        data = NativeTensor(data, math.Shape(data.shape, stored['dim_names'], stored['dim_types']))
-        if convert_to_backend:
-            data = math.tensor(data, convert=convert_to_backend)
+def read_single_field(file: str, convert_to_backend=True, mmap=False) -> SampledField:
+    with np.load(file, allow_pickle=True) as stored:
+        ftype = stored['field_type']
+        implemented_types = ('CenteredGrid', 'StaggeredGrid')
+        if ftype not in implemented_types:
+            raise NotImplementedError(f"{ftype} not implemented ({implemented_types})")
+        backend = math.backend.default_backend() if convert_to_backend else NUMPY
+        data = _read_native_data(stored, file, backend, mmap)
+        data = NativeTensor(data, math.Shape(backend.staticshape(data), stored['dim_names'], stored['dim_types']))
         lower = math.wrap(stored['lower'])
         upper = math.wrap(stored['upper'])
         extrapolation = math.extrapolation.from_dict(stored['extrapolation'][()])
-        if ftype == 'CenteredGrid':
-            return CenteredGrid(data, bounds=geom.Box(lower, upper), extrapolation=extrapolation)
-        elif ftype == 'StaggeredGrid':
-            data_ = unstack_staggered_tensor(data, extrapolation)
-            return StaggeredGrid(data_, bounds=geom.Box(lower, upper), extrapolation=extrapolation)
-    raise NotImplementedError(f"{ftype} not implemented ({implemented_types})")
+    if ftype == 'CenteredGrid':
+        return CenteredGrid(data, bounds=geom.Box(lower, upper), extrapolation=extrapolation)
+    elif ftype == 'StaggeredGrid':
+        data_ = unstack_staggered_tensor(data, extrapolation)
+        return StaggeredGrid(data_, bounds=geom.Box(lower, upper), extrapolation=extrapolation)
+
+
+def _read_native_data(stored: np.lib.npyio.NpzFile, file: str, backend: Backend, mmap: bool):
+    """
+    Reads the array `data` from `stored` into a native tensor of `backend`, avoiding intermediate copies.
+
+    With `mmap=True`, uncompressed files are memory-mapped.
+    Otherwise, the data is read or decompressed directly into a host buffer provided by `backend`, e.g. page-locked memory for GPU backends.
+    Floating point data is converted to the backend precision while decoding so that `Backend.as_tensor()` does not need to cast it again.
+    The resulting NumPy array is passed to `backend` via DLPack if supported, else using `Backend.as_tensor()`.
+    """
+    try:
+        info = stored.zip.getinfo('data.npy')
+    except (AttributeError, KeyError):
+        return backend.as_tensor(stored['data'])
+    with stored.zip.open(info) as member:
+        version = np.lib.format.read_magic(member)
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(member) if version == (1, 0) else np.lib.format.read_array_header_2_0(member)
+        if fortran_order or dtype.hasobject:
+            return backend.as_tensor(stored['data'])
+        target_dtype = _backend_dtype(dtype, backend)
+        if mmap and info.compress_type == zipfile.ZIP_STORED and isinstance(file, str):
+            array = np.memmap(file, dtype=dtype, mode='c', offset=_member_data_offset(file, info) + member.tell(), shape=shape).view(np.ndarray)
+            if target_dtype != dtype:
+                array = array.astype(target_dtype)
+        else:
+            array = backend.host_buffer(shape, from_numpy_dtype(target_dtype))
+            _decode_into(member, array, dtype)
+    return _to_backend(array, backend)
+
+
+def _backend_dtype(dtype: np.dtype, backend: Backend) -> np.dtype:
+    """ NumPy data type that `backend.as_tensor()` would convert arrays of type `dtype` to. """
+    if backend is NUMPY:
+        return dtype  # NumPy arrays are not converted
+    kind = from_numpy_dtype(dtype).kind
+    if kind == float:
+        return np.dtype(to_numpy_dtype(backend.float_type))
+    if kind == complex:
+        return np.dtype(to_numpy_dtype(DType(complex, max(64, min(backend.precision * 2, 128)))))
+    return dtype
+
+
+def _member_data_offset(file: str, info: zipfile.ZipInfo) -> int:
+    """ Position of the first byte of the uncompressed zip member `info` within `file`. """
+    with open(file, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)  # local file header
+    name_length = int.from_bytes(header[26:28], 'little')
+    extra_length = int.from_bytes(header[28:30], 'little')
+    return info.header_offset + 30 + name_length + extra_length
+
+
+def _decode_into(stream, array: np.ndarray, stored_dtype: np.dtype, chunk_bytes=1 << 22):
+    """ Reads `array.size` elements of type `stored_dtype` from `stream` into `array`, casting them chunk-wise if the data types differ. """
+    flat = array.reshape(-1)
+    if stored_dtype == array.dtype:
+        view = memoryview(flat.view(np.uint8))
+        position = 0
+        while position < len(view):
+            count = stream.readinto(view[position:])
+            if not count:
+                raise EOFError(f"Data ended after {position} of {len(view)} bytes")
+            position += count
+    else:
+        chunk = max(1, chunk_bytes // stored_dtype.itemsize)
+        for start in range(0, flat.size, chunk):
+            count = min(chunk, flat.size - start)
+            buffer = stream.read(count * stored_dtype.itemsize)
+            if len(buffer) < count * stored_dtype.itemsize:
+                raise EOFError(f"Data ended after {start * stored_dtype.itemsize + len(buffer)} bytes")
+            flat[start:start + count] = np.frombuffer(buffer, stored_dtype)
+
+
+def _to_backend(array: np.ndarray, backend: Backend):
+    """ Wraps `array` as a native tensor of `backend`, sharing memory via DLPack where possible. """
+    if backend is NUMPY:
+        return array
+    if hasattr(array, '__dlpack__') and backend.supports(Backend.from_dlpack):
+        try:
+            return backend.from_dlpack(array.__dlpack__())
+        except (BufferError, TypeError, RuntimeError):
+            pass  # e.g. read-only arrays or unsupported data types
+    return backend.as_tensor(array)
@@ -9,6 +9,9 @@ from ._field import Field, SampledField, unstack, SampledFieldType
 from ._grid import CenteredGrid, Grid, StaggeredGrid, GridType
 from ._mask import HardGeometryMask
 from ._point_cloud import PointCloud
+from ._sparse import SparseGrid
+from ._amr import AMRGrid
+from ..math._functional import is_tracer
 from ..math._tensors import variable_attributes, copy_with
 from ..math.backend import Backend
 
@@ -41,6 +44,14 @@ def bake_extrapolation(grid: GridType) -> GridType:
 
 def laplace(field: GridType, axes=None) -> GridType:
     """ Finite-difference laplace operator for Grids. See `phi.math.laplace()`. """
+    if isinstance(field, AMRGrid):
+        assert axes is None, "AMR grids do not support partial laplace"
+        return field._laplace()
+    if isinstance(field, SparseGrid):
+        dims = axes or field.resolution.names
+        dx = {dim: field.dx.vector[field.resolution.index(dim)] for dim in dims}
+        values = sum([(field._shifted(dim, -1) + field._shifted(dim, 1) - 2 * field.values) / dx[dim] ** 2 for dim in dims])
+        return field.with_values(values).with_extrapolation(field.extrapolation.spatial_gradient())
     result = field._op1(lambda tensor: math.laplace(tensor, dx=field.dx, padding=field.extrapolation, dims=axes))
     return result
 
@@ -57,8 +68,10 @@ def spatial_gradient(field: CenteredGrid,
     * `type=CenteredGrid` approximates the spatial_gradient at cell centers using central differences
     * `type=StaggeredGrid` computes the spatial_gradient at face centers of neighbouring cells
 
+    For a `SparseGrid`, the central differences are computed for the active tiles only and the result is a `SparseGrid` with the same tiles.
+
     Args:
-        field: centered grid of any number of dimensions (scalar field, vector field, tensor field)
+        field: centered or sparse grid of any number of dimensions (scalar field, vector field, tensor field)
         type: either `CenteredGrid` or `StaggeredGrid`
         stack_dim: Dimension to be added. This dimension lists the spatial_gradient w.r.t. the spatial dimensions.
             The `field` must not have a dimension of the same name.
@@ -67,9 +80,16 @@ def spatial_gradient(field: CenteredGrid,
         spatial_gradient field of type `type`.
 
     """
-    assert isinstance(field, Grid)
+    assert isinstance(field, (Grid, SparseGrid, AMRGrid))
     if extrapolation is None:
         extrapolation = field.extrapolation.spatial_gradient()
+    if isinstance(field, AMRGrid):
+        assert type in (CenteredGrid, AMRGrid), "AMR grids only support centered gradients."
+        return field._gradient(stack_dim).with_extrapolation(extrapolation)
+    if isinstance(field, SparseGrid):
+        assert type in (CenteredGrid, SparseGrid), "Sparse grids only support centered gradients."
+        left, right = shift(field, (-1, 1), stack_dim=stack_dim)
+        return ((right - left) / (field.dx.vector.as_channel(name=stack_dim.name) * 2)).with_extrapolation(extrapolation)
     if type == CenteredGrid:
         values = math.spatial_gradient(field.values, field.dx.vector.as_channel(name=stack_dim.name), difference='central', padding=field.extrapolation, stack_dim=stack_dim)
         return CenteredGrid(values, bounds=field.bounds, extrapolation=extrapolation)
@@ -79,9 +99,9 @@ def spatial_gradient(field: CenteredGrid,
     raise NotImplementedError(f"{type(field)} not supported. Only CenteredGrid and StaggeredGrid allowed.")
 
 
-def shift(grid: CenteredGrid, offsets: tuple, stack_dim: Shape = channel('shift')):
+def shift(grid: CenteredGrid or SparseGrid, offsets: tuple, stack_dim: Shape = channel('shift')):
     """
-    Wraps :func:`math.shift` for CenteredGrid.
+    Wraps :func:`math.shift` for CenteredGrid and SparseGrid.
 
     Args:
       grid: CenteredGrid: 
@@ -91,6 +111,8 @@ def shift(grid: CenteredGrid, offsets: tuple, stack_dim: Shape = channel('shift'
     Returns:
 
     """
+    if isinstance(grid, SparseGrid):
+        return [grid.with_values(math.stack([grid._shifted(dim, offset) for dim in grid.resolution.names], stack_dim)) for offset in offsets]
     data = math.shift(grid.values, offsets, padding=grid.extrapolation, stack_dim=stack_dim)
     return [CenteredGrid(data[i], bounds=grid.bounds, extrapolation=grid.extrapolation) for i in range(len(offsets))]
 
@@ -123,7 +145,14 @@ def stagger(field: CenteredGrid,
     """
     all_lower = []
     all_upper = []
-    if type == StaggeredGrid:
+    if type == StaggeredGrid and field.extrapolation != math.extrapolation.NONE and not is_tracer(field.values):  # compute all faces in the layout of StaggeredGrid.padded_values()
+        for dim in field.shape.spatial.names:
+            others = {d: (0, 1) for d in field.shape.spatial.names if d != dim}
+            all_lower.append(math.pad(field.values, {dim: (1, 0), **others}, field.extrapolation))
+            all_upper.append(math.pad(field.values, {dim: (0, 1), **others}, field.extrapolation))
+        values = face_function(math.stack(all_lower, channel('vector')), math.stack(all_upper, channel('vector')))
+        return StaggeredGrid._from_padded(values, extrapolation, field.bounds)
+    elif type == StaggeredGrid:
         for dim in field.shape.spatial.names:
             lo_valid, up_valid = extrapolation.valid_outer_faces(dim)
             width_lower = {dim: (int(lo_valid), int(up_valid) - 1)}
@@ -152,22 +181,22 @@ def divergence(field: Grid) -> CenteredGrid:
 
     * `CenteredGrid` approximates the divergence at cell centers using central differences
     * `StaggeredGrid` exactly computes the divergence at cell centers
+    * `SparseGrid` approximates the divergence at the cell centers of active tiles using central differences
+    * `AMRGrid` computes conservative finite volume fluxes, using the fine fluxes at coarse-fine interfaces
 
     Args:
-        field: vector field as `CenteredGrid` or `StaggeredGrid`
+        field: vector field as `CenteredGrid`, `StaggeredGrid`, `SparseGrid` or `AMRGrid`
 
     Returns:
-        Divergence field as `CenteredGrid`
+        Divergence field as `CenteredGrid`, `SparseGrid` or `AMRGrid`
     """
     if isinstance(field, StaggeredGrid):
-        field = bake_extrapolation(field)
-        components = []
-        for i, dim in enumerate(field.shape.spatial.names):
-            div_dim = math.spatial_gradient(field.values.vector[i], dx=field.dx[i], difference='forward', padding=None, dims=[dim]).gradient[0]
-            components.append(div_dim)
-        data = math.sum(components, 0)
+        lower, upper = field.face_values()
+        data = math.sum((upper - lower) / field.dx, 'vector')
         return CenteredGrid(data, bounds=field.bounds, extrapolation=field.extrapolation.spatial_gradient())
-    elif isinstance(field, CenteredGrid):
+    elif isinstance(field, AMRGrid):
+        return field._divergence()
+    elif isinstance(field, (CenteredGrid, SparseGrid)):
         left, right = shift(field, (-1, 1), stack_dim=batch('div_'))
         grad = (right - left) / (field.dx * 2)
         components = [grad.vector[i].div_[i] for i in range(grad.div_.size)]
@@ -353,7 +382,8 @@ def concat(fields: List[SampledFieldType], dim: Shape) -> SampledFieldType:
         elements = geom.concat([f.elements for f in fields], dim, sizes=[f.shape.get_size(dim) for f in fields])
         values = math.concat([math.expand(f.values, f.shape.only(dim)) for f in fields], dim)
         colors = math.concat([math.expand(f.color, f.shape.only(dim)) for f in fields], dim)
-        return PointCloud(elements=elements, values=values, color=colors, extrapolation=fields[0].extrapolation, add_overlapping=fields[0]._add_overlapping, bounds=fields[0].bounds)
+        active = None if all(f.active is None for f in fields) else math.concat([math.expand(True if f.active is None else f.active, f.shape.only(dim)) for f in fields], dim)
+        return PointCloud(elements=elements, values=values, color=colors, extrapolation=fields[0].extrapolation, add_overlapping=fields[0]._add_overlapping, bounds=fields[0].bounds, active=active)
     raise NotImplementedError(type(fields[0]))
 
 
@@ -369,7 +399,8 @@ def stack(fields, dim: Shape):
         elements = geom.stack(*[f.elements for f in fields], dim=dim)
         values = math.stack([f.values for f in fields], dim=dim)
         colors = math.stack([f.color for f in fields], dim=dim)
-        return PointCloud(elements=elements, values=values, color=colors, extrapolation=fields[0].extrapolation, add_overlapping=fields[0]._add_overlapping, bounds=fields[0].bounds)
+        active = None if all(f.active is None for f in fields) else math.stack([math.wrap(True) if f.active is None else f.active for f in fields], dim=dim)
+        return PointCloud(elements=elements, values=values, color=colors, extrapolation=fields[0].extrapolation, add_overlapping=fields[0]._add_overlapping, bounds=fields[0].bounds, active=active)
     raise NotImplementedError(type(fields[0]))
 
 
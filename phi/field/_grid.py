@@ -1,11 +1,14 @@
-from typing import TypeVar, Any
+import copy
+from typing import TypeVar, Any, Tuple
 
 from phi import math
 from phi.geom import Box, Geometry, GridCell
 from . import HardGeometryMask
 from ._field import SampledField, Field, sample, reduce_sample
+from ..geom._box import cached_grid_geometry
 from ..geom._stack import GeometryStack
 from ..math import Shape
+from ..math._functional import is_tracer
 from ..math._shape import spatial, channel
 from ..math._tensors import TensorStack, Tensor
 
@@ -51,6 +54,24 @@ class Grid(SampledField):
     def with_bounds(self, bounds: Box):
         return type(self)(self.values, extrapolation=self.extrapolation, bounds=bounds)
 
+    def with_halo(self, width: int = 1, reuse: 'Grid' = None):
+        """
+        Returns a copy of this grid whose values are stored with `width` ghost cells on each side, filled from the extrapolation.
+        Stencil operations such as `phi.field.laplace()`, `phi.field.spatial_gradient()` or `phi.field.stagger()` then read views of the padded values instead of padding them.
+
+        The halo is lost when the values change, e.g. through arithmetic, so this method should be called once per time step.
+        See `phi.math.with_halo()`.
+
+        Args:
+            width: Number of ghost cells on each side of every spatial dimension.
+            reuse: (Optional) Grid previously returned by `with_halo()` whose buffer may be overwritten in place.
+                *Warning*: This changes the values of `reuse`.
+
+        Returns:
+            Grid of the same type with equal values.
+        """
+        return self.with_values(math.with_halo(self._values, self._extrapolation, width, reuse.values if reuse is not None else None))
+
     def __value_attrs__(self):
         return '_values', '_extrapolation'
 
@@ -293,6 +314,54 @@ class StaggeredGrid(Grid):
             values = math.to_float(values)
         assert resolution.spatial_rank == bounds.spatial_rank, f"Resolution {resolution} does not match bounds {bounds}"
         Grid.__init__(self, elements, values, extrapolation, resolution, bounds)
+        self._padded = None
+
+    @staticmethod
+    def _from_padded(padded: Tensor, extrapolation: math.Extrapolation, bounds: Box) -> 'StaggeredGrid':
+        """
+        Creates a `StaggeredGrid` backed by a uniform tensor in the layout of `padded_values()`.
+        The values of the grid are views of the valid region of `padded`.
+        """
+        if padded.dtype.kind not in (float, complex):
+            padded = math.to_float(padded)
+        grid = StaggeredGrid(unstack_staggered_tensor(padded, extrapolation), bounds=bounds, extrapolation=extrapolation)
+        grid._padded = padded
+        return grid
+
+    def padded_values(self) -> Tensor:
+        """
+        Returns the values of this grid as a single uniform `phi.math.Tensor` that has one more cell than `resolution` in every spatial dimension.
+        All vector components are stored in one native tensor, so element-wise operations on this layout run as one vectorized operation instead of one per component.
+
+        Unlike `staggered_tensor()`, the values outside the valid faces are not defined by the extrapolation.
+        They are filled with the nearest valid value to keep them finite under arithmetic but carry no meaning.
+
+        Grids created from element-wise operations store their values in this layout, so calling this method is free for them.
+
+        Returns:
+            Uniform `phi.math.Tensor` of shape `resolution + 1` with a `vector` dimension.
+        """
+        if self._padded is None:
+            padded = []
+            for dim, component in zip(self.resolution.names, math.unstack(self._values, 'vector')):
+                widths = {d: (0, 1) for d in self.resolution.names}
+                lo_valid, up_valid = self.extrapolation.valid_outer_faces(dim)
+                widths[dim] = (int(not lo_valid), int(not up_valid))
+                padded.append(math.pad(component, widths, mode=math.extrapolation.BOUNDARY))
+            self._padded = math.stack(padded, channel('vector'))
+        return self._padded
+
+    def with_halo(self, width: int = 1, reuse: Grid = None):
+        components = math.stack(math.unstack(self._values, 'vector'), channel('vector'))  # each component holds its own halo
+        return self.with_values(math.with_halo(components, self._extrapolation, width, reuse.values if reuse is not None else None))
+
+    def __with_tattrs__(self, **tensor_attributes):
+        grid = copy.copy(self)
+        for attr, value in tensor_attributes.items():
+            setattr(grid, attr, value)
+        if '_values' in tensor_attributes:
+            grid._padded = None
+        return grid
 
     @property
     def cells(self):
@@ -312,7 +381,27 @@ class StaggeredGrid(Grid):
         return math.stack(channels, channel('vector'))
 
     def at_centers(self) -> CenteredGrid:
-        return CenteredGrid(self, resolution=self.resolution, bounds=self.bounds, extrapolation=self.extrapolation)
+        lower, upper = self.face_values()
+        return CenteredGrid((lower + upper) / 2, bounds=self.bounds, extrapolation=self.extrapolation)
+
+    def face_values(self) -> Tuple[Tensor, Tensor]:
+        """
+        Returns the values at the lower and upper face of each cell along its own axis.
+        Faces that are not stored in this grid are determined by the extrapolation.
+
+        Returns:
+            lower: Uniform `phi.math.Tensor` with the same spatial shape as `resolution` and a `vector` dimension.
+                Each component `i` holds the values of the lower faces along the `i`-th dimension.
+            upper: Upper faces, same shape as `lower`.
+        """
+        lower, upper = [], []
+        for dim, component in zip(self.resolution.names, math.unstack(self._values, 'vector')):
+            lo_valid, up_valid = self.extrapolation.valid_outer_faces(dim)
+            if not lo_valid or not up_valid:
+                component = math.pad(component, {dim: (int(not lo_valid), int(not up_valid))}, self.extrapolation)
+            lower.append(component[{dim: slice(None, -1)}])
+            upper.append(component[{dim: slice(1, None)}])
+        return math.stack(lower, channel('vector')), math.stack(upper, channel('vector'))
 
     def __getitem__(self, item: dict):
         values = self._values[{dim: sel for dim, sel in item.items() if dim not in self.shape.spatial}]
@@ -358,11 +447,20 @@ class StaggeredGrid(Grid):
 
     def _op2(self, other, operator):
         if isinstance(other, StaggeredGrid) and self.bounds == other.bounds and self.shape.spatial == other.shape.spatial:
-            values = operator(self._values, other.values)
             extrapolation_ = operator(self._extrapolation, other.extrapolation)
+            if _same_faces(self.resolution, extrapolation_, self._extrapolation, other.extrapolation) and not is_tracer(self._values) and not is_tracer(other.values):
+                return StaggeredGrid._from_padded(operator(self.padded_values(), other.padded_values()), extrapolation_, self.bounds)
+            values = operator(self._values, other.values)
             return StaggeredGrid(values=values, extrapolation=extrapolation_, bounds=self.bounds)
-        else:
-            return SampledField._op2(self, other, operator)
+        elif not isinstance(other, Field):
+            other = math.tensor(other)
+            if not other.shape.spatial and not is_tracer(self._values):  # same operation for all faces
+                return StaggeredGrid._from_padded(operator(self.padded_values(), other), self._extrapolation, self.bounds)
+        return SampledField._op2(self, other, operator)
+
+
+def _same_faces(resolution: Shape, *extrapolations: math.Extrapolation):
+    return all(len({e.valid_outer_faces(dim) for e in extrapolations}) == 1 for dim in resolution.names)
 
 
 def unstack_staggered_tensor(data: Tensor, extrapolation: math.Extrapolation) -> TensorStack:
@@ -376,12 +474,31 @@ def unstack_staggered_tensor(data: Tensor, extrapolation: math.Extrapolation) ->
 
 
 def staggered_elements(resolution: Shape, bounds: Box, extrapolation: math.Extrapolation):
+    faces = tuple(extrapolation.valid_outer_faces(dim) for dim in resolution.names)
+    return cached_grid_geometry('staggered', resolution, bounds, lambda: _staggered_elements(resolution, bounds, faces), faces)
+
+
+def _staggered_elements(resolution: Shape, bounds: Box, faces: tuple):
     cells = GridCell(resolution, bounds)
-    grids = []
-    for dim in resolution.names:
-        lower, upper = extrapolation.valid_outer_faces(dim)
-        grids.append(cells.stagger(dim, lower, upper))
-    return GeometryStack(grids, channel('staggered_direction'))
+    grids = [cells.stagger(dim, lower, upper) for dim, (lower, upper) in zip(resolution.names, faces)]
+    return _StaggeredElements(grids, channel('staggered_direction'))
+
+
+class _StaggeredElements(GeometryStack):
+    """ Face geometry of a staggered grid. Since instances are shared between grids, the stacked face centers are computed only once. """
+
+    def __init__(self, geometries: tuple or list, stack_dim: Shape):
+        GeometryStack.__init__(self, geometries, stack_dim)
+        self._center = None
+
+    @property
+    def center(self):
+        if self._center is not None:
+            return self._center
+        center = super().center
+        if math.all_available(center):
+            self._center = center
+        return center
 
 
 def expand_staggered(values: Tensor, resolution: Shape, extrapolation: math.Extrapolation):
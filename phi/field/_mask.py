@@ -1,6 +1,9 @@
+import numpy as np
+
 from phi import math
-from phi.geom import Geometry
+from phi.geom import Geometry, GridCell, Box
 from ._field import Field
+from ..geom._box import Cuboid
 from ..math import Tensor
 
 
@@ -8,6 +11,8 @@ class HardGeometryMask(Field):
     """
     Field that takes the value 1 inside a Geometry object and 0 outside.
     For volume sampling, performs sampling at the center points.
+
+    When sampled on a grid, only the cells close to the bounding box of the geometry are evaluated.
     """
 
     def __init__(self, geometry: Geometry):
@@ -19,6 +24,11 @@ class HardGeometryMask(Field):
         return self.geometry.shape.non_channel
 
     def _sample(self, geometry: Geometry) -> Tensor:
+        if isinstance(geometry, GridCell):
+            return _culled_grid_sample(self, geometry)
+        return self._sample_all(geometry)
+
+    def _sample_all(self, geometry: Geometry) -> Tensor:
         return math.to_float(self.geometry.lies_inside(geometry.center))
 
     def __getitem__(self, item: dict):
@@ -33,8 +43,51 @@ class SoftGeometryMask(HardGeometryMask):
         super().__init__(geometry)
         self.balance = balance
 
-    def _sample(self, geometry: Geometry) -> Tensor:
+    def _sample_all(self, geometry: Geometry) -> Tensor:
         return self.geometry.approximate_fraction_inside(geometry, self.balance)
 
     def __getitem__(self, item: dict):
         return SoftGeometryMask(self.geometry[item], self.balance)
+
+
+CULLING_MARGIN = 2  # cells evaluated outside the bounding box, must cover the support of approximate_fraction_inside()
+
+
+def _culled_grid_sample(mask: HardGeometryMask, cells: GridCell) -> Tensor:
+    """
+    Samples `mask` on the cells that lie within `CULLING_MARGIN` cells of the bounding box of its geometry and fills the remaining cells with zeros.
+    Falls back to evaluating all cells if the bounding box is not known, e.g. while tracing or for inverted geometries.
+    """
+    try:
+        lower = mask.geometry.center - mask.geometry.bounding_half_extent()
+        upper = mask.geometry.center + mask.geometry.bounding_half_extent()
+    except NotImplementedError:
+        return mask._sample_all(cells)
+    if not isinstance(cells.bounds, Box) or not math.all_available(lower, upper, cells.bounds.lower, cells.bounds.upper):
+        return mask._sample_all(cells)
+    resolution = cells.resolution
+    lower = _vector_numpy(lower, resolution.rank).min(0)
+    upper = _vector_numpy(upper, resolution.rank).max(0)
+    origin = _vector_numpy(cells.bounds.lower, resolution.rank)[0]
+    dx = _vector_numpy(cells.size, resolution.rank)[0]
+    slices, widths = {}, {}
+    for i, (dim, size) in enumerate(resolution.named_sizes):
+        start = (lower[i] - origin[i]) / dx[i]
+        stop = (upper[i] - origin[i]) / dx[i]
+        start = int(np.clip(np.floor(start) - CULLING_MARGIN, 0, size - 1)) if np.isfinite(start) else 0  # infinite or undefined extent
+        stop = int(np.clip(np.ceil(stop) + CULLING_MARGIN, start + 1, size)) if np.isfinite(stop) else size
+        slices[dim] = slice(start, stop)
+        widths[dim] = (start, size - stop)
+    if all(w == (0, 0) for w in widths.values()):
+        return mask._sample_all(cells)
+    culled_cells = Cuboid(cells.center[slices], cells.half_size)
+    values = mask._sample_all(culled_cells)
+    return math.pad(values, widths, math.extrapolation.ZERO)
+
+
+def _vector_numpy(vector: Tensor, rank: int) -> np.ndarray:
+    """ Returns the values of `vector` as a NumPy array of shape `(n, rank)`. """
+    vector = math.wrap(vector)
+    if 'vector' not in vector.shape:
+        return np.broadcast_to(np.reshape(vector.numpy(vector.shape.names), (-1, 1)), (max(vector.shape.volume, 1), rank))
+    return np.reshape(vector.numpy(vector.shape.non_channel.names + ('vector',)), (-1, rank))
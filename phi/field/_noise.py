@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 
 from phi import math
@@ -38,17 +40,14 @@ class Noise(Field):
     def grid_sample(self, resolution: math.Shape, size, shape: math.Shape = None):
         shape = (self._shape if shape is None else shape) & resolution
         rndj = math.to_complex(random_normal(shape)) + 1j * math.to_complex(random_normal(shape))  # Note: there is no complex32
-        with math.NUMPY:
-            k = math.fftfreq(resolution) * resolution / size * self.scale  # in physical units
-            k = math.vec_squared(k)
-        lowest_frequency = 0.1
-        weight_mask = math.to_float(k > lowest_frequency)
-        # --- Compute 1/k ---
-        k._native[(0,) * len(k.shape)] = np.inf
-        inv_k = 1 / k
-        inv_k._native[(0,) * len(k.shape)] = 0
+        size = math.wrap(size)
+        if math.all_available(size) and isinstance(self.scale, (int, float)) and isinstance(self.smoothness, (int, float)):  # the spectral filter only depends on the grid, so it can be reused
+            size_key = (size.shape, tuple(size.numpy(size.shape.names).flatten()))
+            fft_filter = _spectral_filter(resolution.spatial, size_key, self.scale, self.smoothness)
+        else:
+            fft_filter = _compute_spectral_filter(resolution.spatial, size, self.scale, self.smoothness)
         # --- Compute result ---
-        fft = rndj * inv_k ** self.smoothness * weight_mask
+        fft = rndj * fft_filter
         array = math.real(math.ifft(fft))
         array /= math.std(array, dim=array.shape.non_batch)
         array -= math.mean(array, dim=array.shape.non_batch)
@@ -61,3 +60,23 @@ class Noise(Field):
 
     def __repr__(self):
         return f"{self._shape}, scale={self.scale}, smoothness={self.smoothness}"
+
+
+@lru_cache(maxsize=16)
+def _spectral_filter(resolution: math.Shape, size_key: tuple, scale, smoothness) -> Tensor:
+    size_shape, size_values = size_key
+    size = math.tensor(np.reshape(size_values, size_shape.sizes), size_shape)
+    return _compute_spectral_filter(resolution, size, scale, smoothness)
+
+
+def _compute_spectral_filter(resolution: math.Shape, size, scale, smoothness) -> Tensor:
+    with math.NUMPY:
+        k = math.fftfreq(resolution) * resolution / size * scale  # in physical units
+        k = math.vec_squared(k)
+    lowest_frequency = 0.1
+    weight_mask = math.to_float(k > lowest_frequency)
+    # --- Compute 1/k ---
+    k._native[(0,) * len(k.shape)] = np.inf
+    inv_k = 1 / k
+    inv_k._native[(0,) * len(k.shape)] = 0
+    return inv_k ** smoothness * weight_mask
@@ -1,10 +1,17 @@
+import copy
 from typing import Any
 
+import numpy as np
+
 from phi import math
-from phi.geom import Geometry, GridCell, Box
+from phi.geom import Geometry, GridCell, Box, NeighborIndex
 from ._field import SampledField
 from ..geom._stack import GeometryStack
 from ..math import Tensor, collection
+from ..math._tensors import copy_with, variable_attributes
+from ..math.backend import choose_backend
+
+MAX_SCATTER_PLANS = 4  # per list of shared plans, the oldest plans are evicted first
 
 
 class PointCloud(SampledField):
@@ -28,7 +35,8 @@ class PointCloud(SampledField):
                  extrapolation=math.extrapolation.ZERO,
                  add_overlapping=False,
                  bounds: Box = None,
-                 color: str or Tensor or tuple or list or None = None):
+                 color: str or Tensor or tuple or list or None = None,
+                 active: Tensor = None):
         """
         Args:
           elements: Geometry object specifying the sample points and sizes
@@ -37,6 +45,9 @@ class PointCloud(SampledField):
           add_overlapping: True: values of overlapping geometries are summed. False: values between overlapping geometries are interpolated
           bounds: (optional) size of the fixed domain in which the points should get visualized. None results in max and min coordinates of points.
           color: (optional) hex code for color or tensor of colors (same length as elements) in which points should get plotted.
+          active: (optional) Boolean `Tensor` marking the points that are in use. Inactive points are ignored when scattering to grids and are not moved by advection.
+            Together with `seed()` and `remove()`, this lets the number of particles change without changing the shape of the point cloud.
+            `None` marks all points as active.
         """
         SampledField.__init__(self, elements, math.wrap(values), extrapolation)
         self._add_overlapping = add_overlapping
@@ -44,6 +55,8 @@ class PointCloud(SampledField):
         self._bounds = bounds
         color = '#0060ff' if color is None else color
         self._color = math.wrap(color, collection('points')) if isinstance(color, (tuple, list)) else math.wrap(color)
+        self._active = active
+        self._scatter_plans = []  # (active, box, resolution, ScatterPlan), shared by all PointClouds with the same elements
 
     @property
     def shape(self):
@@ -54,28 +67,45 @@ class PointCloud(SampledField):
         values = self._values[item]
         color = self._color[item]
         extrapolation = self._extrapolation[item]
-        return PointCloud(elements, values, extrapolation, self._add_overlapping, self._bounds, color)
+        active = None if self._active is None else self._active[item]
+        return PointCloud(elements, values, extrapolation, self._add_overlapping, self._bounds, color, active)
 
     def with_elements(self, elements: Geometry):
-        return PointCloud(elements=elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color)
+        return PointCloud(elements=elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color, active=self._active)
 
     def with_values(self, values):
-        return PointCloud(elements=self.elements, values=values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color)
+        result = PointCloud(elements=self.elements, values=values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color, active=self._active)
+        result._scatter_plans = self._scatter_plans
+        return result
 
     def with_extrapolation(self, extrapolation: math.Extrapolation):
-        return PointCloud(elements=self.elements, values=self.values, extrapolation=extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color)
+        result = PointCloud(elements=self.elements, values=self.values, extrapolation=extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color, active=self._active)
+        result._scatter_plans = self._scatter_plans
+        return result
 
     def with_color(self, color: str or Tensor or tuple or list):
-        return PointCloud(elements=self.elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=color)
+        result = PointCloud(elements=self.elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=color, active=self._active)
+        result._scatter_plans = self._scatter_plans
+        return result
 
     def with_bounds(self, bounds: Box):
-        return PointCloud(elements=self.elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=bounds, color=self._color)
+        result = PointCloud(elements=self.elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=bounds, color=self._color, active=self._active)
+        result._scatter_plans = self._scatter_plans
+        return result
+
+    def __with_tattrs__(self, **tensor_attributes):
+        cloud = copy.copy(self)
+        for attr, value in tensor_attributes.items():
+            setattr(cloud, attr, value)
+        if '_elements' in tensor_attributes:
+            cloud._scatter_plans = []
+        return cloud
 
     def __value_attrs__(self):
         return '_values', '_extrapolation'
 
     def __variable_attrs__(self):
-        return '_values', '_elements'
+        return ('_values', '_elements') if self._active is None else ('_values', '_elements', '_active')
 
     @property
     def bounds(self) -> Box:
@@ -85,6 +115,160 @@ class PointCloud(SampledField):
     def color(self) -> Tensor:
         return self._color
 
+    @property
+    def active(self) -> Tensor or None:
+        """ Boolean `Tensor` marking the points that are in use or `None` if all points are active. """
+        return self._active
+
+    @property
+    def capacity(self) -> int:
+        """ Number of points this cloud can hold without growing, including inactive points. """
+        return self.points.shape.get_size('points')
+
+    @property
+    def count(self) -> Tensor:
+        """ Number of active points as `int` `Tensor`. """
+        if self._active is None:
+            return math.wrap(self.capacity)
+        return math.sum(math.to_int32(self._active), 'points')
+
+    def with_active(self, active: Tensor or None) -> 'PointCloud':
+        """ Returns a copy of this point cloud with the active mask replaced, see `active`. """
+        return PointCloud(elements=self.elements, values=self.values, extrapolation=self.extrapolation, add_overlapping=self._add_overlapping, bounds=self._bounds, color=self._color, active=active)
+
+    def remove(self, mask: Tensor) -> 'PointCloud':
+        """
+        Deactivates the points marked by `mask`.
+        The data of the points is kept and the shape of the point cloud does not change, so this can be used inside jit-compiled functions.
+
+        Args:
+            mask: Boolean `Tensor` marking the points to remove along `points`.
+
+        Returns:
+            `PointCloud` with the same capacity.
+        """
+        return self.with_active(~mask if self._active is None else self._active & ~mask)
+
+    def seed(self, elements: Geometry, values: Tensor or float = 0) -> 'PointCloud':
+        """
+        Adds new points, filling the slots of inactive points first.
+        If there are not enough free slots, the capacity is doubled, or increased further if required, so that repeated seeding grows the buffers in amortized constant time.
+        Only growing changes the shape of the point cloud and triggers a re-trace of jit-compiled functions taking it as input.
+
+        The slots are assigned on the host, so the active mask must be available, i.e. this cannot be called while tracing.
+
+        Args:
+            elements: Geometry of the new points, listed along the dimension `points`. Must be of the same type as `PointCloud.elements`.
+            values: Values of the new points.
+
+        Returns:
+            `PointCloud` holding the active points of this cloud and the new points.
+        """
+        assert type(elements) == type(self.elements), f"Seeded elements must be of type {type(self.elements).__name__} but got {type(elements).__name__}"
+        new_count = elements.shape.get_size('points')
+        if new_count == 0:
+            return self
+        capacity = self.capacity
+        active = math.tensor(True) if self._active is None else self._active
+        assert math.all_available(active), "seed() requires the active mask to be known and cannot be called while tracing"
+        batch = self.points.shape.non_channel.non_collection & active.shape.non_collection & elements.center.shape.non_channel.non_collection
+        native_active = math.reshaped_native(math.expand(active, collection(points=capacity)), [batch, 'points'], force_expand=True, to_numpy=True)
+        free = [np.flatnonzero(~a) for a in native_active]
+        required = capacity + max(new_count - f.size for f in free)
+        new_capacity = max(2 * capacity, required) if required > capacity else capacity
+        # --- slot i of the result takes point order[:, i] of the points concatenated with the new points ---
+        order = np.tile(np.append(np.arange(capacity), np.full(new_capacity - capacity, capacity + new_count - 1)), (len(free), 1))
+        result_active = np.zeros((len(free), new_capacity), bool)
+        result_active[:, :capacity] = native_active
+        for b, f in enumerate(free):
+            slots = np.append(f, np.arange(capacity, new_capacity))[:new_count]
+            order[b, slots] = capacity + np.arange(new_count)
+            result_active[b, slots] = True
+        result_dims = collection(points=new_capacity)
+
+        def insert(old: Tensor, new: Tensor):
+            new = math.wrap(new)
+            if old is new or ('points' not in old.shape and 'points' not in new.shape and math.all_available(old, new) and math.close(old, new)):
+                return old
+            combined = math.concat([math.expand(old, batch & collection(points=capacity)), math.expand(new, batch & collection(points=new_count))], collection('points'))
+            return _take_points(combined, batch, order[..., None], result_dims)
+
+        new_elements = copy_with(self.elements, **{a: insert(getattr(self.elements, a), getattr(elements, a)) for a in variable_attributes(self.elements)})
+        values = insert(self.values, math.expand(values, self.values.shape.non_collection.without(batch)))
+        active = math.reshaped_tensor(result_active, [batch, result_dims])
+        return PointCloud(new_elements, values, self.extrapolation, self._add_overlapping, self._bounds, insert(self._color, self._color[{'points': 0}]), active)
+
+    def compact(self) -> 'PointCloud':
+        """
+        Moves all active points to the front of the buffers, keeping their order.
+        The capacity is not changed.
+
+        If the active mask is not available, e.g. while tracing, this point cloud is returned unchanged.
+
+        Returns:
+            `PointCloud` where the active points occupy the first `count` slots.
+        """
+        if self._active is None or not math.all_available(self._active):
+            return self
+        batch = self.points.shape.non_channel.non_collection & self._active.shape.non_collection
+        native_active = math.reshaped_native(self._active, [batch, 'points'], force_expand=True, to_numpy=True)
+        return self._permuted(batch, np.argsort(~native_active, axis=-1, kind='stable'))
+
+    def neighbor_index(self, cell_size: float, previous: NeighborIndex = None) -> NeighborIndex:
+        """
+        Builds a `phi.geom.NeighborIndex` over the points of this cloud for radius and k-nearest-neighbor queries.
+
+        Args:
+            cell_size: Edge length of the cells of the index.
+            previous: (Optional) Index built for an earlier state of the same particles, e.g. before advection.
+                If given, the points are re-sorted starting from its order.
+
+        Returns:
+            `NeighborIndex`
+        """
+        if previous is not None and previous.cell_size == cell_size:
+            return previous.update(self.points)
+        return NeighborIndex(self.points, cell_size)
+
+    def sorted_by_cell(self, box: Box, resolution: math.Shape) -> 'PointCloud':
+        """
+        Reorders the points so that points lying in nearby grid cells are also close in memory.
+        The points are sorted by the Morton (Z-order) key of the grid cell containing them, which makes scatter and gather operations on grids of similar resolution access memory more locally.
+        Points outside `box` are assigned to the closest cell.
+
+        Elements, values, per-point colors and the active mask are permuted consistently, so the result represents the same field.
+        Inactive points are placed behind all active points.
+        Since points drift apart during advection, this should be repeated periodically, e.g. every few time steps.
+
+        The permutation is computed on the host. If the point positions are not available, e.g. while tracing a function, this point cloud is returned unchanged.
+
+        Args:
+            box: Physical bounds of the grid.
+            resolution: Grid resolution defining the cells.
+
+        Returns:
+            `PointCloud` holding the same points in Morton order.
+        """
+        points = self.points
+        if not math.all_available(points, *([] if self._active is None else [self._active])):
+            return self
+        batch = points.shape.non_channel.non_collection if self._active is None else points.shape.non_channel.non_collection & self._active.shape.non_collection
+        cells = math.to_int32(math.floor(box.global_to_local(points) * resolution))
+        cells = math.clip(cells, 0, math.tensor(resolution, math.channel('vector')) - 1)
+        native_cells = math.reshaped_native(cells, [batch, 'points', 'vector'], force_expand=True, to_numpy=True)
+        keys = _morton_keys(native_cells, resolution.sizes)
+        if self._active is not None:  # inactive points go last
+            keys[~math.reshaped_native(self._active, [batch, 'points'], force_expand=True, to_numpy=True)] = np.iinfo(np.uint64).max
+        return self._permuted(batch, np.argsort(keys, axis=-1, kind='stable'))
+
+    def _permuted(self, batch: math.Shape, order: np.ndarray) -> 'PointCloud':
+        """ Reorders all per-point data. `order` has shape `(batch.volume, capacity)` and lists the old index of each point. """
+        order = order[..., None]
+        dims = collection(points=self.capacity)
+        elements = copy_with(self.elements, **{a: _take_points(getattr(self.elements, a), batch, order, dims) for a in variable_attributes(self.elements)})
+        active = None if self._active is None else _take_points(self._active, batch, order, dims)
+        return PointCloud(elements, _take_points(self.values, batch, order, dims), self.extrapolation, self._add_overlapping, self._bounds, _take_points(self._color, batch, order, dims), active)
+
     def _sample(self, geometry: Geometry) -> Tensor:
         if geometry == self.elements:
             return self.values
@@ -98,7 +282,7 @@ class PointCloud(SampledField):
 
     def _grid_scatter(self, box: Box, resolution: math.Shape):
         """
-        Approximately samples this field on a regular grid using math.scatter().
+        Approximately samples this field on a regular grid using a `phi.math.ScatterPlan`.
 
         Args:
           box: physical dimensions of the grid
@@ -110,13 +294,25 @@ class PointCloud(SampledField):
           CenteredGrid
 
         """
-        closest_index = box.global_to_local(self.points) * resolution - 0.5
         mode = 'add' if self._add_overlapping else 'mean'
         base = math.zeros(resolution)
         if isinstance(self.extrapolation, math.extrapolation.ConstantExtrapolation):
             base += self.extrapolation.value
-        scattered = math.scatter(base, closest_index, self.values, mode=mode, outside_handling='discard')
-        return scattered
+        return self._scatter_plan(box, resolution).scatter(self.values, mode, base)
+
+    def _scatter_plan(self, box: Box, resolution: math.Shape) -> math.ScatterPlan:
+        """ Returns the `ScatterPlan` for the given grid, reusing previous plans of PointClouds with the same elements. """
+        for active, plan_box, plan_resolution, plan in self._scatter_plans:
+            if active is self._active and plan_resolution == resolution and plan_box == box:
+                return plan
+        closest_index = box.global_to_local(self.points) * resolution - 0.5
+        if self._active is not None:  # inactive points are moved outside the grid and discarded
+            closest_index = math.where(self._active, closest_index, -1)
+        plan = math.ScatterPlan(resolution, closest_index, outside_handling='discard')
+        if math.all_available(closest_index):
+            self._scatter_plans.append((self._active, box, resolution, plan))
+            del self._scatter_plans[:-MAX_SCATTER_PLANS]
+        return plan
 
     def __repr__(self):
         return "PointCloud[%s]" % (self.shape,)
@@ -131,3 +327,27 @@ def nonzero(field: SampledField):
     indices = math.nonzero(field.values, list_dim=collection('points'))
     elements = field.elements[indices]
     return PointCloud(elements, values=math.tensor(1.), extrapolation=math.extrapolation.ZERO, add_overlapping=False, bounds=field.bounds, color=None)
+
+
+def _take_points(value: Tensor, batch: math.Shape, order, result_dims: math.Shape) -> Tensor:
+    """ Gathers `value` along `points` using the NumPy index array `order` of shape `(batch.volume, result_dims.volume, 1)`. Tensors without `points` are returned unchanged. """
+    if 'points' not in value.shape:
+        return value
+    rest = value.shape.without(batch).without('points')
+    native = math.reshaped_native(value, [batch, 'points', rest], force_expand=True)
+    backend = choose_backend(native)
+    taken = backend.batched_gather_nd(native, backend.as_tensor(order))
+    return math.reshaped_tensor(taken, [batch, result_dims, rest], check_sizes=True)
+
+
+def _morton_keys(cells: np.ndarray, sizes: tuple) -> np.ndarray:
+    """ Interleaves the bits of the integer cell indices `cells` of shape `(..., d)` to Morton keys of shape `(...)`. """
+    rank = len(sizes)
+    bits = max(int(size - 1).bit_length() for size in sizes)
+    assert bits * rank <= 64, f"Morton keys of resolution {sizes} do not fit into 64 bits"
+    cells = cells.astype(np.uint64)
+    keys = np.zeros(cells.shape[:-1], np.uint64)
+    for bit in range(bits):
+        for dim in range(rank):
+            keys |= ((cells[..., dim] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(bit * rank + dim)
+    return keys
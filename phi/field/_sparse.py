@@ -0,0 +1,304 @@
+import copy
+import itertools
+from typing import Any
+
+import numpy as np
+
+from phi import math
+from phi.geom import Box, Geometry, GridCell
+from ._field import SampledField, Field, reduce_sample
+from ._grid import CenteredGrid
+from ._mask import HardGeometryMask
+from ._point_cloud import PointCloud
+from ..geom._box import Cuboid
+from ..geom._stack import GeometryStack
+from ..math import Shape, Tensor
+from ..math._shape import spatial, channel, collection
+
+
+class SparseGrid(SampledField):
+    """
+    Grid that only stores values inside active tiles.
+
+    The domain is partitioned into cubic tiles of `tile_size` cells along each spatial dimension.
+    Only active tiles are allocated, all other cells take the constant value of the extrapolation.
+    This makes sparse grids suited for narrow-band liquid surfaces or plumes that occupy a small fraction of the domain.
+
+    The values are stored as a `Tensor` listing the active tiles along the collection dimension `tiles`.
+    Each tile has the spatial dimensions of the grid with size `tile_size`.
+    The tile layout is structural and always stored as NumPy array; it is shared between all grids created using `with_values()`.
+
+    Sparse grids can be sampled like other fields and support `phi.field.spatial_gradient()`, `phi.field.divergence()`, `phi.field.laplace()`, `phi.physics.advect.semi_lagrangian()` and `phi.field.solve_linear()`.
+    All of these only operate on the cells of active tiles.
+    Use `SparseGrid.to_dense()` to convert a sparse grid to a `CenteredGrid`.
+    """
+
+    def __init__(self,
+                 values: Any,
+                 extrapolation: float or math.Extrapolation = 0.,
+                 bounds: Box = None,
+                 resolution: Shape = None,
+                 active: Any = None,
+                 threshold: float = 0,
+                 dilation: int = 1,
+                 tile_size: int = 8,
+                 **resolution_: int):
+        """
+        Args:
+            values: Values of the grid.
+                Has to be one of the following:
+
+                * `CenteredGrid` or other `Field`: samples the field at the cell centers of active tiles
+                * `phi.math.Tensor` with the spatial dimensions of the full grid: copies the values of active tiles
+                * `phi.geom.Geometry`: sets inside values to 1, outside to 0
+                * `Number`: uses the value for all active cells
+                * Function `values(x)` where `x` is a `phi.math.Tensor` representing the physical location.
+
+            extrapolation: Constant value or `ConstantExtrapolation` used for all cells outside active tiles.
+            bounds: Physical size and location of the grid as `phi.geom.Box`.
+            resolution: Full grid resolution as purely spatial `phi.math.Shape`. Must be divisible by `tile_size`.
+            active: Determines which tiles are allocated.
+                Has to be one of the following:
+
+                * `None`: activates all tiles containing a value whose magnitude exceeds `threshold`. Requires `values` to be a dense `Tensor`, `Grid` or `SparseGrid`.
+                * `SparseGrid`: uses the same tiles as the given grid.
+                * `PointCloud` or `Tensor` of physical locations with a `vector` dimension: activates all tiles containing a point.
+                * `phi.geom.Geometry`: activates all tiles intersecting the geometry.
+                * Boolean `Tensor` with the spatial dimensions of the full grid: activates all tiles containing a `True` cell.
+
+            threshold: Activation threshold used when `active=None`.
+            dilation: Number of neighbouring tiles to activate around each active tile.
+                This is not applied when `active` is a `SparseGrid`.
+            tile_size: Number of cells along each spatial dimension of a tile.
+            **resolution_: Spatial dimensions as keyword arguments.
+        """
+        if not isinstance(extrapolation, math.Extrapolation):
+            extrapolation = math.extrapolation.ConstantExtrapolation(extrapolation)
+        assert isinstance(extrapolation, math.extrapolation.ConstantExtrapolation), f"Sparse grids require a constant extrapolation but got {extrapolation}"
+        if resolution is None and not resolution_:
+            assert isinstance(values, (Tensor, CenteredGrid, SparseGrid)), "Grid resolution must be specified when 'values' is not a Tensor or grid."
+            resolution = values.resolution if isinstance(values, (CenteredGrid, SparseGrid)) else values.shape.spatial
+            bounds = bounds or (values.bounds if isinstance(values, (CenteredGrid, SparseGrid)) else None)
+        else:
+            resolution = (resolution or math.EMPTY_SHAPE) & spatial(**resolution_)
+        bounds = bounds or Box(0, math.wrap(resolution, channel('vector')))
+        assert resolution.spatial_rank == bounds.spatial_rank, f"Resolution {resolution} does not match bounds {bounds}"
+        if isinstance(active, SparseGrid):
+            assert active.resolution == resolution and active.tile_size == tile_size, f"Tile layout of {active} does not match resolution {resolution} and tile size {tile_size}"
+            layout = active._layout
+        else:
+            tile_mask = _activate(active if active is not None else values, resolution, bounds, tile_size, threshold)
+            layout = _TileLayout(resolution, tile_size, _dilate(tile_mask, dilation))
+        dx = bounds.size / resolution
+        elements = Cuboid(bounds.lower + (math.to_float(layout.cells) + 0.5) * dx, dx / 2)
+        if isinstance(values, Tensor) and values.shape.spatial == resolution:
+            values = math.gather(values, layout.cells)
+        elif isinstance(values, Geometry):
+            values = reduce_sample(HardGeometryMask(values), elements)
+        elif isinstance(values, Field):
+            values = reduce_sample(values, elements)
+        elif callable(values):
+            values = values(elements.center)
+            assert isinstance(values, math.Tensor), f"values function must return a Tensor but returned {type(values)}"
+        else:
+            values = math.expand(math.tensor(values), elements.shape.non_channel)
+        if values.dtype.kind not in (float, complex):
+            values = math.to_float(values)
+        SampledField.__init__(self, elements, values, extrapolation)
+        self._bounds = bounds
+        self._layout = layout
+
+    @property
+    def shape(self):
+        return self._elements.shape.non_channel & self._values.shape
+
+    @property
+    def resolution(self) -> Shape:
+        """ Resolution of the full grid. """
+        return self._layout.resolution
+
+    @property
+    def tile_size(self) -> int:
+        return self._layout.tile_size
+
+    @property
+    def tiles(self) -> Tensor:
+        """ Integer coordinates of the active tiles, measured in tiles, listed along the collection dimension `tiles`. """
+        return math.wrap(self._layout.tiles, collection('tiles'), channel('vector'))
+
+    @property
+    def bounds(self) -> Box:
+        return self._bounds
+
+    box = bounds
+
+    @property
+    def dx(self) -> Tensor:
+        return self._bounds.size / self.resolution
+
+    @property
+    def active_fraction(self) -> float:
+        """ Fraction of the full grid that is allocated. """
+        return len(self._layout.tiles) / max(1, self._layout.tile_map.size)
+
+    def with_values(self, values):
+        assert values.shape.only(self._values.shape.non_batch.non_channel) == self._values.shape.non_batch.non_channel, f"Values {values.shape} do not match tile layout {self._values.shape}"
+        result = copy.copy(self)
+        result._values = values
+        return result
+
+    def with_extrapolation(self, extrapolation: math.Extrapolation):
+        assert isinstance(extrapolation, math.extrapolation.ConstantExtrapolation), f"Sparse grids require a constant extrapolation but got {extrapolation}"
+        result = copy.copy(self)
+        result._extrapolation = extrapolation
+        return result
+
+    def __value_attrs__(self):
+        return '_values', '_extrapolation'
+
+    def __variable_attrs__(self):
+        return '_values',
+
+    def __getitem__(self, item: dict) -> 'SparseGrid':
+        assert not any(dim in self._values.shape.spatial or dim == 'tiles' for dim in item), f"Sparse grids cannot be sliced along spatial dimensions but got {item}"
+        return self.with_values(self._values[item]).with_extrapolation(self._extrapolation[item])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}[{self._values.shape.non_spatial.non_collection & self.resolution}, tiles={len(self._layout.tiles)}x{self.tile_size}, extrapolation={self._extrapolation}]"
+
+    def to_dense(self) -> CenteredGrid:
+        """ Returns a `CenteredGrid` containing the values of all cells, including the inactive ones. """
+        return CenteredGrid(self._gather(self._layout.dense_indices()), bounds=self._bounds, extrapolation=self._extrapolation)
+
+    def _sample(self, geometry: Geometry) -> Tensor:
+        if isinstance(geometry, GeometryStack):
+            sampled = [self._sample(g) for g in geometry.geometries]
+            return math.stack(sampled, geometry.stack_dim)
+        if isinstance(geometry, GridCell) and geometry == GridCell(self.resolution, self._bounds):
+            return self.to_dense().values
+        points = self._bounds.global_to_local(geometry.center) * self.resolution - 0.5
+        lower = math.floor(points)
+        weights = points - lower
+        lower = math.to_int32(lower)
+        atlas = self._atlas()
+        result = 0
+        for corner in itertools.product((0, 1), repeat=self.resolution.rank):
+            corner = math.wrap(corner, channel('vector'))
+            weight = math.prod(math.where(corner == 1, weights, 1 - weights), 'vector')
+            result += weight * math.gather(atlas, self._layout.lookup(lower + corner))
+        return result
+
+    def _shifted(self, dim: str, offset: int) -> Tensor:
+        """ Values of the cells `offset` cells away along `dim` for all active cells. Cells outside active tiles take the extrapolation value. """
+        if offset == 0:
+            return self._values
+        return self._gather(self._layout.shifted_indices(self.resolution.index(dim), offset))
+
+    def _gather(self, indices: Tensor) -> Tensor:
+        """ Gathers values at tile indices produced by `_TileLayout`. The last tile index refers to the background. """
+        return math.gather(self._atlas(), indices)
+
+    def _atlas(self) -> Tensor:
+        """ Tile values followed by a background tile, with the tile dimension converted to a spatial dimension for `phi.math.gather()`. """
+        values = self._values
+        with math.choose_backend(values):
+            background = math.zeros(values.shape.without('tiles') & collection(tiles=1)) + self._extrapolation.value
+        values = math.concat([values, background], collection('tiles'))
+        groups = [values.shape.batch, 'tiles', *values.shape.spatial.names, values.shape.channel]
+        return math.reshaped_tensor(math.reshaped_native(values, groups), [values.shape.batch, spatial(tile_=values.shape.get_size('tiles')), *[values.shape.only(dim) for dim in values.shape.spatial.names], values.shape.channel], convert=False)
+
+
+class _TileLayout:
+    """
+    Static tile structure of a `SparseGrid`.
+    Index tensors for neighbour lookups are computed once and shared by all grids with this layout.
+    """
+
+    def __init__(self, resolution: Shape, tile_size: int, tile_mask: np.ndarray):
+        self.resolution = resolution
+        self.tile_size = tile_size
+        self.tiles = np.stack(np.nonzero(tile_mask), -1).astype(np.int32)  # (tiles, vector)
+        self.tile_map = np.full(tile_mask.shape, -1, np.int32)
+        self.tile_map[tuple(self.tiles.T)] = np.arange(len(self.tiles))
+        local = np.stack(np.meshgrid(*[np.arange(tile_size)] * resolution.rank, indexing='ij'), -1)
+        self._cells = self.tiles.reshape((len(self.tiles),) + (1,) * resolution.rank + (resolution.rank,)) * tile_size + local  # (tiles, *tile, vector)
+        self._cache = {}
+
+    @property
+    def tile_shape(self) -> Shape:
+        return collection(tiles=len(self.tiles)) & spatial(**{dim: self.tile_size for dim in self.resolution.names})
+
+    @property
+    def cells(self) -> Tensor:
+        """ Global cell indices of all active cells. """
+        return math.wrap(self._cells, self.tile_shape, channel('vector'))
+
+    def _indices(self, cells: np.ndarray) -> np.ndarray:
+        inside = np.all((cells >= 0) & (cells < self.resolution.sizes), -1)
+        tile = np.clip(cells // self.tile_size, 0, np.array(self.tile_map.shape) - 1)
+        tile_index = self.tile_map[tuple(np.moveaxis(tile, -1, 0))]
+        tile_index = np.where(inside & (tile_index >= 0), tile_index, len(self.tiles))
+        return np.concatenate([tile_index[..., None], cells % self.tile_size], -1)
+
+    def shifted_indices(self, axis: int, offset: int) -> Tensor:
+        key = ('shift', axis, offset)
+        if key not in self._cache:
+            cells = self._cells.copy()
+            cells[..., axis] += offset
+            self._cache[key] = math.wrap(self._indices(cells), self.tile_shape, channel('vector'))
+        return self._cache[key]
+
+    def dense_indices(self) -> Tensor:
+        if 'dense' not in self._cache:
+            cells = np.stack(np.meshgrid(*[np.arange(n) for n in self.resolution.sizes], indexing='ij'), -1)
+            self._cache['dense'] = math.wrap(self._indices(cells), self.resolution, channel('vector'))
+        return self._cache['dense']
+
+    def lookup(self, cells: Tensor) -> Tensor:
+        """ Converts integer cell indices to tile indices. Supports all backends. """
+        resolution = math.wrap(self.resolution.sizes, channel('vector'))
+        inside = math.all((cells >= 0) & (cells < resolution), 'vector')
+        tile = math.clip(cells // self.tile_size, 0, math.wrap(self.tile_map.shape, channel('vector')) - 1)
+        tile_index = math.gather(math.wrap(self.tile_map, spatial(**{f'{dim}_': n for dim, n in zip(self.resolution.names, self.tile_map.shape)})), tile)
+        tile_index = math.where(inside & (tile_index >= 0), tile_index, len(self.tiles))
+        return math.stack([tile_index, *math.unstack(cells % self.tile_size, 'vector')], channel('vector'))
+
+
+def _activate(active: Any, resolution: Shape, bounds: Box, tile_size: int, threshold: float) -> np.ndarray:
+    """ Returns a boolean NumPy array with one entry per tile. """
+    assert all(size % tile_size == 0 for size in resolution.sizes), f"Resolution {resolution} must be divisible by the tile size {tile_size}"
+    tile_resolution = tuple(size // tile_size for size in resolution.sizes)
+    if isinstance(active, SparseGrid):
+        active = active.to_dense()
+    if isinstance(active, CenteredGrid):
+        active = active.values
+    if isinstance(active, PointCloud):
+        active = active.points
+    if isinstance(active, Tensor) and 'vector' in active.shape and active.shape.spatial != resolution:  # physical locations
+        points = math.reshaped_native(active, [active.shape.non_channel, 'vector'], to_numpy=True)
+        tiles = np.floor(bounds.global_to_local(math.wrap(points, collection('points'), channel('vector'))).numpy('points,vector') * tile_resolution).astype(np.int64)
+        tiles = tiles[np.all((tiles >= 0) & (tiles < tile_resolution), -1)]
+        mask = np.zeros(tile_resolution, bool)
+        mask[tuple(tiles.T)] = True
+        return mask
+    if isinstance(active, Tensor):  # dense cell values or mask
+        assert active.shape.spatial == resolution, f"Cannot determine active tiles from {active.shape}, spatial dimensions must match resolution {resolution}"
+        cells = math.abs(active) > threshold if active.dtype.kind != bool else active
+        cells = cells.numpy([*cells.shape.non_spatial.names, *resolution.names]).reshape((-1,) + resolution.sizes).any(0)
+        return cells.reshape(sum([(n, tile_size) for n in tile_resolution], ())).any(tuple(range(1, 2 * len(tile_resolution), 2)))
+    if isinstance(active, Geometry):
+        tile_size_ = bounds.size / math.wrap(tile_resolution, channel('vector'))
+        centers = bounds.lower + (math.to_float(math.meshgrid(**{dim: n for dim, n in zip(resolution.names, tile_resolution)})) + 0.5) * tile_size_
+        distance = active.approximate_signed_distance(centers)
+        return (distance <= math.vec_abs(tile_size_) / 2).numpy(resolution.names)
+    raise ValueError(f"Cannot determine active tiles from {type(active)}. Pass 'active' to specify which tiles to allocate.")
+
+
+def _dilate(mask: np.ndarray, dilation: int) -> np.ndarray:
+    if dilation <= 0:
+        return mask
+    padded = np.pad(mask, dilation)
+    result = np.zeros_like(mask)
+    for offset in itertools.product(range(2 * dilation + 1), repeat=mask.ndim):
+        result |= padded[tuple(slice(o, o + n) for o, n in zip(offset, mask.shape))]
+    return result
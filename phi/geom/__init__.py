@@ -16,5 +16,6 @@ from ._box import Box, GridCell, BaseBox
 from ._sphere import Sphere
 from ._stack import stack
 from ._geom_math import concat, invert
+from ._neighbors import NeighborIndex
 
 __all__ = [key for key in globals().keys() if not key.startswith('_')]
@@ -1,4 +1,5 @@
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Callable
 
 import numpy as np
 
@@ -7,7 +8,7 @@ from ._geom import Geometry, _fill_spatial_with_singleton
 from ._transform import rotate
 from ..math import wrap
 from ..math._tensors import Tensor
-from ..math.backend._backend import combined_dim
+from ..math.backend._backend import combined_dim, default_backend, get_precision
 
 
 class BaseBox(Geometry):  # not a Subwoofer
@@ -318,6 +319,9 @@ class GridCell(BaseBox):
         Returns:
 
         """
+        return cached_grid_geometry('center', self._resolution, self._bounds, self._compute_center)
+
+    def _compute_center(self):
         local_coords = math.meshgrid(**{dim: math.linspace(0.5 / size, 1 - 0.5 / size, size) for dim, size in self.resolution.named_sizes})
         points = self.bounds.local_to_global(local_coords)
         return points
@@ -408,3 +412,51 @@ class GridCell(BaseBox):
 
     def __repr__(self):
         return f"{self._resolution}, bounds={self._bounds}"
+
+
+GRID_CACHE_SIZE = 128
+_GRID_CACHE = OrderedDict()
+
+
+def cached_grid_geometry(kind: str, resolution: math.Shape, bounds: BaseBox, compute: Callable, *key):
+    """
+    Returns `compute()`, memoizing the result for grids with the same resolution and bounds.
+    The cache holds up to `GRID_CACHE_SIZE` entries, evicting the least recently used ones.
+
+    Results are cached separately for each default backend, compute device and precision since these determine the type of the created tensors.
+    If the bounds are not available, e.g. while tracing a function, `compute()` is called every time.
+
+    Args:
+        kind: Name of the cached quantity, e.g. `'center'`.
+        resolution: Grid resolution.
+        bounds: Physical bounds of the grid.
+        compute: Function without arguments that computes the value.
+        *key: Additional hashable values that `compute()` depends on.
+
+    Returns:
+        Result of `compute()`. The returned value must not be modified in-place.
+        Tensors contained in the value, possibly inside a `tuple`, are only cached if their values are available.
+    """
+    if not isinstance(bounds, Box) or not math.all_available(bounds.lower, bounds.upper):
+        return compute()
+    backend = default_backend()
+    cache_key = (kind, resolution, _tensor_key(bounds.lower), _tensor_key(bounds.upper), backend, backend.get_default_device(), get_precision(), key)
+    if cache_key in _GRID_CACHE:
+        _GRID_CACHE.move_to_end(cache_key)
+        return _GRID_CACHE[cache_key]
+    value = compute()
+    if _is_available(value):  # tensors created while tracing cannot be reused outside of the trace
+        _GRID_CACHE[cache_key] = value
+        while len(_GRID_CACHE) > GRID_CACHE_SIZE:
+            _GRID_CACHE.popitem(last=False)
+    return value
+
+
+def _tensor_key(value: Tensor):
+    return value.shape, tuple(value.numpy(value.shape.names).flatten().tolist())
+
+
+def _is_available(value) -> bool:
+    if isinstance(value, tuple):
+        return all(_is_available(v) for v in value)
+    return not isinstance(value, Tensor) or math.all_available(value)
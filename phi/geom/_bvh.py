@@ -0,0 +1,339 @@
+from typing import Tuple, List
+
+import numpy as np
+
+from phi import math
+from ._geom import Geometry
+from ..math import Tensor, Shape
+from ..math._shape import batch, channel, concat_shapes
+from ..math._tensors import NativeTensor, variable_attributes, copy_with
+from ..math.backend import NUMPY, choose_backend
+
+BVH_MIN_GEOMETRIES = 16  # unions and stacks with fewer geometries are evaluated on all points
+_PAIRS = '_pairs'
+
+
+class BVH:
+    """
+    Bounding volume hierarchy over the axis-aligned bounding boxes of a sequence of geometries, stored in flat NumPy arrays.
+
+    Nodes are split at the median bounding box center along their longest axis until at most `leaf_size` geometries remain.
+    Queries traverse the tree for all points simultaneously, so their cost scales with the number of (point, nearby geometry) pairs instead of points × geometries.
+    """
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, leaf_size=4):
+        """
+        Args:
+            lower: Lower corners of the geometry bounding boxes with shape `(geometries, rank)`.
+            upper: Upper corners of the geometry bounding boxes with shape `(geometries, rank)`.
+            leaf_size: Maximum number of geometries per leaf.
+        """
+        centers = (lower + upper) / 2
+        order, parents, leaf_start, leaf_count = [], [], [], []
+        stack = [(np.arange(len(lower)), -1)]
+        while stack:  # depth-first so that every left child directly follows its parent
+            members, parent = stack.pop()
+            parents.append(parent)
+            if len(members) <= leaf_size:
+                leaf_start.append(len(order))
+                leaf_count.append(len(members))
+                order.extend(members)
+            else:
+                leaf_start.append(0)
+                leaf_count.append(0)
+                axis = np.argmax(centers[members].max(0) - centers[members].min(0))
+                members = members[np.argsort(centers[members, axis], kind='stable')]
+                stack.append((members[len(members) // 2:], len(parents) - 1))
+                stack.append((members[:len(members) // 2], len(parents) - 1))
+        self.children = np.full((len(parents), 2), -1, dtype=np.int64)
+        for node, parent in enumerate(parents[1:], 1):
+            self.children[parent, 0 if self.children[parent, 0] < 0 else 1] = node
+        self.order = np.asarray(order, dtype=np.int64)
+        self.leaf_start = np.asarray(leaf_start, dtype=np.int64)
+        self.leaf_count = np.asarray(leaf_count, dtype=np.int64)
+        self.lower, self.upper = lower, upper
+        self.node_lower, self.node_upper = self._node_bounds(lower, upper)
+
+    def _node_bounds(self, lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        node_lower = np.empty((len(self.children), lower.shape[1]))
+        node_upper = np.empty_like(node_lower)
+        for node in reversed(range(len(self.children))):  # children always come after their parent
+            left, right = self.children[node]
+            if left < 0:
+                members = self.order[self.leaf_start[node]:self.leaf_start[node] + self.leaf_count[node]]
+                node_lower[node] = lower[members].min(0)
+                node_upper[node] = upper[members].max(0)
+            else:
+                node_lower[node] = np.minimum(node_lower[left], node_lower[right])
+                node_upper[node] = np.maximum(node_upper[left], node_upper[right])
+        return node_lower, node_upper
+
+    def _with_bounds(self, lower, upper, node_lower, node_upper) -> 'BVH':
+        result = object.__new__(BVH)
+        result.__dict__.update(self.__dict__)
+        result.lower, result.upper = lower, upper
+        result.node_lower, result.node_upper = node_lower, node_upper
+        return result
+
+    def refit(self, lower: np.ndarray, upper: np.ndarray) -> 'BVH':
+        """ Returns a `BVH` with the same tree structure whose node bounds enclose the new geometry bounds. """
+        return self._with_bounds(lower, upper, *self._node_bounds(lower, upper))
+
+    def translated(self, delta: np.ndarray) -> 'BVH':
+        """ Returns the `BVH` of the geometries shifted by the common offset `delta`. """
+        return self._with_bounds(self.lower + delta, self.upper + delta, self.node_lower + delta, self.node_upper + delta)
+
+    def overlapping(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds all pairs of points and geometries where the point lies inside the bounding box of the geometry.
+
+        Args:
+            points: Query points of shape `(points, rank)`.
+
+        Returns:
+            point_indices: `np.ndarray` of indices into `points`.
+            geometry_indices: `np.ndarray` of the same length holding the corresponding geometry indices.
+        """
+        tolerance = _tolerance(points)[:, None]
+
+        def inside(p, lower, upper):
+            return np.all((points[p] >= lower - tolerance[p]) & (points[p] <= upper + tolerance[p]), axis=1)
+
+        p, node = np.arange(len(points)), np.zeros(len(points), dtype=np.int64)
+        pairs = []
+        while len(p):
+            hit = inside(p, self.node_lower[node], self.node_upper[node])
+            (leaf_p, leaf_g), (p, node) = self._expand(p[hit], node[hit])
+            hit = inside(leaf_p, self.lower[leaf_g], self.upper[leaf_g])
+            pairs.append((leaf_p[hit], leaf_g[hit]))
+        return _concat_pairs(pairs)
+
+    def closest_leaf(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Descends the tree towards the closer child for every point and returns all pairs of points and geometries in the reached leaves.
+        Evaluating the signed distances of these pairs yields upper bounds for `candidates()`.
+
+        Args:
+            points: Query points of shape `(points, rank)`.
+
+        Returns:
+            point_indices: `np.ndarray` of indices into `points`.
+            geometry_indices: `np.ndarray` of the same length holding the corresponding geometry indices.
+        """
+        node = np.zeros(len(points), dtype=np.int64)
+        inner = np.nonzero(self.children[node, 0] >= 0)[0]
+        while len(inner):
+            left, right = self.children[node[inner], 0], self.children[node[inner], 1]
+            closer_left = _min_distance(points[inner], self.node_lower[left], self.node_upper[left]) <= _min_distance(points[inner], self.node_lower[right], self.node_upper[right])
+            node[inner] = np.where(closer_left, left, right)
+            inner = inner[self.children[node[inner], 0] >= 0]
+        (p, g), _ = self._expand(np.arange(len(points)), node)
+        return p, g
+
+    def candidates(self, points: np.ndarray, upper_bound: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds all pairs of points and geometries whose signed distance may be smaller than `upper_bound`.
+
+        The L-infinity distance to a bounding box is used as lower bound for the signed distance of the geometry inside.
+        This is valid for geometries whose signed distance is at least their L-infinity distance, such as boxes and spheres.
+        Other geometries, e.g. rotated ones, may have smaller signed distances and must not be filtered using this method.
+
+        Args:
+            points: Query points of shape `(points, rank)`.
+            upper_bound: Upper bound of the smallest signed distance for each point, e.g. computed from `closest_leaf()`.
+
+        Returns:
+            point_indices: `np.ndarray` of indices into `points`.
+            geometry_indices: `np.ndarray` of the same length holding the corresponding geometry indices.
+        """
+        upper_bound = np.maximum(upper_bound, 0) + _tolerance(points)  # a point with negative distance lies inside the bounding box of the closest geometry
+
+        def near(p, lower, upper):
+            return _min_distance(points[p], lower, upper) <= upper_bound[p]
+
+        p, node = np.arange(len(points)), np.zeros(len(points), dtype=np.int64)
+        pairs = []
+        while len(p):
+            keep = near(p, self.node_lower[node], self.node_upper[node])
+            (leaf_p, leaf_g), (p, node) = self._expand(p[keep], node[keep])
+            keep = near(leaf_p, self.lower[leaf_g], self.upper[leaf_g])
+            pairs.append((leaf_p[keep], leaf_g[keep]))
+        return _concat_pairs(pairs)
+
+    def _expand(self, p: np.ndarray, node: np.ndarray):
+        """ Replaces leaf nodes by their geometries and inner nodes by their children. """
+        is_leaf = self.children[node, 0] < 0
+        leaf_p, leaf_node = p[is_leaf], node[is_leaf]
+        counts = self.leaf_count[leaf_node]
+        offsets = np.repeat(self.leaf_start[leaf_node] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        inner_p, inner_node = p[~is_leaf], node[~is_leaf]
+        inner_pairs = np.concatenate([inner_p, inner_p]), np.concatenate([self.children[inner_node, 0], self.children[inner_node, 1]])
+        return (np.repeat(leaf_p, counts), self.order[offsets]), inner_pairs
+
+
+def _concat_pairs(pairs: List[tuple]):
+    if not pairs:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    return np.concatenate([p for p, _ in pairs]), np.concatenate([g for _, g in pairs])
+
+
+def _tolerance(points: np.ndarray) -> np.ndarray:
+    """ Margin covering rounding errors of single-precision geometry computations. """
+    return 1e-5 * (1 + np.max(np.abs(points), axis=1))
+
+
+def _min_distance(points, lower, upper):
+    return np.max(np.maximum(np.maximum(lower - points, points - upper), 0), axis=1)
+
+
+class GeometryGroups:
+    """
+    Partitions geometries into groups of the same type and attribute shapes.
+    The variable attributes of each group are stacked in NumPy arrays so that any subset can be gathered into a single batched geometry.
+    Geometries that are not `TensorLike` or not backed by NumPy form groups of their own and are evaluated individually.
+    """
+
+    def __init__(self, geometries: Tuple[Geometry, ...]):
+        self.geometries = geometries
+        keys = {}
+        self.group = np.empty(len(geometries), np.int64)
+        self.local = np.empty(len(geometries), np.int64)
+        members = []
+        for i, g in enumerate(geometries):
+            key = _group_key(g)
+            if key is None or key not in keys:
+                keys[key if key is not None else ('individual', i)] = len(members)
+                members.append([])
+            self.group[i] = keys[key if key is not None else ('individual', i)]
+            self.local[i] = len(members[self.group[i]])
+            members[self.group[i]].append(g)
+        self.prototypes = [group[0] for group in members]
+        self.attributes = []
+        for group in members:
+            if _group_key(group[0]) is None:
+                self.attributes.append(None)
+            else:
+                self.attributes.append({name: np.stack([getattr(g, name).numpy(shape.names) for g in group]) for name, shape in _group_key(group[0])[1]})
+
+    def _gathered(self, group: int, local_indices) -> Geometry:
+        """ Creates a geometry holding the geometries of `group` at `local_indices` along the batch dimension `_pairs`. """
+        if self.attributes[group] is None:
+            return self.prototypes[group]
+        values = {}
+        for name, shape in _group_key(self.prototypes[group])[1]:
+            array = self.attributes[group][name][local_indices]
+            values[name] = NativeTensor(array, batch(_pairs=array.shape[0]) & shape)
+        return copy_with(self.prototypes[group], **values)
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray] or None:
+        """ Returns the lower and upper corners of all bounding boxes as NumPy arrays of shape `(geometries, rank)` or `None` if they cannot be determined. """
+        rank = self.geometries[0].spatial_rank
+        lower = np.empty((len(self.geometries), rank))
+        upper = np.empty((len(self.geometries), rank))
+        for group in range(len(self.prototypes)):
+            selected = np.nonzero(self.group == group)[0]
+            g = self._gathered(group, slice(None))
+            try:
+                center, extent = math.wrap(g.center), math.wrap(g.bounding_half_extent())
+            except NotImplementedError:
+                return None
+            if not is_numpy(center, extent):
+                return None
+            shape = batch(_pairs=len(selected)) & channel(vector=rank)
+            lower[selected] = math.expand(center - extent, shape).numpy(shape.names)
+            upper[selected] = math.expand(center + extent, shape).numpy(shape.names)
+        return (lower, upper) if np.all(np.isfinite(lower)) and np.all(np.isfinite(upper)) else None
+
+    def evaluate(self, method: str, points: np.ndarray, point_indices: np.ndarray, geometry_indices: np.ndarray, **kwargs) -> np.ndarray:
+        """
+        Calls `method` of `geometries[geometry_indices[i]]` with the point `points[point_indices[i]]` for all pairs `i`.
+        The geometries of each group are gathered into one batched geometry, holding one instance per pair, which is evaluated in a single call.
+
+        Args:
+            method: Name of the `Geometry` method taking the points as first argument, e.g. `'lies_inside'`.
+            points: All query points with shape `(points, rank)`.
+            point_indices: Point index of each pair.
+            geometry_indices: Geometry index of each pair.
+            **kwargs: Additional arguments passed to `method`.
+
+        Returns:
+            `np.ndarray` holding the results of all pairs along the first axis.
+        """
+        if len(self.prototypes) == 1:
+            return _call(self._gathered(0, self.local[geometry_indices]), method, points[point_indices], kwargs)
+        result = None
+        for group in np.unique(self.group[geometry_indices]):
+            selected = np.nonzero(self.group[geometry_indices] == group)[0]
+            values = _call(self._gathered(group, self.local[geometry_indices[selected]]), method, points[point_indices[selected]], kwargs)
+            if result is None:
+                result = np.empty((len(point_indices),) + values.shape[1:], values.dtype)
+            result[selected] = values
+        return result if result is not None else _call(self._gathered(0, self.local[:0]), method, points[:0], kwargs)
+
+
+def _group_key(geometry: Geometry) -> tuple or None:
+    try:
+        names = variable_attributes(geometry)
+    except ValueError:
+        return None
+    values = [getattr(geometry, name) for name in names]
+    if not all(isinstance(v, Tensor) for v in values) or not is_numpy(*values):
+        return None
+    return type(geometry), tuple((name, v.shape) for name, v in zip(names, values))
+
+
+def build_bvh(geometries: Tuple[Geometry, ...]) -> Tuple[BVH, GeometryGroups] or Tuple[None, None]:
+    """
+    Builds a `BVH` over the bounding boxes of `geometries`.
+
+    Returns:
+        bvh: `BVH` or `None` if there are too few geometries or if they are not NumPy-backed geometries without batch dimensions.
+        groups: `GeometryGroups` of `geometries` to evaluate the pairs found by the `BVH`.
+    """
+    if len(geometries) < BVH_MIN_GEOMETRIES or any(g.shape.non_spatial for g in geometries):
+        return None, None
+    groups = GeometryGroups(geometries)
+    bounds = groups.bounds()
+    return (None, None) if bounds is None else (BVH(*bounds), groups)
+
+
+def refit_bvh(bvh: BVH, geometries: Tuple[Geometry, ...]) -> Tuple[BVH, GeometryGroups] or Tuple[None, None]:
+    """ Adapts `bvh` to the moved `geometries` without rebuilding the tree. Returns the same values as `build_bvh()`. """
+    groups = GeometryGroups(geometries)
+    bounds = groups.bounds()
+    return (None, None) if bounds is None else (bvh.refit(*bounds), groups)
+
+
+def is_numpy(*values: Tensor) -> bool:
+    """ Tests whether all `values` are available and backed by NumPy arrays. """
+    if not math.all_available(*values):
+        return False
+    natives = sum([v._natives() for v in values], ())
+    return not natives or choose_backend(*natives) == NUMPY
+
+
+def query_points(location: Tensor) -> np.ndarray or None:
+    """ Returns `location` as NumPy array of shape `(points, rank)` if it can be queried using a `BVH`, else `None`. """
+    if not isinstance(location, Tensor) or location.shape.channel.names != ('vector',) or not is_numpy(location):
+        return None
+    return np.reshape(location.numpy(location.shape.non_channel.names + ('vector',)), (-1, location.shape.get_size('vector')))
+
+
+def _call(geometry: Geometry, method: str, points: np.ndarray, kwargs: dict) -> np.ndarray:
+    location = NativeTensor(points, batch(_pairs=points.shape[0]) & channel(vector=points.shape[1]))
+    result = math.wrap(getattr(geometry, method)(location, **kwargs))
+    names = (_PAIRS,) + (('vector',) if 'vector' in result.shape else ())
+    return math.expand(result, batch(_pairs=points.shape[0])).numpy(names)
+
+
+def select_per_point(point_indices: np.ndarray, score: np.ndarray) -> np.ndarray:
+    """ Returns, for every point that appears in `point_indices`, the index of the pair with the highest `score`. """
+    order = np.lexsort((score, point_indices))
+    last = np.append(point_indices[order][1:] != point_indices[order][:-1], True)
+    return order[last]
+
+
+def unflatten(values: np.ndarray, location: Tensor, extra: Shape = math.EMPTY_SHAPE) -> Tensor:
+    """ Reshapes `values` of shape `(points, ...)` to the non-channel shape of `location` followed by `extra`. """
+    shape = concat_shapes(location.shape.non_channel, extra)
+    return NativeTensor(np.reshape(values, shape.sizes), shape)
@@ -0,0 +1,239 @@
+from typing import Callable, Tuple
+
+import numpy as np
+
+from phi import math
+from ..math import Tensor, Shape
+from ..math._shape import collection
+
+MAX_LOOKUPS_PER_CHUNK = 1 << 20  # cell lookups evaluated at once, bounds the memory of queries on large point sets
+
+
+class NeighborIndex:
+    """
+    Cell list over a set of points for radius and nearest-neighbor queries, stored in flat NumPy arrays.
+
+    The points are sorted by the linear index of the cubic cell of size `cell_size` containing them.
+    Queries look up the cells overlapping the search sphere with `numpy.searchsorted()` and evaluate all candidate pairs at once, processing the query points in chunks to bound the memory usage.
+    Batch dimensions of the points are folded into the cell index, so all examples are handled by the same array operations.
+
+    Use `update()` to move the points. It re-sorts the points starting from the previous order, which is fast when few points changed their cell.
+
+    Only NumPy tensors are supported.
+    """
+
+    def __init__(self, points: Tensor, cell_size: float or int):
+        """
+        Args:
+            points: Point locations with one collection dimension listing the points and a channel dimension `vector`.
+                All other dimensions are treated as batch dimensions.
+            cell_size: Edge length of the cells. Radius queries are typically fastest if `cell_size` is about half the radius.
+        """
+        assert cell_size > 0, f"cell_size must be positive but got {cell_size}"
+        assert points.shape.collection.rank == 1, f"points must have exactly one collection dimension but got {points.shape}"
+        assert points.shape.channel.names == ('vector',), f"points must have a channel dimension 'vector' but got {points.shape}"
+        self.cell_size = float(cell_size)
+        self.points = points
+        self._batch = points.shape.non_channel.non_collection
+        self._list = points.shape.collection
+        native = math.reshaped_native(points, [self._batch, self._list, 'vector'], force_expand=True, to_numpy=True)
+        self._positions = native.reshape((-1, native.shape[-1])).astype(np.float64)
+        self._build(previous=None)
+
+    def _build(self, previous: 'NeighborIndex' or None):
+        if previous is not None and np.all(self._positions >= previous._lower) and np.all(self._positions < previous._upper):
+            self._lower, self._upper, self._resolution = previous._lower, previous._upper, previous._resolution
+        else:
+            self._lower = self._positions.min(0) if self._positions.size else np.zeros(self._positions.shape[-1])
+            self._resolution = np.floor((self._positions.max(0) - self._lower) / self.cell_size).astype(np.int64) + 1 if self._positions.size else np.ones_like(self._lower, np.int64)
+            self._upper = self._lower + self._resolution * self.cell_size
+        keys = self._keys(self._positions)
+        if previous is not None and len(previous._order) == len(keys):
+            order = previous._order[np.argsort(keys[previous._order], kind='stable')]  # nearly sorted input
+        else:
+            order = np.argsort(keys, kind='stable')
+        self._order = order
+        self._sorted_keys = keys[order]
+        self._sorted_components = np.ascontiguousarray(self._positions[order].T)  # candidates of one cell are contiguous
+
+    def _cells(self, positions: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor((positions - self._lower) / self.cell_size).astype(np.int64), 0, self._resolution - 1)
+
+    def _keys(self, positions: np.ndarray) -> np.ndarray:
+        batch_index = np.arange(len(positions)) // max(1, self._list.volume)
+        return batch_index * int(np.prod(self._resolution)) + np.ravel_multi_index(tuple(self._cells(positions).T), tuple(self._resolution))
+
+    def update(self, points: Tensor) -> 'NeighborIndex':
+        """
+        Returns a `NeighborIndex` for the moved `points`.
+        If the number of points is unchanged, the points are re-sorted starting from the previous order.
+
+        Args:
+            points: New point locations with the same dimensions as the indexed points.
+
+        Returns:
+            New `NeighborIndex`
+        """
+        result = object.__new__(NeighborIndex)
+        result.cell_size = self.cell_size
+        result.points = points
+        result._batch = points.shape.non_channel.non_collection
+        result._list = points.shape.collection
+        native = math.reshaped_native(points, [result._batch, result._list, 'vector'], force_expand=True, to_numpy=True)
+        result._positions = native.reshape((-1, native.shape[-1])).astype(np.float64)
+        result._build(previous=self if result._batch == self._batch else None)
+        return result
+
+    def _queries(self, query: Tensor or None) -> Tuple[np.ndarray, np.ndarray, Shape]:
+        """ Returns the flattened query positions of shape `(batch * queries, rank)`, the batch entry of each query and the query list dimension. """
+        if query is None:
+            return self._positions, np.arange(len(self._positions)) // max(1, self._list.volume), self._list
+        assert query.shape.collection.rank == 1, f"query must have exactly one collection dimension but got {query.shape}"
+        assert query.shape.non_channel.non_collection in self._batch, f"Batch dimensions of query {query.shape} must be part of the indexed points {self._batch}"
+        native = math.reshaped_native(query, [self._batch, query.shape.collection, 'vector'], force_expand=True, to_numpy=True)
+        return native.reshape((-1, native.shape[-1])).astype(np.float64), np.repeat(np.arange(self._batch.volume), native.shape[1]), query.shape.collection
+
+    def _pairs(self, queries: np.ndarray, batch_index: np.ndarray, radius: float or np.ndarray):
+        """
+        Finds all pairs of query and indexed points of the same batch entry that are at most `radius` apart.
+
+        Args:
+            queries: Query positions of shape `(queries, rank)`.
+            batch_index: Batch entry of each query.
+            radius: Search radius as scalar or one value per query.
+
+        Returns:
+            query_indices: Indices into `queries`. The pairs of each query are contiguous.
+            point_indices: Flat indices into the indexed points.
+            distances: Euclidean distances.
+        """
+        radius = np.broadcast_to(np.asarray(radius, np.float64), (len(queries),))
+        reach = min(int(np.ceil(radius.max() / self.cell_size)), int(self._resolution.max()) - 1) if len(queries) else 0
+        # Cells along the last axis have consecutive keys, so each row of cells is looked up as one range.
+        rank = queries.shape[-1]
+        offsets = np.stack(np.meshgrid(*[np.arange(-reach, reach + 1)] * (rank - 1), indexing='ij'), -1).reshape((-1, rank - 1)) if rank > 1 else np.zeros((1, 0), np.int64)
+        query_cells = self._cells(queries)  # cells of outside queries are clamped, which does not increase the cell distance to any grid cell
+        cell_count = int(np.prod(self._resolution))
+        query_keys = batch_index * cell_count + np.ravel_multi_index(tuple(query_cells.T), tuple(self._resolution))
+        query_order = np.argsort(query_keys, kind='stable')  # queries in the same cell read the same candidates
+        query_components = queries.T
+        chunk_size = max(1, MAX_LOOKUPS_PER_CHUNK // len(offsets))
+        result = []
+        for start in range(0, len(queries), chunk_size):
+            chunk = query_order[start:start + chunk_size]
+            rows = query_cells[chunk, None, :-1] + offsets  # (chunk, offsets, rank-1)
+            valid = np.all((rows >= 0) & (rows < self._resolution[:-1]), -1)
+            row_index = np.ravel_multi_index(tuple(np.moveaxis(rows, -1, 0)), tuple(self._resolution[:-1]), mode='clip') if rank > 1 else np.zeros(rows.shape[:2], np.int64)
+            row_keys = (batch_index[chunk] * cell_count)[:, None] + row_index * self._resolution[-1]
+            last = query_cells[chunk, -1:]
+            begin = np.searchsorted(self._sorted_keys, row_keys + np.maximum(last - reach, 0), 'left')
+            end = np.searchsorted(self._sorted_keys, row_keys + np.minimum(last + reach, self._resolution[-1] - 1), 'right')
+            count = np.where(valid, end - begin, 0).reshape(-1)
+            query_index = np.repeat(np.repeat(chunk, len(offsets)), count)
+            sorted_index = np.repeat(begin.reshape(-1) - (np.cumsum(count) - count), count) + np.arange(int(count.sum()))
+            distance_squared = sum([(self._sorted_components[axis][sorted_index] - query_components[axis][query_index]) ** 2 for axis in range(len(query_components))])
+            hit = distance_squared <= radius[query_index] ** 2
+            result.append((query_index[hit], self._order[sorted_index[hit]], np.sqrt(distance_squared[hit])))
+        if not result:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64), np.zeros(0)
+        return tuple(np.concatenate(arrays) for arrays in zip(*result))
+
+    def _padded(self, query_index, point_index, distance, query_total: int, max_neighbors: int or None):
+        """ Sorts the pairs of each query by distance and writes them into arrays of shape `(query_total, max_neighbors)` padded with -1 / inf. The pairs of each query must be contiguous, as returned by `_pairs()`. """
+        first = np.concatenate([[True], query_index[1:] != query_index[:-1]]) if len(query_index) else np.zeros(0, bool)
+        segment = np.cumsum(first) - 1
+        scale = distance.max() * (1 + 1e-6) if len(distance) and distance.max() > 0 else 1
+        order = np.argsort(segment + distance / scale, kind='stable')  # sorts by distance within each segment
+        query_index, point_index, distance = query_index[order], point_index[order], distance[order]
+        count = np.bincount(query_index, minlength=query_total)
+        if max_neighbors is None:
+            max_neighbors = int(count.max()) if count.size else 0
+        rank = np.arange(len(query_index)) - np.flatnonzero(first)[segment]
+        keep = rank < max_neighbors
+        indices = np.full((query_total, max_neighbors), -1, np.int64)
+        distances = np.full((query_total, max_neighbors), np.inf)
+        indices[query_index[keep], rank[keep]] = point_index[keep] % max(1, self._list.volume)
+        distances[query_index[keep], rank[keep]] = distance[keep]
+        return indices, distances, np.minimum(count, max_neighbors)
+
+    def radius_search(self, radius: float, query: Tensor = None, max_neighbors: int = None) -> Tuple[Tensor, Tensor, Tensor]:
+        """
+        Finds all indexed points within `radius` of each query point, sorted by distance.
+        When querying the indexed points, every point is its own first neighbor.
+
+        Args:
+            radius: Search radius.
+            query: (Optional) Query locations with one collection dimension. Defaults to the indexed points.
+            max_neighbors: (Optional) Maximum number of neighbors to return per query. The closest neighbors are kept.
+                If `None`, the size of the `neighbors` dimension is the largest neighbor count.
+
+        Returns:
+            indices: Integer `Tensor` with the query dimensions and `collection('neighbors')` holding indices along the list dimension of the indexed points, padded with -1.
+            distances: `Tensor` with the same shape holding the distances, padded with `inf`.
+            count: Integer `Tensor` holding the number of neighbors of each query point.
+        """
+        queries, batch_index, query_list = self._queries(query)
+        indices, distances, count = self._padded(*self._pairs(queries, batch_index, radius), len(queries), max_neighbors)
+        return self._wrap(indices, query_list), self._wrap(distances, query_list), self._wrap(count, query_list, neighbors=False)
+
+    def nearest(self, k: int, query: Tensor = None) -> Tuple[Tensor, Tensor]:
+        """
+        Finds the `k` nearest indexed points of each query point, sorted by distance.
+        The search radius starts at `cell_size` and is doubled for query points with fewer than `k` neighbors.
+
+        Args:
+            k: Number of neighbors.
+            query: (Optional) Query locations with one collection dimension. Defaults to the indexed points.
+
+        Returns:
+            indices: Integer `Tensor` with the query dimensions and `collection(neighbors=k)` holding indices along the list dimension of the indexed points.
+                Padded with -1 if fewer than `k` points are indexed.
+            distances: `Tensor` with the same shape holding the distances, padded with `inf`.
+        """
+        queries, batch_index, query_list = self._queries(query)
+        indices = np.full((len(queries), k), -1, np.int64)
+        distances = np.full((len(queries), k), np.inf)
+        pending = np.arange(len(queries))
+        radius = np.full(len(queries), self.cell_size)
+        if len(queries):  # radius at which all points are found
+            max_radius = np.linalg.norm(np.maximum(np.abs(queries - self._lower), np.abs(queries - self._upper)), axis=-1)
+        while len(pending):
+            pairs = self._pairs(queries[pending], batch_index[pending], radius[pending])
+            p_indices, p_distances, count = self._padded(*pairs, len(pending), k)
+            done = (count >= k) | (radius[pending] >= max_radius[pending])
+            indices[pending[done]] = p_indices[done]
+            distances[pending[done]] = p_distances[done]
+            pending = pending[~done]
+            radius[pending] *= 2
+        return self._wrap(indices, query_list), self._wrap(distances, query_list)
+
+    def kernel_sum(self, values: Tensor or float, kernel: Callable, radius: float, query: Tensor = None) -> Tensor:
+        """
+        Computes *Σ_j kernel(|x_i - x_j|) values_j* over all indexed points *j* within `radius` of each query point *i*, e.g. for SPH density or force estimates.
+
+        Args:
+            values: Values of the indexed points listed along their collection dimension, or a constant.
+            kernel: Function mapping a `Tensor` of distances to weights. It is called once with all pairs.
+            radius: Support radius of `kernel`.
+            query: (Optional) Query locations with one collection dimension. Defaults to the indexed points.
+
+        Returns:
+            `Tensor` with the query dimensions and the non-batch dimensions of `values`.
+        """
+        queries, batch_index, query_list = self._queries(query)
+        query_index, point_index, distance = self._pairs(queries, batch_index, radius)
+        weights = kernel(math.tensor(distance, collection('pairs')))
+        weights = math.reshaped_native(math.wrap(weights), ['pairs'], force_expand=True, to_numpy=True)
+        values = math.wrap(values)
+        components = values.shape.without(self._batch).without(self._list)
+        native_values = math.reshaped_native(values, [self._batch, self._list, components], force_expand=True, to_numpy=True)
+        native_values = native_values.reshape((-1, native_values.shape[-1]))
+        weighted = native_values[point_index] * weights[:, None]
+        result = np.stack([np.bincount(query_index, weighted[:, c], minlength=len(queries)) for c in range(weighted.shape[1])], -1) if np.isrealobj(weighted) else \
+            np.stack([np.bincount(query_index, weighted[:, c].real, minlength=len(queries)) + 1j * np.bincount(query_index, weighted[:, c].imag, minlength=len(queries)) for c in range(weighted.shape[1])], -1)
+        return math.reshaped_tensor(result.reshape((self._batch.volume, query_list.volume, -1)), [self._batch, query_list, components], check_sizes=True)
+
+    def _wrap(self, array: np.ndarray, query_list: Shape, neighbors=True) -> Tensor:
+        if neighbors:
+            return math.reshaped_tensor(array.reshape((self._batch.volume, query_list.volume, -1)), [self._batch, query_list, collection(neighbors=array.shape[-1])], check_sizes=True, convert=False)
+        return math.reshaped_tensor(array.reshape((self._batch.volume, query_list.volume)), [self._batch, query_list], check_sizes=True, convert=False)
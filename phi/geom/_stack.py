@@ -1,7 +1,10 @@
 from typing import List
 
+import numpy as np
+
 from phi import math
 from ._geom import Geometry
+from ._bvh import build_bvh, query_points, unflatten
 from ..math._shape import shape_stack, Shape, COLLECTION_DIM
 
 
@@ -11,6 +14,9 @@ class GeometryStack(Geometry):
         self.geometries = tuple(geometries)
         self.stack_dim = stack_dim.with_sizes([len(geometries)])
         self._shape = shape_stack(self.stack_dim, *[g.shape for g in geometries])
+        self._bvh = None
+        self._bvh_built = False
+        self._groups = None
 
     def unstack(self, dimension):
         if dimension == self.stack_dim.name:
@@ -34,6 +40,16 @@ class GeometryStack(Geometry):
         return math.stack([g.volume for g in self.geometries], self.stack_dim)
 
     def lies_inside(self, location: math.Tensor):
+        if self.stack_dim not in location.shape:
+            if not self._bvh_built:
+                self._bvh, self._groups = build_bvh(self.geometries)
+                self._bvh_built = True
+            points = query_points(location) if self._bvh is not None else None
+            if points is not None:  # only evaluate geometries whose bounding box contains the point
+                p, g = self._bvh.overlapping(points)
+                inside = np.zeros((len(points), len(self.geometries)), bool)
+                inside[p, g] = self._groups.evaluate('lies_inside', points, p, g)
+                return unflatten(inside, location, self.stack_dim)
         if self.stack_dim in location.shape:
             location = location.unstack(self.stack_dim.name)
         else:
@@ -1,13 +1,24 @@
 import warnings
 
+import numpy as np
+
 from phi import math
 from ._geom import Geometry, NO_GEOMETRY
 from ._transform import rotate
-from ._box import bounding_box, Box
+from ._box import bounding_box, Box, BaseBox
+from ._sphere import Sphere
+from ._bvh import build_bvh, refit_bvh, GeometryGroups, query_points, select_per_point, unflatten, is_numpy
+from ..math import Tensor
 from ..math._shape import merge_shapes
 
 
 class Union(Geometry):
+    """
+    Union of geometries.
+
+    Unions of many NumPy-backed geometries build a bounding volume hierarchy (`BVH`) on first use
+    so that point queries only evaluate the geometries close to each point.
+    """
 
     def __init__(self, geometries):
         self._geometries = tuple(geometries)
@@ -15,6 +26,10 @@ class Union(Geometry):
         for g in self._geometries[1:]:
             assert g.spatial_rank == self._geometries[0].spatial_rank
         self._shape = merge_shapes(*[g.shape for g in geometries])
+        self._bvh = None
+        self._bvh_built = False
+        self._groups = None
+        self._distance_bounded = all(isinstance(g, (BaseBox, Sphere)) for g in self._geometries)  # signed distance is at least the L-infinity distance to the bounding box
 
     @property
     def shape(self):
@@ -28,11 +43,73 @@ class Union(Geometry):
     def rank(self):
         return self.geometries[0].spatial_rank
 
+    def _accelerated(self, location) -> tuple:
+        """ Returns the `BVH` and the query points as NumPy array if `location` can be evaluated using the acceleration structure, else `(None, None)`. """
+        if not self._bvh_built:
+            self._bvh, self._groups = build_bvh(self._geometries)
+            self._bvh_built = True
+        points = query_points(location) if self._bvh is not None else None
+        return (None, None) if points is None else (self._bvh, points)
+
     def lies_inside(self, location):
-        return math.any([geometry.lies_inside(location) for geometry in self.geometries], dim=0)
+        bvh, points = self._accelerated(location)
+        if bvh is None:
+            return math.any([geometry.lies_inside(location) for geometry in self.geometries], dim=0)
+        p, g = bvh.overlapping(points)
+        inside = np.zeros(len(points), bool)
+        inside[p[self._groups.evaluate('lies_inside', points, p, g)]] = True
+        return unflatten(inside, location)
 
     def approximate_signed_distance(self, location):
-        return math.min([geometry.approximate_signed_distance(location) for geometry in self.geometries], dim=0)
+        bvh, points = self._accelerated(location)
+        if bvh is None:
+            return math.min([geometry.approximate_signed_distance(location) for geometry in self.geometries], dim=0)
+        p, g = self._nearest_candidates(bvh, points)
+        distances = self._groups.evaluate('approximate_signed_distance', points, p, g)
+        result = np.full(len(points), np.inf, distances.dtype)
+        np.minimum.at(result, p, distances)
+        return unflatten(result, location)
+
+    def _nearest_candidates(self, bvh, points):
+        if not self._distance_bounded:  # bounding boxes give no lower bound for the signed distance, evaluate all pairs
+            return np.repeat(np.arange(len(points)), len(self._geometries)), np.tile(np.arange(len(self._geometries)), len(points))
+        p, g = bvh.closest_leaf(points)
+        upper_bound = np.full(len(points), np.inf)
+        np.minimum.at(upper_bound, p, self._groups.evaluate('approximate_signed_distance', points, p, g))
+        return bvh.candidates(points, upper_bound)
+
+    def push(self, positions: Tensor, outward: bool = True, shift_amount: float = 0) -> Tensor:
+        """
+        Pushes positions out of or into the union using a single member geometry per position.
+
+        When pushing outward, positions are pushed out of the member containing them whose surface is closest, i.e. the member with the largest negative signed distance.
+        The result may still lie inside another, overlapping member.
+        When pushing inward, positions are pushed into the member with the smallest signed distance.
+
+        See Also:
+            `Geometry.push()`.
+        """
+        bvh, points = self._accelerated(positions)
+        if bvh is None:
+            result, best = positions, None
+            for geometry in self.geometries:
+                distance = geometry.approximate_signed_distance(positions)
+                score = math.where(geometry.lies_inside(positions), distance, -np.inf) if outward else -distance
+                pushed = geometry.push(positions, outward=outward, shift_amount=shift_amount)
+                selected = score > -np.inf if best is None else score > best
+                result = math.where(selected, pushed, result)
+                best = score if best is None else math.maximum(score, best)
+            return result
+        p, g = bvh.overlapping(points) if outward else self._nearest_candidates(bvh, points)
+        distances = self._groups.evaluate('approximate_signed_distance', points, p, g)
+        if outward:
+            inside = self._groups.evaluate('lies_inside', points, p, g)
+            p, g, distances = p[inside], g[inside], distances[inside]
+        selected = select_per_point(p, distances if outward else -distances)
+        p, g = p[selected], g[selected]
+        result = np.array(points)
+        result[p] = self._groups.evaluate('push', points, p, g, outward=outward, shift_amount=shift_amount)
+        return unflatten(result, positions, positions.shape.channel)
 
     @property
     def center(self):
@@ -56,7 +133,16 @@ class Union(Geometry):
         return Box(lower, upper)
 
     def shifted(self, delta):
-        return Union([geometry.shifted(delta) for geometry in self.geometries])
+        result = Union([geometry.shifted(delta) for geometry in self.geometries])
+        if self._bvh is not None:  # reuse the tree structure
+            delta = math.wrap(delta)
+            if delta.shape.non_channel.volume == 1 and is_numpy(delta):  # all bounds move by the same amount
+                delta = delta.numpy('vector') if 'vector' in delta.shape else delta.numpy(delta.shape.names).reshape(())
+                result._bvh, result._groups = self._bvh.translated(delta), GeometryGroups(result._geometries)
+            else:
+                result._bvh, result._groups = refit_bvh(self._bvh, result._geometries)
+            result._bvh_built = True
+        return result
 
     def rotated(self, angle):
         return rotate(self, angle)
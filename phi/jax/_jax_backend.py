@@ -58,6 +58,12 @@ class JaxBackend(Backend):
     def seed(self, seed: int):
         self.rnd_key = jax.random.PRNGKey(seed)
 
+    def get_random_state(self):
+        return np.asarray(self.rnd_key)
+
+    def set_random_state(self, state):
+        self.rnd_key = jnp.asarray(state)
+
     def as_tensor(self, x, convert_external=True):
         self._check_float64()
         if self.is_tensor(x, only_native=convert_external):
@@ -299,7 +305,7 @@ class JaxBackend(Backend):
     def min(self, x, axis=None, keepdims=False):
         return jnp.min(x, axis, keepdims=keepdims)
 
-    def conv(self, value, kernel, zero_padding=True):
+    def conv(self, value, kernel, zero_padding=True, strides=1):
         assert kernel.shape[0] in (1, value.shape[0])
         assert value.shape[1] == kernel.shape[2], f"value has {value.shape[1]} channels but kernel has {kernel.shape[2]}"
         assert value.ndim + 1 == kernel.ndim
@@ -315,7 +321,8 @@ class JaxBackend(Backend):
             for o in range(kernel.shape[1]):
                 for i in range(value.shape[1]):
                     result[b, o, ...] += scipy.signal.correlate(value[b, i, ...], b_kernel[o, i, ...], mode=mode)
-        return result
+        strides = (strides,) * (value.ndim - 2) if isinstance(strides, int) else strides
+        return result[(slice(None), slice(None), *[slice(None, None, s) for s in strides])]
 
     def expand_dims(self, a, axis=0, number=1):
         for _i in range(number):
@@ -356,13 +363,15 @@ class JaxBackend(Backend):
         return jnp.all(boolean_tensor, axis=axis, keepdims=keepdims)
 
     def scatter(self, base_grid, indices, values, mode: str):
+        if mode == 'mean':
+            return Backend.scatter(self, base_grid, indices, values, mode)
         base_grid, values = self.auto_cast(base_grid, values)
         batch_size = combined_dim(combined_dim(indices.shape[0], values.shape[0]), base_grid.shape[0])
         spatial_dims = tuple(range(base_grid.ndim - 2))
         dnums = jax.lax.ScatterDimensionNumbers(update_window_dims=(1,),  # channel dim of updates (batch dim removed)
                                                 inserted_window_dims=spatial_dims,  # no idea what this does but spatial_dims seems to work
                                                 scatter_dims_to_operand_dims=spatial_dims)  # spatial dims of base_grid (batch dim removed)
-        scatter = jax.lax.scatter_add if mode == 'add' else jax.lax.scatter
+        scatter = {'add': jax.lax.scatter_add, 'update': jax.lax.scatter, 'max': jax.lax.scatter_max, 'min': jax.lax.scatter_min}[mode]
         result = []
         for b in range(batch_size):
             b_grid = base_grid[b, ...]
@@ -392,6 +401,14 @@ class JaxBackend(Backend):
         else:
             return jnp.fft.ifftn(k, axes=list(range(1, rank + 1))).astype(k.dtype)
 
+    def rfft(self, x):
+        rank = len(x.shape) - 2
+        assert rank >= 1
+        return jnp.fft.rfftn(x, axes=list(range(1, rank + 1)))
+
+    def irfft(self, k, resolution: tuple):
+        return jnp.fft.irfftn(k, s=tuple(resolution), axes=list(range(1, len(resolution) + 1)))
+
     def dtype(self, array) -> DType:
         if isinstance(array, int):
             return DType(int, 32)
@@ -60,8 +60,11 @@ from ._nd import (
 from ._functional import (
     LinearFunction, jit_compile_linear, jit_compile,
     functional_gradient, custom_gradient, print_gradient,
-    solve_linear, solve_nonlinear, minimize, Solve, SolveInfo, ConvergenceException, NotConverged, Diverged, SolveTape,
+    solve_linear, solve_nonlinear, minimize, Solve, SolverContext, SolveInfo, ConvergenceException, NotConverged, Diverged, SolveTape,
 )
+from ._parallel import parallel_map
+from ._halo import with_halo
+from ._scatter import ScatterPlan
 
 
 PI = 3.14159265358979323846
@@ -14,8 +14,9 @@ from ._shape import EMPTY_SHAPE, Shape, parse_dim_order, SPATIAL_DIM, vector_add
     batch
 from ._tensors import Tensor, NativeTensor, CollapsedTensor, disassemble_tree, TensorLike, assemble_tree, copy_with, \
     disassemble_tensors, assemble_tensors, TensorLikeType, variable_attributes, wrap, cached
-from .backend import choose_backend, Backend, get_current_profile, get_precision
+from .backend import choose_backend, Backend, get_current_profile, get_precision, precision
 from .backend._backend import SolveResult
+from .backend._dtype import DType
 
 X = TypeVar('X')
 Y = TypeVar('Y')
@@ -799,7 +800,9 @@ class Solve(Generic[X, Y]):  # TODO move to phi.math._functional, put Tensors th
                  max_iterations: int or Tensor = 1000,
                  x0: X or Any = None,
                  suppress: tuple or list = (),
-                 gradient_solve: 'Solve[Y, X]' or None = None):
+                 gradient_solve: 'Solve[Y, X]' or None = None,
+                 inner_precision: int or None = None,
+                 max_refinements: int = 10):
         assert isinstance(method, str)
         self.method: str = method
         """ Optimization method to use. Available solvers depend on the solve function that is used to perform the solve. """
@@ -818,6 +821,14 @@ class Solve(Generic[X, Y]):  # TODO move to phi.math._functional, put Tensors th
         self.suppress: tuple = tuple(suppress)
         """ Error types to suppress; `tuple` of `ConvergenceException` types. For these errors, the solve function will instead return the partial result without raising the error. """
         self._gradient_solve: Solve[Y, X] = gradient_solve
+        assert inner_precision in (None, 16, 32, 64), f"inner_precision must be one of None, 16, 32, 64 but got {inner_precision}"
+        self.inner_precision: int or None = inner_precision
+        """ Floating point precision of the inner solves for mixed-precision iterative refinement (linear solves only).
+        If `None`, the linear system is solved directly at the current precision.
+        Otherwise, the method runs at `inner_precision` bits while residuals and the solution are accumulated at the current precision, see `solve_linear()`.
+        Iterative refinement needs the residuals on the host. In jit mode, the system is instead solved directly at the current precision. """
+        self.max_refinements: int = max_refinements
+        """ Maximum number of refinement steps if `inner_precision` is set. """
         self.id = str(uuid.uuid4())
 
     @property
@@ -829,11 +840,12 @@ class Solve(Generic[X, Y]):  # TODO move to phi.math._functional, put Tensors th
         In any case, the gradient solve information will be stored in `gradient_solve.result`.
         """
         if self._gradient_solve is None:
-            self._gradient_solve = Solve(self.method, self.relative_tolerance, self.absolute_tolerance, self.max_iterations, None, self.suppress)
+            self._gradient_solve = Solve(self.method, self.relative_tolerance, self.absolute_tolerance, self.max_iterations, None, self.suppress, inner_precision=self.inner_precision, max_refinements=self.max_refinements)
         return self._gradient_solve
 
     def __repr__(self):
-        return f"{self.method} with tolerance {self.relative_tolerance} (rel), {self.absolute_tolerance} (abs), max_iterations={self.max_iterations}"
+        refine = f", refined from {self.inner_precision} bit" if self.inner_precision is not None else ""
+        return f"{self.method} with tolerance {self.relative_tolerance} (rel), {self.absolute_tolerance} (abs), max_iterations={self.max_iterations}{refine}"
 
     def __eq__(self, other):
         if not isinstance(other, Solve):
@@ -842,7 +854,9 @@ class Solve(Generic[X, Y]):  # TODO move to phi.math._functional, put Tensors th
                 or (self.absolute_tolerance != other.absolute_tolerance).any \
                 or (self.relative_tolerance != other.relative_tolerance).any \
                 or (self.max_iterations != other.max_iterations).any \
-                or self.suppress != other.suppress:
+                or self.suppress != other.suppress \
+                or self.inner_precision != other.inner_precision \
+                or self.max_refinements != other.max_refinements:
             return False
         return self.x0 == other.x0
 
@@ -850,6 +864,136 @@ class Solve(Generic[X, Y]):  # TODO move to phi.math._functional, put Tensors th
         return 'x0',
 
 
+class SolverContext(Solve[X, Y]):
+    """
+    `Solve` that remembers the solutions of previous solves and uses them as initial guess for the next one.
+
+    Pass a `SolverContext` in place of a `Solve` when solving a sequence of similar linear systems, e.g. the pressure solve of consecutive time steps.
+    As long as no solution has been recorded, the context behaves like a regular `Solve`.
+    Afterwards, `x0` returns the last solution or, if `extrapolate=True`, the linear extrapolation *2 x<sub>n</sub> - x<sub>n-1</sub>* of the last two solutions.
+    Functions that only create an initial guess if `solve.x0 is None`, such as `phi.physics.fluid.make_incompressible()`, are thus warm-started automatically.
+
+    Copies of the context created by `copy_with()` share the recorded state.
+    Solutions are not recorded while tracing, i.e. in jit mode, or if the solve diverged.
+    Sparse matrices of functions compiled with `jit_compile_linear()` are cached by the function itself and reused by all solves.
+
+    Example:
+        ```python
+        solve = math.SolverContext('CG', 1e-5, 0, extrapolate=True)
+        for _ in range(100):
+            velocity, pressure = fluid.make_incompressible(velocity, solve=solve)
+        print(solve.mean_iterations)
+        ```
+    """
+
+    def __init__(self,
+                 method: str,
+                 relative_tolerance: float or Tensor,
+                 absolute_tolerance: float or Tensor,
+                 max_iterations: int or Tensor = 1000,
+                 x0: X or Any = None,
+                 suppress: tuple or list = (),
+                 gradient_solve: 'Solve[Y, X]' or None = None,
+                 inner_precision: int or None = None,
+                 max_refinements: int = 10,
+                 extrapolate: bool = False):
+        """
+        Args:
+            method: Optimization method, see `Solve`.
+            relative_tolerance: See `Solve`.
+            absolute_tolerance: See `Solve`.
+            max_iterations: See `Solve`.
+            x0: Initial guess for the first solve. Later solves start from the recorded solutions.
+            suppress: See `Solve`.
+            gradient_solve: See `Solve`.
+            inner_precision: See `Solve`.
+            max_refinements: See `Solve`.
+            extrapolate: Whether to extrapolate the last two solutions linearly to obtain the initial guess.
+                This assumes that consecutive solves are equally spaced in time.
+        """
+        self._state = _SolverContextState()
+        Solve.__init__(self, method, relative_tolerance, absolute_tolerance, max_iterations, None, suppress, gradient_solve, inner_precision, max_refinements)
+        self._initial_x0 = x0
+        self.extrapolate = extrapolate
+        """ Whether the initial guess is extrapolated linearly from the last two solutions. """
+
+    @property
+    def x0(self):
+        """ Initial guess for the next solve. A value assigned explicitly, e.g. using `copy_with()`, takes precedence over the recorded solutions. """
+        if self._x0 is not None:
+            return self._x0
+        solutions = self._state.solutions
+        if not solutions:
+            return self._initial_x0
+        if self.extrapolate and len(solutions) == 2:
+            previous, last = solutions
+            _, previous_tensors = disassemble_tree(previous)
+            tree, last_tensors = disassemble_tree(last)
+            if len(previous_tensors) == len(last_tensors) and all(p.shape == l.shape for p, l in zip(previous_tensors, last_tensors)):
+                return assemble_tree(tree, [2 * l - p for p, l in zip(previous_tensors, last_tensors)])
+        return solutions[-1]
+
+    @x0.setter
+    def x0(self, x0):
+        self._x0 = x0
+
+    @property
+    def solve_count(self) -> int:
+        """ Number of recorded solves. """
+        return len(self._state.iterations)
+
+    @property
+    def iterations(self) -> List[int]:
+        """ Number of iterations of all recorded solves, taking the maximum over batch dimensions. """
+        return list(self._state.iterations)
+
+    @property
+    def total_iterations(self) -> int:
+        return sum(self._state.iterations)
+
+    @property
+    def mean_iterations(self) -> float:
+        """ Average number of iterations per recorded solve or `nan` if no solve has been recorded. """
+        return self.total_iterations / self.solve_count if self.solve_count else float('nan')
+
+    @property
+    def last_result(self) -> 'SolveInfo[X, Y]' or None:
+        """ `SolveInfo` of the most recent recorded solve. """
+        return self._state.last_result
+
+    def reset(self):
+        """ Discards the recorded solutions and statistics, e.g. after the resolution of the problem has changed. """
+        self._state.__init__()
+
+    def _as_solve(self) -> Solve[X, Y]:
+        """ Plain `Solve` with the same id and the current initial guess, safe to pass through `cached()` and tracing. """
+        solve = Solve(self.method, self.relative_tolerance, self.absolute_tolerance, self.max_iterations, self.x0, self.suppress, self._gradient_solve, self.inner_precision, self.max_refinements)
+        solve.id = self.id
+        return solve
+
+    def _record(self, x: X, result: 'SolveInfo[X, Y]'):
+        _, x_tensors = disassemble_tree(x)
+        if not all_available(*x_tensors):
+            return
+        if result.diverged is not None and all_available(result.diverged) and result.diverged.any:
+            return  # a diverged solution would spoil the next initial guess
+        self._state.solutions = (self._state.solutions + [x])[-2:]
+        self._state.iterations.append(int(result.iterations.max) if result.iterations is not None else 0)
+        self._state.last_result = result
+
+    def __repr__(self):
+        return f"{Solve.__repr__(self)}, warm-started from {len(self._state.solutions)} solutions"
+
+
+class _SolverContextState:
+    """ Mutable state shared between copies of a `SolverContext`. """
+
+    def __init__(self):
+        self.solutions: list = []
+        self.iterations: List[int] = []
+        self.last_result: SolveInfo or None = None
+
+
 class SolveInfo(Generic[X, Y]):
     """
     Stores information about the solution or trajectory of a solve.
@@ -867,7 +1011,8 @@ class SolveInfo(Generic[X, Y]):
                  diverged: Tensor,
                  method: str,
                  msg: str,
-                 solve_time: float):
+                 solve_time: float,
+                 refinements: Tensor or None = None):
         # tuple.__new__(SolveInfo, (x, residual, iterations, function_evaluations, converged, diverged))
         self.solve: Solve[X, Y] = solve
         """ `Solve`, Parameters specified for the solve. """
@@ -896,12 +1041,14 @@ class SolveInfo(Generic[X, Y]):
         """ `str`, termination message """
         self.solve_time = solve_time
         """ Time spent in Backend solve function (in seconds) """
+        self.refinements: Tensor or None = refinements
+        """ `Tensor`, number of iterative refinement steps if `Solve.inner_precision` was set, else `None`. """
 
     def __repr__(self):
         return self.msg
 
     def snapshot(self, index):
-        return SolveInfo(self.solve, self.x.trajectory[index], self.residual.trajectory[index], self.iterations.trajectory[index], self.function_evaluations.trajectory[index], self.converged.trajectory[index], self.diverged.trajectory[index], self.method, self.msg, self.solve_time)
+        return SolveInfo(self.solve, self.x.trajectory[index], self.residual.trajectory[index], self.iterations.trajectory[index], self.function_evaluations.trajectory[index], self.converged.trajectory[index], self.diverged.trajectory[index], self.method, self.msg, self.solve_time, self.refinements)
 
     def convergence_check(self, only_warn: bool):
         if not all_available(self.diverged, self.converged):
@@ -1115,6 +1262,8 @@ def minimize(f: Callable[[X], Y], solve: Solve[X, Y]) -> X:
         result = SolveInfo(solve, x_, residual, iterations, function_evaluations, converged, diverged, ret[-1].method, ret[-1].message, t)
     for tape in _SOLVE_TAPES:
         tape._add(solve, trj, result)
+    if isinstance(solve, SolverContext):
+        solve._record(x, result)
     result.convergence_check(False)  # raises ConvergenceException
     return x
 
@@ -1167,6 +1316,13 @@ def solve_linear(f: Callable[[X], Y], y: Y, solve: Solve[X, Y], f_args: tuple or
 
     The gradient of this operation will perform another linear solve with the parameters specified by `Solve.gradient_solve`.
 
+    If `Solve.inner_precision` is set, the system is solved by mixed-precision iterative refinement.
+    Each refinement step solves *f(dx) = y - f(x)* at `inner_precision` and adds the correction `dx` to `x`.
+    Residuals and corrections are computed at the current precision, see `phi.math.backend.precision()`.
+    This achieves the accuracy of the current precision while the bulk of the work runs at the lower inner precision.
+    The number of refinement steps is stored in `SolveInfo.refinements`.
+    Iterative refinement requires the values of `y` to be available. In jit mode, `inner_precision` is ignored and the system is solved directly.
+
     See Also:
         `solve_nonlinear()`, `jit_compile_linear()`.
 
@@ -1188,6 +1344,16 @@ def solve_linear(f: Callable[[X], Y], y: Y, solve: Solve[X, Y], f_args: tuple or
         NotConverged: If the desired accuracy was not be reached within the maximum number of iterations.
         Diverged: If the solve failed prematurely.
     """
+    if isinstance(solve, SolverContext):
+        with SolveTape() as tape:
+            try:
+                x = solve_linear(f, y, solve._as_solve(), f_args, f_kwargs)
+            except ConvergenceException as exc:
+                solve._record(exc.result.x, exc.result)
+                raise
+        if len(tape):
+            solve._record(x, tape[0])
+        return x
     y_tree, y_tensors = disassemble_tree(y)
     x0_tree, x0_tensors = disassemble_tree(solve.x0)
     assert len(x0_tensors) == len(y_tensors) == 1, "Only single-tensor linear solves are currently supported"
@@ -1223,8 +1389,14 @@ def _linear_solve_forward(y, solve: Solve, native_lin_op,
     trj = _SOLVE_TAPES and any(t.record_trajectories for t in _SOLVE_TAPES)
     if trj:
         assert all_available(y_tensor, x0_tensor), "Cannot record linear solve in jit mode"
+    refinements = None
     t = time.perf_counter()
-    ret = backend.linear_solve(solve.method, native_lin_op, y_native, x0_native, rtol, atol, maxi, trj)
+    if solve.inner_precision is not None and all_available(y_tensor, x0_tensor):
+        assert not trj, "Iterative refinement does not support recording trajectories"
+        ret, refinements = _refined_linear_solve(backend, solve, native_lin_op, y_native, x0_native, rtol, atol, maxi)
+        refinements = reshaped_tensor(refinements, [batch_dims])
+    else:
+        ret = backend.linear_solve(solve.method, native_lin_op, y_native, x0_native, rtol, atol, maxi, trj)
     t = time.perf_counter() - t
     if not trj:
         assert isinstance(ret, SolveResult)
@@ -1240,7 +1412,7 @@ def _linear_solve_forward(y, solve: Solve, native_lin_op,
             residual = assemble_tree(y_nest, [reshaped_tensor(residual, [batch_dims, active_dims])])
         else:
             residual = None
-        result = SolveInfo(solve, x, residual, iterations, function_evaluations, converged, diverged, ret.method, ret.message, t)
+        result = SolveInfo(solve, x, residual, iterations, function_evaluations, converged, diverged, ret.method, ret.message, t, refinements)
     else:  # trajectory
         assert isinstance(ret, (tuple, list)) and all(isinstance(r, SolveResult) for r in ret), f"Trajectory recording failed: got {type(ret)}"
         converged = reshaped_tensor(ret[-1].converged, [batch_dims])
@@ -1257,6 +1429,66 @@ def _linear_solve_forward(y, solve: Solve, native_lin_op,
     return x
 
 
+_REFINEMENT_RELATIVE_TOLERANCE = {16: 1e-2, 32: 1e-5, 64: 1e-10}  # accuracy the inner solves can reliably reach
+
+
+def _refined_linear_solve(backend: Backend, solve: Solve, lin, y, x0, rtol, atol, max_iter) -> Tuple[SolveResult, Any]:
+    """
+    Mixed-precision iterative refinement.
+    Runs `Backend.linear_solve()` at `solve.inner_precision` on the current residual and accumulates the corrections at the current precision.
+
+    Returns:
+        result: `SolveResult` holding the accumulated solution as well as the summed iterations and function evaluations of all inner solves.
+        refinements: Number of refinement steps per batch entry.
+    """
+    outer_type, inner_type = DType(float, get_precision()), DType(float, solve.inner_precision)
+    inner_lin = _cast_linear_operator(backend, lin, outer_type, inner_type)
+    batch_size = backend.staticshape(y)[0]
+    x = backend.copy(x0)
+    tolerance_sq = backend.maximum(rtol ** 2 * backend.sum(y ** 2, -1), atol ** 2)
+    residual = y - backend.linear(lin, x)
+    iterations = backend.zeros([batch_size], DType(int, 32))
+    function_evaluations = backend.ones([batch_size], DType(int, 32))
+    refinements = backend.zeros([batch_size], DType(int, 32))
+    converged = backend.sum(residual ** 2, -1) <= tolerance_sq
+    diverged = ~backend.all(backend.isfinite(x), axis=(1,))
+    method = None
+    while not backend.all(converged | diverged) and backend.numpy(backend.max(refinements)) < solve.max_refinements:
+        active = backend.cast(~(converged | diverged), DType(int, 32))
+        with precision(solve.inner_precision):
+            residual_low = backend.cast(residual, inner_type)
+            inner_atol = backend.cast(backend.sqrt(tolerance_sq), inner_type)
+            inner_rtol = backend.cast(backend.ones([batch_size]) * _REFINEMENT_RELATIVE_TOLERANCE[solve.inner_precision], inner_type)
+            ret = backend.linear_solve(solve.method, inner_lin, residual_low, backend.zeros_like(residual_low), inner_rtol, inner_atol, max_iter, False)
+        method = ret.method
+        x += backend.cast(ret.x, outer_type) * backend.cast(backend.expand_dims(active, -1), outer_type)
+        residual = y - backend.linear(lin, x)
+        iterations += backend.cast(backend.as_tensor(ret.iterations), DType(int, 32)) * active
+        function_evaluations += (backend.cast(backend.as_tensor(ret.function_evaluations), DType(int, 32)) + 1) * active
+        refinements += active
+        diverged |= ~backend.all(backend.isfinite(x), axis=(1,))
+        converged = backend.sum(residual ** 2, -1) <= tolerance_sq
+    method = f"{method or solve.method} with iterative refinement ({solve.inner_precision} → {outer_type.bits} bit)"
+    return SolveResult(method, x, residual, iterations, function_evaluations, converged, diverged, ""), refinements
+
+
+def _cast_linear_operator(backend: Backend, lin, outer_type: DType, inner_type: DType):
+    """
+    Returns an equivalent of the linear operator `lin` that takes and returns tensors of type `inner_type`.
+    Callable operators are evaluated at the inner precision.
+    Tensors captured by `lin` at a higher precision may promote the result, which is then cast back to `inner_type`.
+    """
+    if callable(lin):
+        def inner_lin(x_low):
+            with precision(inner_type.bits):
+                return backend.cast(lin(x_low), inner_type)
+        return inner_lin
+    elif isinstance(lin, (tuple, list)):
+        return [_cast_linear_operator(backend, lin_i, outer_type, inner_type) for lin_i in lin]
+    else:  # dense or sparse matrix
+        return backend.cast(lin, inner_type)
+
+
 def attach_gradient_solve(forward_solve: Callable):
     def implicit_gradient_solve(*args, **kwargs):
         y, solve, *matrix, x, dx = args
@@ -0,0 +1,139 @@
+import numpy as np
+
+from . import extrapolation as e_
+from ._tensors import Tensor, NativeTensor, TensorStack
+
+
+class HaloTensor(NativeTensor):
+    """
+    `NativeTensor` referencing the interior of a larger native tensor, the *halo buffer*.
+    The outer `width` cells of the buffer along every spatial dimension hold the values of `extrapolation`.
+
+    `phi.math.pad()` returns views of the buffer instead of copying when called with the same extrapolation and widths not exceeding `width`.
+    All other operations treat a `HaloTensor` like a regular `NativeTensor` and return regular tensors.
+
+    Use `with_halo()` to create instances.
+    """
+
+    def __init__(self, padded: NativeTensor, width: int, extrapolation: 'e_.Extrapolation'):
+        interior = padded[{dim: slice(width, -width) for dim in padded.shape.spatial.names}]
+        NativeTensor.__init__(self, interior._native, interior.shape)
+        self._padded = padded
+        self._width = width
+        self._extrapolation = extrapolation
+
+    def _padded_view(self, widths: dict, mode: 'e_.Extrapolation') -> Tensor or None:
+        if mode != self._extrapolation:
+            return None
+        slices = {dim: slice(self._width, -self._width) for dim in self._shape.spatial.names}
+        for dim, (lower, upper) in widths.items():
+            if dim not in self._shape.spatial or lower > self._width or upper > self._width:
+                return None
+            slices[dim] = slice(self._width - lower, self._width + self._shape.get_size(dim) + upper)
+        return self._padded[slices]
+
+
+def padded_view(value: Tensor, widths: dict, mode: 'e_.Extrapolation') -> Tensor or None:
+    """
+    Returns a view of the halo buffer of `value` that is equal to `mode.pad(value, widths)` or `None` if `value` does not hold a suitable halo.
+    Stacks of halo tensors are supported as long as `widths` does not include the stack dimension.
+    """
+    if isinstance(value, HaloTensor):
+        return value._padded_view(widths, mode)
+    if isinstance(value, TensorStack) and value.stack_dim.name not in widths and all(isinstance(t, HaloTensor) for t in value.tensors):
+        views = [t._padded_view(widths, mode) for t in value.tensors]
+        if all(v is not None for v in views):
+            return TensorStack(views, value.stack_dim)
+    return None
+
+
+def with_halo(value: Tensor, extrapolation: 'e_.Extrapolation', width: int = 1, reuse: Tensor = None) -> Tensor:
+    """
+    Stores `value` in the interior of a buffer that holds `width` ghost cells along every spatial dimension.
+    The ghost cells are filled from `extrapolation`.
+
+    Subsequent calls to `pad()` with the same extrapolation, e.g. from `laplace()`, `spatial_gradient()`, `shift()` or `grid_sample()`, slice the buffer instead of copying the data.
+    The halo is lost by any operation that changes the values, so `with_halo()` should be called once per update of `value`.
+
+    Stacked tensors are processed per component.
+    Values that are not backed by a single native tensor, such as constant or traced tensors, are returned unchanged.
+
+    For NumPy arrays, the ghost cells are written in place, dimension by dimension.
+    Other backends pad `value` once using `Extrapolation.pad()`.
+
+    Args:
+        value: `Tensor` with spatial dimensions.
+        extrapolation: `Extrapolation` used to fill the ghost cells.
+        width: Number of ghost cells on each side of every spatial dimension.
+        reuse: (Optional) `HaloTensor` previously returned by `with_halo()`.
+            If its buffer matches in shape, data type and `width`, the buffer is overwritten in place instead of allocating a new one.
+            *Warning*: This modifies `reuse` and all tensors referencing its buffer.
+
+    Returns:
+        `HaloTensor` with the same values as `value`.
+    """
+    if width <= 0:
+        return value
+    value = value._simplify()
+    if isinstance(value, TensorStack):
+        reused = reuse.tensors if isinstance(reuse, TensorStack) and reuse.stack_dim == value.stack_dim else [None] * len(value.tensors)
+        return TensorStack([with_halo(t, extrapolation, width, r) for t, r in zip(value.tensors, reused)], value.stack_dim)
+    if type(value) not in (NativeTensor, HaloTensor) or not value.shape.spatial:
+        return value
+    native = value._native
+    if isinstance(native, np.ndarray) and _supports_inplace(value.shape, extrapolation, width):
+        padded_sizes = tuple(size + 2 * width if dim in value.shape.spatial else size for dim, size in zip(value.shape.names, value.shape.sizes))
+        if isinstance(reuse, HaloTensor) and reuse._width == width and isinstance(reuse._padded._native, np.ndarray) \
+                and reuse._padded._native.shape == padded_sizes and reuse._padded._native.dtype == native.dtype:
+            buffer = reuse._padded._native
+        else:
+            buffer = np.empty(padded_sizes, dtype=native.dtype)
+        axes = value.shape.indices(value.shape.spatial.names)
+        buffer[tuple(slice(width, -width) if i in axes else slice(None) for i in range(native.ndim))] = native
+        _fill_halo(buffer, axes, width, extrapolation)
+        padded = NativeTensor(buffer, value.shape.with_sizes(padded_sizes))
+    else:
+        padded = extrapolation.pad(value, {dim: (width, width) for dim in value.shape.spatial.names})
+        if type(padded) is not NativeTensor:
+            return value
+    return HaloTensor(padded, width, extrapolation)
+
+
+def _supports_inplace(shape, extrapolation: 'e_.Extrapolation', width: int) -> bool:
+    if isinstance(extrapolation, e_.ConstantExtrapolation):
+        return extrapolation.value.shape.rank == 0
+    min_size = min(shape.spatial.sizes)
+    if isinstance(extrapolation, e_._BoundaryExtrapolation):
+        return min_size >= 1
+    if isinstance(extrapolation, (e_._PeriodicExtrapolation, e_._SymmetricExtrapolation)):
+        return min_size >= width
+    if isinstance(extrapolation, e_._ReflectExtrapolation):
+        return min_size > width
+    return False
+
+
+def _fill_halo(buffer: np.ndarray, axes: tuple, k: int, extrapolation: 'e_.Extrapolation'):
+    """ Fills the outer `k` cells of `buffer` along `axes` from its interior. Later axes use the ghost cells of earlier axes, filling the corners like `numpy.pad()`. """
+    for axis in axes:
+        n = buffer.shape[axis] - 2 * k
+
+        def at(sl: slice):
+            return tuple(sl if i == axis else slice(None) for i in range(buffer.ndim))
+
+        lower, upper = at(slice(0, k)), at(slice(k + n, None))
+        if isinstance(extrapolation, e_.ConstantExtrapolation):
+            buffer[lower] = buffer[upper] = extrapolation.value.native()
+        elif isinstance(extrapolation, e_._BoundaryExtrapolation):
+            buffer[lower] = buffer[at(slice(k, k + 1))]
+            buffer[upper] = buffer[at(slice(k + n - 1, k + n))]
+        elif isinstance(extrapolation, e_._PeriodicExtrapolation):
+            buffer[lower] = buffer[at(slice(n, n + k))]
+            buffer[upper] = buffer[at(slice(k, 2 * k))]
+        elif isinstance(extrapolation, e_._SymmetricExtrapolation):
+            buffer[lower] = buffer[at(slice(2 * k - 1, k - 1, -1))]
+            buffer[upper] = buffer[at(slice(k + n - 1, n - 1, -1))]
+        elif isinstance(extrapolation, e_._ReflectExtrapolation):
+            buffer[lower] = buffer[at(slice(2 * k, k, -1))]
+            buffer[upper] = buffer[at(slice(k + n - 2, n - 2, -1))]
+        else:
+            raise NotImplementedError(extrapolation)
@@ -1,6 +1,7 @@
 # Because division is different in Python 2 and 3
 from __future__ import division
 
+from functools import lru_cache
 from typing import Tuple
 
 import numpy as np
@@ -8,6 +9,8 @@ import numpy as np
 from . import _ops as math
 from . import extrapolation as extrapolation
 from ._config import GLOBAL_AXIS_ORDER
+from .backend import choose_backend, Backend
+from .backend._dtype import DType, to_numpy_dtype
 from ._ops import stack
 from ._shape import Shape, channel, batch, spatial
 from ._tensors import Tensor, TensorLike, variable_values
@@ -321,9 +324,12 @@ def laplace(x: Tensor,
     Spatial Laplace operator as defined for scalar fields.
     If a vector field is passed, the laplace is computed component-wise.
 
+    The second differences along each dimension are divided by `dx ** 2`.
+    Versions up to 2.0.0rc2 divided them by `dx`, which gives the same result only for `dx=1`.
+
     Args:
         x: n-dimensional field of shape (batch, spacial dimensions..., components)
-        dx: scalar or 1d tensor
+        dx: Grid spacing as scalar or 1d tensor listing the spacing along `dims`.
         padding: extrapolation
         dims: The second derivative along these dimensions is summed over
 
@@ -336,7 +342,7 @@ def laplace(x: Tensor,
     if isinstance(x, Extrapolation):
         return x.spatial_gradient()
     left, center, right = shift(wrap(x), (-1, 0, 1), dims, padding, stack_dim=batch('_laplace'))
-    result = (left + right - 2 * center) / dx
+    result = (left + right - 2 * center) / dx ** 2
     result = math.sum_(result, '_laplace')
     return result
 
@@ -364,10 +370,7 @@ def fourier_laplace(grid: Tensor,
       tensor of same shape as `tensor`
 
     """
-    frequencies = math.fft(math.to_complex(grid))
-    k_squared = math.sum_(math.fftfreq(grid.shape) ** 2, 'vector')
-    fft_laplace = -(2 * np.pi) ** 2 * k_squared
-    result = math.real(math.ifft(frequencies * fft_laplace ** times))
+    result = _apply_spectral_kernel(grid, 'laplace', times)
     return math.cast(result / wrap(dx) ** 2, grid.dtype)
 
 
@@ -385,14 +388,69 @@ def fourier_poisson(grid: Tensor,
     Returns:
 
     """
-    frequencies = math.fft(math.to_complex(grid))
-    k_squared = math.sum_(math.fftfreq(grid.shape) ** 2, 'vector')
-    fft_laplace = -(2 * np.pi) ** 2 * k_squared
-    # fft_laplace.tensor[(0,) * math.ndims(k_squared)] = math.inf  # assume NumPy array to edit
-    result = math.real(math.ifft(math.divide_no_nan(frequencies, math.to_complex(fft_laplace ** times))))
+    result = _apply_spectral_kernel(grid, 'poisson', times)
     return math.cast(result * wrap(dx) ** 2, grid.dtype)
 
 
+def _apply_spectral_kernel(grid: Tensor, operator: str, times: int) -> Tensor:
+    """
+    Multiplies the spectrum of `grid` by the kernel of `operator` and transforms the result back to real space.
+    Real-valued grids use the real-to-complex FFT if the backend supports it, which roughly halves the cost of both transforms.
+    The kernels are cached per resolution, so repeated calls only perform the transforms.
+    """
+    native, assemble = math._invertible_standard_form(grid)
+    backend = choose_backend(native)
+    resolution = tuple(backend.staticshape(native)[1:-1])
+    if grid.dtype.kind != complex and backend.supports(Backend.rfft):
+        k = backend.rfft(native)
+        kernel = _native_spectral_kernel(operator, resolution, times, True, backend.dtype(k), backend)
+        result = backend.irfft(k * kernel, resolution)
+    else:
+        k = backend.fft(backend.to_complex(native))
+        kernel = _native_spectral_kernel(operator, resolution, times, False, backend.dtype(k), backend)
+        result = backend.real(backend.ifft(k * kernel))
+    return assemble(result)
+
+
+_NATIVE_SPECTRAL_KERNELS = {}
+
+
+def _native_spectral_kernel(operator: str, resolution: tuple, times: int, real: bool, dtype: DType, backend: Backend):
+    key = (operator, resolution, times, real, dtype, backend, backend.get_default_device())
+    if key in _NATIVE_SPECTRAL_KERNELS:
+        return _NATIVE_SPECTRAL_KERNELS[key]
+    kernel = backend.as_tensor(_spectral_kernel(operator, resolution, times, real).astype(to_numpy_dtype(dtype)))
+    if backend.is_available(kernel):  # constants created while tracing cannot be reused outside of the trace
+        if len(_NATIVE_SPECTRAL_KERNELS) >= 32:
+            del _NATIVE_SPECTRAL_KERNELS[next(iter(_NATIVE_SPECTRAL_KERNELS))]
+        _NATIVE_SPECTRAL_KERNELS[key] = kernel
+    return kernel
+
+
+@lru_cache(maxsize=32)
+def _spectral_kernel(operator: str, resolution: tuple, times: int, real: bool) -> np.ndarray:
+    """ Returns the Fourier-space kernel of `operator` with shape `(1, *spectrum_resolution, 1)` for unit grid spacing. """
+    fft_laplace = -(2 * np.pi) ** 2 * _wavenumbers_squared(resolution, real)
+    if operator == 'laplace':
+        kernel = fft_laplace ** times
+    elif operator == 'poisson':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kernel = 1 / fft_laplace ** times
+        kernel[~np.isfinite(kernel)] = 0
+    else:
+        raise ValueError(operator)
+    return kernel[None, ..., None]
+
+
+@lru_cache(maxsize=32)
+def _wavenumbers_squared(resolution: tuple, real: bool) -> np.ndarray:
+    """ Returns the squared frequencies |k|² of the spectrum computed by `fft` (`real=False`) or `rfft` (`real=True`) for unit grid spacing. """
+    freqs = [np.fft.fftfreq(n) for n in resolution]
+    if real:
+        freqs[-1] = np.fft.rfftfreq(resolution[-1])
+    return sum(f ** 2 for f in np.meshgrid(*freqs, indexing='ij'))
+
+
 # Downsample / Upsample
 
 def downsample2x(grid: Tensor,
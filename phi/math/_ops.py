@@ -16,6 +16,7 @@ from ._tensors import Tensor, wrap, tensor, broadcastable_native_tensors, Native
     assemble_tensors, disassemble_tree, assemble_tree, value_attributes
 from .backend import default_backend, choose_backend, Backend, get_precision, convert as b_convert, BACKENDS
 from .backend._dtype import DType, combine_types
+from ._halo import padded_view
 
 
 def choose_backend_t(*values, prefer_default=False) -> Backend:
@@ -597,6 +598,7 @@ def pad(value: Tensor, widths: dict, mode: 'e_.Extrapolation') -> Tensor:
     """
     Pads a tensor along the specified dimensions, determining the added values using the given extrapolation.
     Unlike `Extrapolation.pad()`, this function can handle negative widths which slice off outer values.
+    If `value` was created by `with_halo()` with the same extrapolation, the result is a view of its halo buffer.
 
     Args:
         value: `Tensor` to be padded
@@ -607,6 +609,9 @@ def pad(value: Tensor, widths: dict, mode: 'e_.Extrapolation') -> Tensor:
     Returns:
         Padded `Tensor`
     """
+    view = padded_view(value, widths, mode)
+    if view is not None:
+        return view
     has_negative_widths = any(w[0] < 0 or w[1] < 0 for w in widths.values())
     slices = None
     if has_negative_widths:
@@ -1275,7 +1280,8 @@ def clip(x: Tensor, lower_limit: float or Tensor, upper_limit: float or Tensor):
 
 def convolve(value: Tensor,
              kernel: Tensor,
-             extrapolation: 'e_.Extrapolation' = None) -> Tensor:
+             extrapolation: 'e_.Extrapolation' = None,
+             strides: int or dict = 1) -> Tensor:
     """
     Computes the convolution of `value` and `kernel` along the spatial axes of `kernel`.
 
@@ -1286,6 +1292,8 @@ def convolve(value: Tensor,
         value: `Tensor` whose shape includes all spatial dimensions of `kernel`.
         kernel: `Tensor` used as convolutional filter.
         extrapolation: If not None, pads `value` so that the result has the same shape as `value`.
+        strides: Step size between evaluated positions as `int` or `dict` mapping spatial dimension names of `kernel` to `int`.
+            With strides, the result equals every `stride`-th value of the un-strided result, starting with the first.
 
     Returns:
         `Tensor`
@@ -1297,11 +1305,12 @@ def convolve(value: Tensor,
     batch = value.shape.batch & kernel.shape.batch
     if extrapolation is not None and extrapolation != e_.ZERO:
         value = pad(value, {dim: (kernel.shape.get_size(dim) // 2, (kernel.shape.get_size(dim) - 1) // 2)
-                            for dim in conv_shape.name}, extrapolation)
+                            for dim in conv_shape.names}, extrapolation)
     native_kernel = reshaped_native(kernel, (batch, out_channels, in_channels, *conv_shape.names), force_expand=in_channels)
     native_value = reshaped_native(value, (batch, in_channels, *conv_shape.names), force_expand=batch)
     backend = choose_backend(native_value, native_kernel)
-    native_result = backend.conv(native_value, native_kernel, zero_padding=extrapolation == e_.ZERO)
+    strides = [strides.get(dim, 1) if isinstance(strides, dict) else strides for dim in conv_shape.names]
+    native_result = backend.conv(native_value, native_kernel, zero_padding=extrapolation == e_.ZERO, strides=strides)
     result = reshaped_tensor(native_result, (batch, out_channels, *conv_shape))
     return result
 
@@ -1373,10 +1382,13 @@ def scatter(base_grid: Tensor or Shape,
     * `mode='update'`: Replaces the values of `base_grid` at `indices` by `values`. The result is undefined if `indices` contains duplicates.
     * `mode='add'`: Adds `values` to `base_grid` at `indices`. The values corresponding to duplicate indices are accumulated.
     * `mode='mean'`: Replaces the values of `base_grid` at `indices` by the mean of all `values` with the same index.
+    * `mode='max'` / `mode='min'`: Replaces the values of `base_grid` at `indices` by the maximum / minimum of the current value and all `values` with the same index.
+
+    If `base_grid` is a `Shape`, cells without values are `0` for `'add'`, `-inf` for `'max'`, `inf` for `'min'` and NaN otherwise.
 
     Implementations:
 
-    * NumPy: Slice assignment / `numpy.add.at`
+    * NumPy: Slice assignment / `numpy.bincount` / `numpy.maximum.at` / `numpy.minimum.at` on linear indices that include the batch dimension
     * PyTorch: [`torch.scatter`](https://pytorch.org/docs/stable/generated/torch.scatter.html), [`torch.scatter_add`](https://pytorch.org/docs/stable/generated/torch.scatter_add.html)
     * TensorFlow: [`tf.tensor_scatter_nd_add`](https://www.tensorflow.org/api_docs/python/tf/tensor_scatter_nd_add), [`tf.tensor_scatter_nd_update`](https://www.tensorflow.org/api_docs/python/tf/tensor_scatter_nd_update)
     * Jax: [`jax.lax.scatter_add`](https://jax.readthedocs.io/en/latest/_autosummary/jax.lax.scatter_add.html), [`jax.lax.scatter`](https://jax.readthedocs.io/en/latest/_autosummary/jax.lax.scatter.html)
@@ -1388,7 +1400,7 @@ def scatter(base_grid: Tensor or Shape,
             This dimension is optional if the spatial rank is 1.
             Must also contain all `scatter_dims`.
         values: `Tensor` of values to scatter at `indices`.
-        mode: Scatter mode as `str`. One of ('add', 'mean', 'update')
+        mode: Scatter mode as `str`. One of ('add', 'mean', 'update', 'max', 'min')
         outside_handling: Defines how indices lying outside the bounds of `base_grid` are handled.
 
             * `'discard'`: outside indices are ignored.
@@ -1399,7 +1411,7 @@ def scatter(base_grid: Tensor or Shape,
     Returns:
         Copy of `base_grid` with updated values at `indices`.
     """
-    assert mode in ('update', 'add', 'mean')
+    assert mode in ('update', 'add', 'mean', 'max', 'min')
     assert outside_handling in ('discard', 'clamp', 'undefined')
     assert isinstance(indices_gradient, bool)
     grid_shape = base_grid if isinstance(base_grid, Shape) else base_grid.shape
@@ -1410,7 +1422,9 @@ def scatter(base_grid: Tensor or Shape,
     if isinstance(base_grid, Shape):
         with choose_backend_t(indices, values):
             base_grid = zeros(base_grid & batches & values.shape.channel)
-        if mode != 'add':
+        if mode in ('max', 'min'):
+            base_grid += -math.inf if mode == 'max' else math.inf
+        elif mode != 'add':
             base_grid += math.nan
     # --- Handle outside indices ---
     if outside_handling == 'clamp':
@@ -1430,14 +1444,7 @@ def scatter(base_grid: Tensor or Shape,
         native_values = reshaped_native(values, [batches, lists, channels], force_expand=True)
         native_indices = reshaped_native(indices, [batches, lists, 'vector'], force_expand=True)
         backend = choose_backend(native_indices, native_values, native_grid)
-        if mode in ('add', 'update'):
-            native_result = backend.scatter(native_grid, native_indices, native_values, mode=mode)
-        else:  # mean
-            zero_grid = backend.zeros_like(native_grid)
-            summed = backend.scatter(zero_grid, native_indices, native_values, mode='add')
-            count = backend.scatter(zero_grid, native_indices, backend.ones_like(native_values), mode='add')
-            native_result = summed / backend.maximum(count, 1)
-            native_result = backend.where(count == 0, native_grid, native_result)
+        native_result = backend.scatter(native_grid, native_indices, native_values, mode=mode)
         return reshaped_tensor(native_result, [batches, *spatial(base_grid), channels], check_sizes=True)
 
     def scatter_backward(shaped_base_grid_, shaped_indices_, shaped_values_, output, d_output):
@@ -1464,9 +1471,7 @@ def fft(x: Tensor) -> Tensor:
 
     Implementations:
 
-    * NumPy: [`np.fft.fft`](https://numpy.org/doc/stable/reference/generated/numpy.fft.fft.html),
-      [`numpy.fft.fft2`](https://numpy.org/doc/stable/reference/generated/numpy.fft.fft2.html),
-      [`numpy.fft.fftn`](https://numpy.org/doc/stable/reference/generated/numpy.fft.fftn.html)
+    * NumPy: [`scipy.fft.fftn`](https://docs.scipy.org/doc/scipy/reference/generated/scipy.fft.fftn.html), using `NumPyBackend.fft_workers` threads
     * PyTorch: [`torch.fft.fft`](https://pytorch.org/docs/stable/fft.html)
     * TensorFlow: [`tf.signal.fft`](https://www.tensorflow.org/api_docs/python/tf/signal/fft),
       [`tf.signal.fft2d`](https://www.tensorflow.org/api_docs/python/tf/signal/fft2d),
@@ -0,0 +1,169 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from ._shape import Shape, concat_shapes
+from ._tensors import Tensor, TensorLike, NativeTensor, disassemble_tree, assemble_tree
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # Python < 3.8, data is pickled instead
+    SharedMemory = None
+
+
+def parallel_map(f: Callable, *values: Tensor or TensorLike, dim: str or Shape, workers: int = None) -> Tensor or TensorLike or None:
+    """
+    Calls `f` on all slices of `values` along `dim` using a pool of worker processes and stacks the results along `dim`.
+
+    This is useful for independent simulations, e.g. parameter sweeps, that cannot be vectorized.
+    The data of all `values` is placed in shared memory once and sliced by the workers, so large arrays are not pickled.
+    Results are transferred back via shared memory as well.
+    On Python versions before 3.8, which lack `multiprocessing.shared_memory`, inputs and results are pickled instead.
+
+    Since the slices are processed by other processes, `f` must be picklable, i.e. defined at module level, and must not rely on global state modified after the call.
+    All values are converted to NumPy before being passed to the workers and the result is backed by NumPy arrays.
+
+    See Also:
+        `map()`.
+
+    Args:
+        f: Function to be called for each slice. Takes one argument per entry in `values`.
+            Must return a `Tensor` or `TensorLike` (e.g. a `phi.field.Grid`), a nested structure of these, or `None`.
+        *values: `Tensor` or `TensorLike` arguments to `f`.
+            Values that do not have `dim` are passed to every call of `f` unchanged.
+        dim: Dimension name or single-dimension `Shape` along which the values are sliced.
+        workers: Number of worker processes. Defaults to the number of CPUs.
+            If `workers <= 1`, all slices are processed in the calling process.
+
+    Returns:
+        Results of `f` stacked along `dim` with the same structure as the return value of `f`.
+        `dim` is placed at the position it has in the first value containing it.
+    """
+    dim = dim.name if isinstance(dim, Shape) else dim
+    trees, tensors = [], []
+    for value in values:
+        tree, value_tensors = disassemble_tree(value)
+        trees.append((tree, len(value_tensors)))
+        tensors.extend(value_tensors)
+    dim_shapes = [t.shape.only(dim) for t in tensors if dim in t.shape]
+    assert dim_shapes, f"None of the values has dimension '{dim}'"
+    assert all(s == dim_shapes[0] for s in dim_shapes), f"Dimension '{dim}' must have the same size in all values but got {dim_shapes}"
+    dim_shape = dim_shapes[0]
+    dim_index = [t.shape.index(dim) for t in tensors if dim in t.shape][0]
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1:
+        outputs = [_encode_result(_call_slice(f, trees, tensors, dim, i), share=False) for i in range(dim_shape.size)]
+        return _stack_outputs(outputs, dim_shape, dim_index)
+    # --- Place inputs in shared memory ---
+    input_blocks = []
+    futures = []
+    try:
+        descriptors = []
+        for t in tensors:
+            array = t.numpy(t.shape.names)
+            if SharedMemory is None:
+                descriptors.append((array, array.shape, array.dtype.str, t.shape))
+                continue
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            input_blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            descriptors.append((block.name, array.shape, array.dtype.str, t.shape))
+        chunksize = max(1, dim_shape.size // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, dim_shape.size)) as executor:
+            futures = [executor.submit(_parallel_map_worker, f, trees, descriptors, dim, range(i, min(i + chunksize, dim_shape.size))) for i in range(0, dim_shape.size, chunksize)]
+            outputs = []
+            for future in futures:
+                outputs.extend(future.result())
+        return _stack_outputs(outputs, dim_shape, dim_index)
+    finally:
+        for block in input_blocks:
+            block.close()
+            block.unlink()
+        for future in futures:  # the executor has waited for all chunks, including those after a failed one
+            if not future.cancelled() and future.exception() is None:
+                _unlink_outputs(future.result())
+
+
+def _call_slice(f: Callable, trees: List[tuple], tensors: List[Tensor], dim: str, index: int):
+    tensors = [t[{dim: index}] if dim in t.shape else t for t in tensors]
+    args = []
+    for tree, count in trees:
+        args.append(assemble_tree(tree, tensors[:count]))
+        tensors = tensors[count:]
+    return f(*args)
+
+
+def _encode_result(result, share: bool) -> Tuple[object, List[tuple]]:
+    """ Splits `result` into its structure and array descriptors `(data, native_shape, dtype, shape)` where `data` is the name of a shared memory block if `share=True` or the array itself otherwise. """
+    if result is None:
+        return None, []
+    result_tree, result_tensors = disassemble_tree(result)
+    descriptors = []
+    for t in result_tensors:
+        array = t.numpy(t.shape.names)
+        if share:
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            descriptors.append((block.name, array.shape, array.dtype.str, t.shape))
+            block.close()
+        else:
+            descriptors.append((array, array.shape, array.dtype.str, t.shape))
+    return result_tree, descriptors
+
+
+def _stack_outputs(outputs: List[Tuple[object, List[tuple]]], dim_shape: Shape, dim_index: int) -> Tensor or TensorLike or None:
+    if all(tree is None for tree, _ in outputs):
+        return None
+    result_tree, first_descriptors = outputs[0]
+    stacked = []
+    for j, (_, native_shape, dtype, shape) in enumerate(first_descriptors):
+        array = np.empty((dim_shape.size, *native_shape), dtype)
+        for i, (_, descriptors) in enumerate(outputs):
+            data, native_shape_i, _, shape_i = descriptors[j]
+            assert shape_i == shape, f"All results of f must have the same shape but got {shape} and {shape_i}"
+            if isinstance(data, str):
+                block = SharedMemory(data)
+                array[i] = np.ndarray(native_shape_i, dtype, buffer=block.buf)
+                block.close()
+            else:
+                array[i] = data
+        index = min(dim_index, shape.rank)
+        array = np.moveaxis(array, 0, index)
+        stacked.append(NativeTensor(array, concat_shapes(shape.only(shape.names[:index]), dim_shape, shape.only(shape.names[index:]))))
+    return assemble_tree(result_tree, stacked)
+
+
+def _unlink_outputs(outputs: List[Tuple[object, List[tuple]]]):
+    for _, descriptors in outputs:
+        for name, *_ in descriptors:
+            if isinstance(name, str):
+                block = SharedMemory(name)
+                block.close()
+                block.unlink()
+
+
+def _parallel_map_worker(f: Callable, trees: List[tuple], descriptors: List[tuple], dim: str, indices: range) -> List[Tuple[object, List[tuple]]]:
+    """ Processes one chunk of slices. Input blocks are attached for the duration of the chunk only. """
+    blocks = [SharedMemory(name) if isinstance(name, str) else None for name, *_ in descriptors]
+    tensors = []
+    for block, (name, native_shape, dtype, shape) in zip(blocks, descriptors):
+        tensors.append(NativeTensor(name if block is None else np.ndarray(native_shape, dtype, buffer=block.buf), shape))
+    outputs = []
+    try:
+        for index in indices:
+            outputs.append(_encode_result(_call_slice(f, trees, tensors, dim, index), share=SharedMemory is not None))
+    except BaseException:
+        _unlink_outputs(outputs)
+        raise
+    finally:
+        del tensors
+        for block in blocks:
+            if block is not None:
+                try:
+                    block.close()
+                except BufferError:  # f kept a reference to the input data
+                    pass
+    return outputs
@@ -0,0 +1,165 @@
+import numpy as np
+
+from ._shape import Shape, channel
+from ._tensors import Tensor, tensor, wrap
+from ._ops import reshaped_native, reshaped_tensor, choose_backend_t, round_, to_int32, to_float, clip, expand, min_, boolean_mask, zeros, where, scatter, gather, maximum
+from .backend import NUMPY
+from .backend._dtype import to_numpy_dtype
+
+
+class ScatterPlan:
+    """
+    Index data for scattering values located at fixed `indices` into grids of a fixed resolution.
+    The plan is computed once per point configuration and can then scatter any number of value tensors, e.g. occupancy and velocity components in particle-in-cell methods.
+
+    For NumPy indices, the plan stores the linear cell index of each point together with the permutation that sorts the points inside the grid by cell and the boundaries of the resulting segments.
+    `scatter()` then reduces the sorted values segment-wise using `numpy.ufunc.reduceat`, which also computes `mode='mean'` in a single pass.
+    For other backends, the plan stores the rounded indices and calls `phi.math.scatter()`.
+    This also applies to NumPy indices if the values or grids belong to another backend, e.g. to record gradients.
+    Except for `mode='update'`, outside points are clamped and their values neutralized so that all shapes are independent of the number of points inside the grid, which keeps jit-compiled functions from being re-traced.
+
+    `gather()` is the adjoint of `scatter(mode='add')` and reads grid values at the points.
+
+    See Also:
+        `phi.math.scatter()`, `phi.math.gather()`.
+    """
+
+    def __init__(self, resolution: Shape, indices: Tensor, outside_handling: str = 'discard'):
+        """
+        Args:
+            resolution: Spatial shape of the grids to scatter into.
+            indices: `Tensor` of n-dimensional indices with a channel dimension `vector` matching the spatial dimensions of `resolution`.
+                This dimension is optional if the spatial rank is 1.
+                Non-integer indices are rounded.
+                The collection dimensions of `indices` list the points. All other non-channel dimensions are treated as batch dimensions.
+            outside_handling: Defines how indices lying outside the bounds of the grid are handled, see `phi.math.scatter()`.
+        """
+        assert outside_handling in ('discard', 'clamp', 'undefined')
+        self._resolution = resolution.spatial
+        if indices.shape.channel_rank == 0:
+            assert self._resolution.rank == 1, f"indices must have a vector dimension but got {indices.shape}"
+            indices = expand(indices, channel(vector=1))
+        assert indices.shape.channel.names == ('vector',)
+        self._points = indices.shape.collection
+        self._batch = indices.shape.non_channel.non_collection
+        upper = tensor(self._resolution, channel('vector'))
+        indices = to_int32(round_(indices))
+        if outside_handling == 'clamp':
+            indices = clip(indices, 0, upper - 1)
+        inside = min_((indices >= 0) & (indices < upper), 'vector') if outside_handling == 'discard' else None
+        self._inside = inside
+        self._clamped = indices if inside is None else clip(indices, 0, upper - 1)
+        native_indices = reshaped_native(indices, [self._batch, self._points, 'vector'], force_expand=True)
+        if isinstance(native_indices, np.ndarray):
+            volume = self._resolution.volume
+            linear = np.ravel_multi_index(tuple(np.moveaxis(native_indices, -1, 0)), self._resolution.sizes, mode='wrap')
+            self._linear = (linear + (np.arange(linear.shape[0]) * volume)[:, None]).reshape(-1)
+            self._outside = None if inside is None else ~reshaped_native(inside, [self._batch, self._points], force_expand=True).reshape(-1)
+            valid = np.arange(self._linear.size) if inside is None else np.flatnonzero(~self._outside)
+            self._order = valid[np.argsort(self._linear[valid], kind='stable')]
+            sorted_cells = self._linear[self._order]
+            self._starts = np.flatnonzero(np.concatenate([[True], sorted_cells[1:] != sorted_cells[:-1]])) if sorted_cells.size else np.zeros(0, np.intp)
+            self._cells = sorted_cells[self._starts]
+            self._counts = np.diff(np.append(self._starts, sorted_cells.size))
+        else:
+            self._linear = None
+
+    @property
+    def resolution(self) -> Shape:
+        """ Spatial shape of the grids. """
+        return self._resolution
+
+    @property
+    def occupied_cells(self) -> int:
+        """ Number of distinct grid cells receiving at least one value. Only available for NumPy indices. """
+        assert self._linear is not None, "occupied_cells is only available for NumPy indices"
+        return self._cells.size
+
+    def scatter(self, values: Tensor or float, mode: str = 'add', base_grid: Tensor = None) -> Tensor:
+        """
+        Scatters `values` into a grid at the points of this plan.
+
+        Args:
+            values: `Tensor` listing one value per point along the point dimensions or constant value.
+                Dimensions not shared with the indices are added to the result.
+            mode: One of ('add', 'mean', 'update', 'max', 'min'), see `phi.math.scatter()`.
+                With `'update'`, the last value is used for duplicate indices.
+            base_grid: (Optional) Grid holding the values of cells without points.
+                Defaults to zero for `'add'`, `-inf` / `inf` for `'max'` / `'min'` and `NaN` otherwise, like `phi.math.scatter()`.
+
+        Returns:
+            Grid `Tensor` with the spatial dimensions `resolution`.
+        """
+        assert mode in ('update', 'add', 'mean', 'max', 'min')
+        values = wrap(values)
+        components = values.shape.non_collection.without(self._batch)
+        if base_grid is not None:
+            components &= base_grid.shape.non_spatial.without(self._batch)
+        if self._linear is None or choose_backend_t(values, *([] if base_grid is None else [base_grid])) is not NUMPY:
+            if base_grid is None:
+                with choose_backend_t(self._clamped, values):
+                    base_grid = zeros(self._batch & self._resolution & components) + _default_base(mode)
+            if self._inside is None:
+                return scatter(base_grid, self._clamped, values, mode=mode, outside_handling='undefined')
+            if mode == 'add':
+                return scatter(base_grid, self._clamped, values * to_float(self._inside), mode='add', outside_handling='undefined')
+            if mode == 'mean':
+                weight = to_float(self._inside)
+                sums = scatter(zeros(base_grid.shape), self._clamped, values * weight, mode='add', outside_handling='undefined')
+                counts = scatter(zeros(self._batch & self._resolution), self._clamped, weight, mode='add', outside_handling='undefined')
+                return where(counts > 0, sums / maximum(counts, 1), base_grid)
+            if mode in ('max', 'min'):
+                return scatter(base_grid, self._clamped, where(self._inside, values, -np.inf if mode == 'max' else np.inf), mode=mode, outside_handling='undefined')
+            indices = boolean_mask(self._clamped, self._points.name, self._inside)
+            if values.shape.only(self._points):
+                values = boolean_mask(values, self._points.name, self._inside)
+            return scatter(base_grid, indices, values, mode=mode, outside_handling='undefined')
+        native_values = reshaped_native(values, [self._batch, self._points, components], force_expand=True, to_numpy=True)
+        native_values = native_values.reshape((-1, native_values.shape[-1]))
+        if base_grid is None:
+            dtype = native_values.dtype if mode == 'add' or native_values.dtype.kind in 'fc' else to_numpy_dtype(NUMPY.float_type)
+            result = np.full((self._batch.volume * self._resolution.volume, components.volume), _default_base(mode), dtype)
+        else:
+            result = np.array(reshaped_native(base_grid, [self._batch, self._resolution, components], force_expand=True, to_numpy=True)).reshape((-1, components.volume))
+        if self._order.size:
+            sorted_values = native_values[self._order]
+            if mode == 'add':
+                result[self._cells] += np.add.reduceat(sorted_values, self._starts, axis=0)
+            elif mode == 'mean':
+                result[self._cells] = np.add.reduceat(sorted_values, self._starts, axis=0) / self._counts[:, None]
+            elif mode == 'max':
+                result[self._cells] = np.maximum(result[self._cells], np.maximum.reduceat(sorted_values, self._starts, axis=0))
+            elif mode == 'min':
+                result[self._cells] = np.minimum(result[self._cells], np.minimum.reduceat(sorted_values, self._starts, axis=0))
+            else:  # update
+                result[self._cells] = sorted_values[self._starts + self._counts - 1]
+        return reshaped_tensor(result.reshape((self._batch.volume, self._resolution.volume, -1)), [self._batch, self._resolution, components], check_sizes=True)
+
+    def gather(self, grid: Tensor) -> Tensor:
+        """
+        Reads the values of `grid` at the points of this plan.
+        Points that were discarded because they lie outside the grid receive the value zero.
+
+        This is the adjoint operation of `scatter()` with `mode='add'`.
+        For backends other than NumPy, it is implemented using `phi.math.gather()` and supports gradients.
+
+        Args:
+            grid: `Tensor` with the spatial dimensions `resolution`.
+
+        Returns:
+            `Tensor` listing one value per point.
+        """
+        components = grid.shape.non_spatial.without(self._batch)
+        if self._linear is None or choose_backend_t(grid) is not NUMPY:
+            result = gather(grid, self._clamped)
+            return result if self._inside is None else where(self._inside, result, 0)
+        native_grid = reshaped_native(grid, [self._batch, self._resolution, components], force_expand=True, to_numpy=True)
+        result = native_grid.reshape((-1, components.volume))[self._linear]
+        if self._outside is not None:
+            result[self._outside] = 0
+        return reshaped_tensor(result.reshape((self._batch.volume, self._points.volume, -1)), [self._batch, self._points, components], check_sizes=True)
+
+
+def _default_base(mode: str) -> float:
+    """ Value of cells without points if no `base_grid` is given, matching `phi.math.scatter()`. """
+    return {'add': 0, 'max': -np.inf, 'min': np.inf}.get(mode, np.nan)
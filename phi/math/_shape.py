@@ -1013,7 +1013,10 @@ def collection(*args, **dims: int):
         raise AssertionError(f"collection() must be called either as a selector collection(Shape) or collection(Tensor) or as a constructor collection(*names, **dims). Got *args={args}, **dims={dims}")
 
 
-def merge_shapes(*shapes: Shape, check_exact: tuple or list = (), order=(batch, collection, spatial, channel)):
+_DEFAULT_TYPE_ORDER = (batch, collection, spatial, channel)
+
+
+def merge_shapes(*shapes: Shape, check_exact: tuple or list = (), order=_DEFAULT_TYPE_ORDER):
     """
     Combines `shapes` into a single `Shape`, grouping dimensions by type.
     If dimensions with equal names are present in multiple shapes, their types and sizes must match.
@@ -1037,6 +1040,8 @@ def merge_shapes(*shapes: Shape, check_exact: tuple or list = (), order=(batch,
     """
     if not shapes:
         return EMPTY_SHAPE
+    if order == _DEFAULT_TYPE_ORDER and all(shape == shapes[0] for shape in shapes[1:]) and _is_grouped(shapes[0]):
+        return shapes[0]  # fast path for binary operations between tensors of equal shape
     merged = []
     for dim_type in order:
         check_type_exact = dim_type in check_exact
@@ -1069,6 +1074,15 @@ def merge_shapes(*shapes: Shape, check_exact: tuple or list = (), order=(batch,
         raise IncompatibleShapes(f"Cannot merge shapes {list(shapes)} because dimension '{err.dimension}' exists with different types. Types are {[s.types for s in shapes]}")
 
 
+_TYPE_RANKS = {BATCH_DIM: 0, COLLECTION_DIM: 1, SPATIAL_DIM: 2, CHANNEL_DIM: 3}
+
+
+def _is_grouped(shape: Shape) -> bool:
+    """ Tests whether the dimensions of `shape` are ordered by type as in the result of `merge_shapes()`. """
+    ranks = [_TYPE_RANKS[t] for t in shape.types]
+    return all(r1 <= r2 for r1, r2 in zip(ranks, ranks[1:]))
+
+
 def concat_shapes(*shapes: Shape):
     """
     Creates a `Shape` listing the dimensions of all `shapes` in the given order.
@@ -5,7 +5,7 @@ from typing import List, Callable
 
 import numpy
 
-from ._dtype import DType, combine_types
+from ._dtype import DType, combine_types, to_numpy_dtype
 
 
 SolveResult = namedtuple('SolveResult', [
@@ -177,6 +177,25 @@ class Backend:
     def seed(self, seed: int):
         raise NotImplementedError()
 
+    def get_random_state(self):
+        """
+        Returns the state of the global random number generator of this backend.
+        The state can be restored using `set_random_state()`.
+
+        Returns:
+            Picklable object.
+        """
+        raise NotImplementedError()
+
+    def set_random_state(self, state):
+        """
+        Restores the state of the global random number generator.
+
+        Args:
+            state: State returned by `get_random_state()`.
+        """
+        raise NotImplementedError()
+
     def is_tensor(self, x, only_native=False):
         """
         An object is considered a native tensor by a backend if no internal conversion is required by backend methods.
@@ -243,6 +262,20 @@ class Backend:
         """
         raise NotImplementedError()
 
+    def host_buffer(self, shape: tuple, dtype: DType):
+        """
+        Allocates an uninitialized NumPy array that can be passed to `as_tensor()` or `from_dlpack()` efficiently.
+        Backends may use page-locked memory to speed up transfers to the default device.
+
+        Args:
+          shape: Shape of the array.
+          dtype: Data type of the array.
+
+        Returns:
+          Writable NumPy array
+        """
+        return numpy.empty(shape, to_numpy_dtype(dtype))
+
     def to_dlpack(self, tensor):
         raise NotImplementedError()
 
@@ -451,7 +484,7 @@ class Backend:
     def exp(self, x):
         raise NotImplementedError(self)
 
-    def conv(self, value, kernel, zero_padding=True):
+    def conv(self, value, kernel, zero_padding=True, strides=1):
         """
         Convolve value with kernel.
         Depending on the tensor rank, the convolution is either 1D (rank=3), 2D (rank=4) or 3D (rank=5).
@@ -461,6 +494,7 @@ class Backend:
             value: tensor of shape (batch_size, in_channel, spatial...)
             kernel: tensor of shape (batch_size or 1, out_channel, in_channel, spatial...)
             zero_padding: If True, pads the edges of `value` with zeros so that the result has the same shape as `value`.
+            strides: `int` or one `int` per spatial dimension. Only every `stride`-th value of the result is computed, starting with the first.
 
         Returns:
             Convolution result as tensor of shape (batch_size, out_channel, spatial...)
@@ -541,17 +575,24 @@ class Backend:
 
     def scatter(self, base_grid, indices, values, mode: str):
         """
-        Depending on `mode`, performs scatter_update or scatter_add.
+        Depending on `mode`, performs scatter_update, scatter_add, scatter_mean, scatter_max or scatter_min.
+
+        The base implementation computes `mode='mean'` from two invocations with `mode='add'`.
 
         Args:
             base_grid: Tensor into which scatter values are inserted at indices. Tensor of shape (batch_size, spatial..., channels)
             indices: Tensor of shape (batch_size or 1, update_count, index_vector)
             values: Values to scatter at indices. Tensor of shape (batch_size or 1, update_count or 1, channels or 1)
-            mode: One of ('update', 'add')
+            mode: One of ('update', 'add', 'mean', 'max', 'min')
 
         Returns:
             Copy of base_grid with values at `indices` updated by `values`.
         """
+        if mode == 'mean':
+            zero_grid = self.zeros_like(base_grid)
+            summed = self.scatter(zero_grid, indices, values, mode='add')
+            count = self.scatter(zero_grid, indices, self.ones_like(values), mode='add')
+            return self.where(count == 0, base_grid, summed / self.maximum(count, 1))
         raise NotImplementedError(self)
 
     def any(self, boolean_tensor, axis=None, keepdims=False):
@@ -584,6 +625,33 @@ class Backend:
         """
         raise NotImplementedError(self)
 
+    def rfft(self, x):
+        """
+        Computes the n-dimensional FFT of a real tensor along all but the first and last dimensions.
+        Since the spectrum of real data is Hermitian-symmetric, only the non-negative frequencies of the last transformed dimension are returned, reducing its size to `n // 2 + 1`.
+
+        Args:
+          x: real tensor of dimension 3 or higher
+
+        Returns:
+            Complex tensor of the same rank as `x`.
+        """
+        raise NotImplementedError(self)
+
+    def irfft(self, k, resolution: tuple):
+        """
+        Inverse of `Backend.rfft()`.
+
+        Args:
+          k: complex tensor of dimension 3 or higher as returned by `Backend.rfft()`
+          resolution: Sizes of the transformed dimensions of the real result.
+            This is required because the size of the last dimension cannot be inferred from `k`.
+
+        Returns:
+            Real tensor
+        """
+        raise NotImplementedError(self)
+
     def imag(self, x):
         raise NotImplementedError(self)
 
@@ -1002,7 +1070,34 @@ class Backend:
         return a // b
 
 
-BACKENDS = []
+def _counting(method):
+    """ Wraps a mutating `list` method so that it increments `_BackendList.version`. """
+    def modify(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    return modify
+
+
+class _BackendList(list):
+    """ `list` that counts modifications so that cached backend decisions can be invalidated, see `choose_backend()`. """
+
+    version = 0
+
+    append = _counting(list.append)
+    extend = _counting(list.extend)
+    insert = _counting(list.insert)
+    remove = _counting(list.remove)
+    pop = _counting(list.pop)
+    clear = _counting(list.clear)
+    __setitem__ = _counting(list.__setitem__)
+    __delitem__ = _counting(list.__delitem__)
+    __iadd__ = _counting(list.__iadd__)
+    __imul__ = _counting(list.__imul__)
+    sort = _counting(list.sort)
+    reverse = _counting(list.reverse)
+
+
+BACKENDS = _BackendList()
 """ Global list of all registered backends. Register a `Backend` by adding it to the list. """
 _DEFAULT = []  # [0] = global default, [1:] from 'with' blocks
 _PRECISION = [32]  # [0] = global precision in bits, [1:] from 'with' blocks
@@ -1014,15 +1109,52 @@ def choose_backend(*values, prefer_default=False) -> Backend:
 
     This function is used by most math functions operating on `Tensor` objects to delegate the actual computations.
 
+    The decision is cached per combination of value types, default backend and `prefer_default`.
+    Values whose applicability depends on their content, i.e. tuples, lists and NumPy arrays of type `object`, bypass the cache.
+    The cache is cleared whenever `BACKENDS` changes.
+
     Args:
         *values:
         prefer_default: if True, selects the default backend assuming it can handle handle the values, see `default_backend()`.
-        raise_error: Determines the behavior of this function if no backend can handle the given values.
-            If True, raises a `NoBackendFound` error, else returns `None`.
 
     Returns:
         the selected `Backend`
+
+    Raises:
+        NoBackendFound: If no backend can handle the given values.
     """
+    key = _dispatch_key(values, prefer_default)
+    if key is None:
+        return _choose_backend(values, prefer_default)
+    if BACKENDS.version != _DISPATCH_VERSION[0]:
+        _DISPATCH_CACHE.clear()
+        _DISPATCH_VERSION[0] = BACKENDS.version
+    default, backend = _DISPATCH_CACHE.get(key, (None, None))
+    if default is not _DEFAULT[-1]:
+        backend = _choose_backend(values, prefer_default)
+        if len(_DISPATCH_CACHE) >= _DISPATCH_CACHE_SIZE:
+            _DISPATCH_CACHE.clear()
+        _DISPATCH_CACHE[key] = (_DEFAULT[-1], backend)
+    return backend
+
+
+_DISPATCH_CACHE = {}  # (id(default backend), prefer_default, *value types) -> (default backend, selected backend). Backends are compared by identity since profiling backends equal the backends they wrap.
+_DISPATCH_CACHE_SIZE = 1024
+_DISPATCH_VERSION = [-1]  # BACKENDS.version when the cache was filled
+
+
+def _dispatch_key(values: tuple, prefer_default: bool) -> tuple or None:
+    """ Returns the key under which the backend decision for `values` is cached or `None` if the decision depends on the content of the values. """
+    key = [id(_DEFAULT[-1]), prefer_default]
+    for value in values:
+        value_type = type(value)
+        if value_type in (tuple, list) or (isinstance(value, numpy.ndarray) and value.dtype == object):
+            return None
+        key.append(value_type)
+    return tuple(key)
+
+
+def _choose_backend(values: tuple, prefer_default: bool) -> Backend:
     # --- Default Backend has priority ---
     if _is_applicable(_DEFAULT[-1], values) and (prefer_default or _is_specific(_DEFAULT[-1], values)):
         return _DEFAULT[-1]
@@ -4,10 +4,6 @@ import sys
 from typing import List, Any, Callable
 
 import numpy as np
-import scipy.signal
-import scipy.sparse
-from scipy.sparse import issparse
-from scipy.sparse.linalg import cg, spsolve
 
 from . import Backend, ComputeDevice
 from ._backend import combined_dim, SolveResult
@@ -24,6 +20,7 @@ class NumPyBackend(Backend):
             mem_bytes = -1
         processors = os.cpu_count()
         self.cpu = ComputeDevice(self, "CPU", 'CPU', mem_bytes, processors, "")
+        self.fft_workers = processors  # number of threads used by scipy.fft
         Backend.__init__(self, "NumPy", self.cpu)
 
     def prefers_channels_last(self) -> bool:
@@ -33,6 +30,12 @@ class NumPyBackend(Backend):
         return [self.cpu]
 
     seed = np.random.seed
+
+    def get_random_state(self):
+        return np.random.get_state()
+
+    def set_random_state(self, state):
+        np.random.set_state(state)
     clip = staticmethod(np.clip)
     minimum = np.minimum
     maximum = np.maximum
@@ -171,9 +174,9 @@ class NumPyBackend(Backend):
         return np.tensordot(a, b, (a_axes, b_axes))
 
     def mul(self, a, b):
-        if scipy.sparse.issparse(a):
+        if issparse(a):
             return a.multiply(b)
-        elif scipy.sparse.issparse(b):
+        elif issparse(b):
             return b.multiply(a)
         else:
             return Backend.mul(self, a, b)
@@ -195,22 +198,25 @@ class NumPyBackend(Backend):
     def min(self, x, axis=None, keepdims=False):
         return np.min(x, axis, keepdims=keepdims)
 
-    def conv(self, value, kernel, zero_padding=True):
+    def conv(self, value, kernel, zero_padding=True, strides=1):
         assert kernel.shape[0] in (1, value.shape[0])
         assert value.shape[1] == kernel.shape[2], f"value has {value.shape[1]} channels but kernel has {kernel.shape[2]}"
         assert value.ndim + 1 == kernel.ndim
+        strides = (strides,) * (value.ndim - 2) if isinstance(strides, int) else tuple(strides)
+        is_complex = np.iscomplexobj(value) or np.iscomplexobj(kernel)
+        dtype = to_numpy_dtype(self.complex_type if is_complex else self.float_type)
+        value, kernel = np.asarray(value, dtype), np.asarray(kernel, dtype)
+        if value.shape[0] * value.shape[1] * kernel.shape[1] == 1:  # single pair, SciPy chooses between direct and FFT
+            import scipy.signal
+            result = scipy.signal.correlate(value[0, 0], kernel[0, 0, 0], mode='same' if zero_padding else 'valid')
+            return result[(None, None, *[slice(None, None, s) for s in strides])]
         if zero_padding:
-            result = np.zeros((value.shape[0], kernel.shape[1], *value.shape[2:]), dtype=to_numpy_dtype(self.float_type))
+            value = np.pad(value, [(0, 0), (0, 0)] + [(k // 2, (k - 1) // 2) for k in kernel.shape[3:]])
+        if not is_complex and _fft_conv_is_faster(value.shape, kernel.shape, strides):
+            result = _fft_conv(value, kernel, self.fft_workers)
+            return result[(slice(None), slice(None), *[slice(None, None, s) for s in strides])]
         else:
-            valid = [value.shape[i + 2] - kernel.shape[i + 3] + 1 for i in range(value.ndim - 2)]
-            result = np.zeros([value.shape[0], kernel.shape[1], *valid], dtype=to_numpy_dtype(self.float_type))
-        mode = 'same' if zero_padding else 'valid'
-        for b in range(value.shape[0]):
-            b_kernel = kernel[min(b, kernel.shape[0] - 1)]
-            for o in range(kernel.shape[1]):
-                for i in range(value.shape[1]):
-                    result[b, o, ...] += scipy.signal.correlate(value[b, i, ...], b_kernel[o, i, ...], mode=mode)
-        return result
+            return _im2col_conv(value, kernel, strides)
 
     def expand_dims(self, a, axis=0, number=1):
         for _i in range(number):
@@ -220,18 +226,17 @@ class NumPyBackend(Backend):
     def cast(self, x, dtype: DType):
         if self.is_tensor(x, only_native=True) and from_numpy_dtype(x.dtype) == dtype:
             return x
+        elif issparse(x):
+            return x.astype(to_numpy_dtype(dtype))
         else:
             return np.array(x, to_numpy_dtype(dtype))
 
     def batched_gather_nd(self, values, indices):
         assert indices.shape[-1] == self.ndims(values) - 2
         batch_size = combined_dim(values.shape[0], indices.shape[0])
-        result = np.empty((batch_size, *indices.shape[1:-1], values.shape[-1],), values.dtype)
-        for b in range(batch_size):
-            b_values = values[min(b, values.shape[0] - 1)]
-            b_indices = self.unstack(indices[min(b, indices.shape[0] - 1)], -1)
-            result[b] = b_values[b_indices]
-        return result
+        batch_index = np.arange(batch_size) if values.shape[0] > 1 else np.zeros(batch_size, np.intp)
+        batch_index = batch_index.reshape((batch_size,) + (1,) * (indices.ndim - 2))
+        return values[(batch_index, *np.moveaxis(indices, -1, 0))]
 
     def std(self, x, axis=None, keepdims=False):
         return np.std(x, axis, keepdims=keepdims)
@@ -247,53 +252,61 @@ class NumPyBackend(Backend):
         return np.all(boolean_tensor, axis=axis, keepdims=keepdims)
 
     def scatter(self, base_grid, indices, values, mode: str):
-        assert mode in ('add', 'update')
+        assert mode in ('add', 'update', 'mean', 'max', 'min')
         assert isinstance(base_grid, np.ndarray)
-        assert isinstance(indices, (np.ndarray, tuple))
+        assert isinstance(indices, np.ndarray)
         assert isinstance(values, np.ndarray)
         assert indices.ndim == 3
         assert values.ndim == 3
         assert base_grid.ndim >= 3
         batch_size = combined_dim(combined_dim(base_grid.shape[0], indices.shape[0]), values.shape[0])
-        if base_grid.shape[0] == batch_size:
-            result = np.copy(base_grid)
-        else:
-            result = np.tile(base_grid, (batch_size, *[1] * (base_grid.ndim - 1)))
-        if not isinstance(indices, (tuple, list)):
-            indices = self.unstack(indices, axis=-1)
-        if mode == 'add':
-            for b in range(batch_size):
-                np.add.at(result, (b, *[i[min(b, i.shape[0]-1)] for i in indices]), values[min(b, values.shape[0]-1)])
-        else:  # update
-            for b in range(batch_size):
-                result[(b, *[i[min(b, i.shape[0]-1)] for i in indices])] = values[min(b, values.shape[0]-1)]
-        # elif duplicates_handling == 'mean':
-        #     count = np.zeros(shape, np.int32)
-        #     np.add.at(array, tuple(indices), values)
-        #     np.add.at(count, tuple(indices), 1)
-        #     count = np.maximum(1, count)
-        #     return array / count
+        resolution, channels = base_grid.shape[1:-1], base_grid.shape[-1]
+        update_count = combined_dim(indices.shape[1], values.shape[1])
+        result = np.array(np.broadcast_to(base_grid, (batch_size, *base_grid.shape[1:])), order='C')  # flat_result must be a view
+        flat_result = result.reshape((-1, channels))
+        # --- Linear indices into flat_result, including the batch offset ---
+        linear = np.ravel_multi_index(tuple(np.moveaxis(indices, -1, 0)), resolution, mode='wrap')
+        linear = linear + (np.arange(batch_size) * int(np.prod(resolution)))[:, None]
+        linear = np.broadcast_to(linear, (batch_size, update_count)).reshape(-1)
+        values = np.broadcast_to(values, (batch_size, update_count, channels)).reshape((-1, channels))
+        if mode == 'update':
+            flat_result[linear] = values
+        elif mode == 'add':
+            _scatter_add(flat_result, linear, values)
+        elif mode == 'mean':
+            summed = np.zeros_like(flat_result)
+            _scatter_add(summed, linear, values)
+            count = np.bincount(linear, minlength=flat_result.shape[0])
+            hit = count > 0
+            flat_result[hit] = summed[hit] / count[hit, None]
+        elif mode == 'max':
+            np.maximum.at(flat_result, linear, values)
+        else:  # min
+            np.minimum.at(flat_result, linear, values)
         return result
 
     def fft(self, x):
         rank = len(x.shape) - 2
         assert rank >= 1
-        if rank == 1:
-            return np.fft.fft(x, axis=1)
-        elif rank == 2:
-            return np.fft.fft2(x, axes=[1, 2])
-        else:
-            return np.fft.fftn(x, axes=list(range(1, rank + 1)))
+        import scipy.fft
+        return scipy.fft.fftn(x, axes=tuple(range(1, rank + 1)), workers=self.fft_workers)
 
     def ifft(self, k):
         rank = len(k.shape) - 2
         assert rank >= 1
-        if rank == 1:
-            return np.fft.ifft(k, axis=1).astype(k.dtype)
-        elif rank == 2:
-            return np.fft.ifft2(k, axes=[1, 2]).astype(k.dtype)
-        else:
-            return np.fft.ifftn(k, axes=list(range(1, rank + 1))).astype(k.dtype)
+        import scipy.fft
+        return scipy.fft.ifftn(k, axes=tuple(range(1, rank + 1)), workers=self.fft_workers).astype(k.dtype)
+
+    def rfft(self, x):
+        rank = len(x.shape) - 2
+        assert rank >= 1
+        import scipy.fft
+        return scipy.fft.rfftn(x, axes=tuple(range(1, rank + 1)), workers=self.fft_workers)
+
+    def irfft(self, k, resolution: tuple):
+        assert len(resolution) == len(k.shape) - 2
+        import scipy.fft
+        return scipy.fft.irfftn(k, s=resolution, axes=tuple(range(1, len(resolution) + 1)), workers=self.fft_workers)
 
     def dtype(self, array) -> DType:
         if isinstance(array, int):
@@ -310,12 +323,13 @@ class NumPyBackend(Backend):
         if not isinstance(indices, (tuple, list)):
             indices = self.unstack(indices, -1)
         if len(indices) == 2:
+            import scipy.sparse
             return scipy.sparse.csc_matrix((values, indices), shape=shape)
         else:
             raise NotImplementedError(f"len(indices) = {len(indices)} not supported. Only (2) allowed.")
 
     def coordinates(self, tensor):
-        assert scipy.sparse.issparse(tensor)
+        assert issparse(tensor)
         coo = tensor.tocoo()
         return (coo.row, coo.col), coo.data
 
@@ -353,6 +367,7 @@ class NumPyBackend(Backend):
 
     def linear_solve(self, method: str, lin, y, x0, rtol, atol, max_iter, trj: bool) -> Any:
         if method == 'auto' and not trj and issparse(lin):
+            from scipy.sparse.linalg import spsolve
             batch_size = self.staticshape(y)[0]
             xs = []
             converged = []
@@ -372,6 +387,7 @@ class NumPyBackend(Backend):
     def conjugate_gradient(self, lin, y, x0, rtol, atol, max_iter, trj: bool) -> Any:
         if trj or callable(lin):
             return Backend.conjugate_gradient(self, lin, y, x0, rtol, atol, max_iter, trj)  # generic implementation
+        from scipy.sparse.linalg import cg
         bs_y = self.staticshape(y)[0]
         bs_x0 = self.staticshape(x0)[0]
         batch_size = combined_dim(bs_y, bs_x0)
@@ -398,3 +414,80 @@ class NumPyBackend(Backend):
         x = np.stack(xs)
         f_eval = [i + 1 for i in iterations]
         return SolveResult('scipy.sparse.linalg.cg', x, None, iterations, f_eval, converged, diverged, "")
+
+
+def _scatter_add(flat_grid: np.ndarray, linear: np.ndarray, values: np.ndarray):
+    """ Adds the rows of `values` to `flat_grid` at `linear` in-place, accumulating duplicates. Real floating point values use `numpy.bincount()` which is faster than `numpy.add.at()`. """
+    if flat_grid.dtype.kind == 'f' and values.dtype.kind in 'biuf':
+        for c in range(flat_grid.shape[1]):
+            flat_grid[:, c] += np.bincount(linear, weights=values[:, c], minlength=flat_grid.shape[0])
+    else:
+        np.add.at(flat_grid, linear, values)
+
+
+def issparse(x) -> bool:
+    """ Like `scipy.sparse.issparse()` but without importing SciPy. Sparse matrices can only exist once `scipy.sparse` has been imported. """
+    sparse = sys.modules.get('scipy.sparse')
+    return sparse is not None and sparse.issparse(x)
+
+
+_IM2COL_CHUNK_BYTES = 2 ** 26  # upper bound for the temporary column matrix of _im2col_conv
+
+
+def _im2col_conv(value: np.ndarray, kernel: np.ndarray, strides: tuple) -> np.ndarray:
+    """
+    Valid cross-correlation as batched matrix multiplications of all (strided) input windows with the flattened kernel.
+    The column matrix holds *in_channels x kernel_size* entries per output point, so it is built in chunks of batch entries and output rows of at most `_IM2COL_CHUNK_BYTES`.
+    """
+    rank = value.ndim - 2
+    batch_size, in_channels = value.shape[:2]
+    kernel_spatial = kernel.shape[3:]
+    out_spatial = tuple((v - k) // s + 1 for v, k, s in zip(value.shape[2:], kernel_spatial, strides))
+    windows = np.lib.stride_tricks.as_strided(value,  # (batch, in, *out_spatial, *kernel_spatial), read-only view
+                                              shape=value.shape[:2] + out_spatial + kernel_spatial,
+                                              strides=value.strides[:2] + tuple(b * s for b, s in zip(value.strides[2:], strides)) + value.strides[2:],
+                                              writeable=False)
+    kernel_matrix = np.swapaxes(kernel.reshape(*kernel.shape[:2], -1), 1, 2)  # (batch or 1, in * kernel_size, out)
+    result = np.empty((batch_size, kernel.shape[1], *out_spatial), np.result_type(value, kernel))
+    row_bytes = int(np.prod(out_spatial[1:])) * in_channels * int(np.prod(kernel_spatial)) * value.itemsize
+    rows = int(min(max(1, _IM2COL_CHUNK_BYTES // max(row_bytes, 1)), out_spatial[0]))
+    batches = max(1, _IM2COL_CHUNK_BYTES // max(row_bytes * out_spatial[0], 1)) if rows == out_spatial[0] else 1
+    for b in range(0, batch_size, batches):
+        b_kernel = kernel_matrix if kernel_matrix.shape[0] == 1 else kernel_matrix[b:b + batches]
+        for r in range(0, out_spatial[0], rows):
+            chunk = windows[b:b + batches, :, r:r + rows]
+            columns = np.moveaxis(chunk, 1, 1 + rank).reshape(chunk.shape[0], -1, b_kernel.shape[1])  # (batches, chunk_points, in * kernel_size)
+            chunk_result = np.matmul(columns, b_kernel)  # (batches, chunk_points, out)
+            result[b:b + batches, :, r:r + rows] = np.swapaxes(chunk_result, 1, 2).reshape(chunk.shape[0], kernel.shape[1], *chunk.shape[2:2 + rank])
+    return result
+
+
+def _fft_conv(value: np.ndarray, kernel: np.ndarray, workers: int) -> np.ndarray:
+    """ Valid cross-correlation computed as product of real FFTs, summed over input channels in frequency space. """
+    rank = value.ndim - 2
+    axes = tuple(range(-rank, 0))
+    value_size, kernel_size = value.shape[2:], kernel.shape[3:]
+    import scipy.fft
+    fft_shape = [scipy.fft.next_fast_len(v + k - 1, real=True) for v, k in zip(value_size, kernel_size)]
+    value_f = scipy.fft.rfftn(value, fft_shape, axes=axes, workers=workers)
+    kernel_f = scipy.fft.rfftn(np.flip(kernel, axes), fft_shape, axes=axes, workers=workers)
+    if kernel.shape[0] == 1:
+        result_f = np.einsum('bi...,oi...->bo...', value_f, kernel_f[0])
+    else:
+        result_f = np.einsum('bi...,boi...->bo...', value_f, kernel_f)
+    result = scipy.fft.irfftn(result_f, fft_shape, axes=axes, workers=workers)
+    return result[(slice(None), slice(None), *[slice(k - 1, v) for v, k in zip(value_size, kernel_size)])]
+
+
+def _fft_conv_is_faster(value_shape: tuple, kernel_shape: tuple, strides: tuple) -> bool:
+    """ Compares the estimated run times of `_im2col_conv` and `_fft_conv` for valid cross-correlation. The weights are fitted to CPU timings. """
+    batch_size, in_channels = value_shape[:2]
+    kernel_batch, out_channels = kernel_shape[:2]
+    kernel_size = int(np.prod(kernel_shape[3:]))
+    out_size = int(np.prod([(v - k) // s + 1 for v, k, s in zip(value_shape[2:], kernel_shape[3:], strides)]))
+    fft_size = int(np.prod([v + k - 1 for v, k in zip(value_shape[2:], kernel_shape[3:])]))
+    columns = batch_size * out_size * in_channels * kernel_size
+    im2col = columns * (30 + out_channels)  # copying the windows + matrix multiplication
+    transforms = batch_size * in_channels + kernel_batch * out_channels * in_channels + batch_size * out_channels
+    fft = 5 * transforms * fft_size * np.log2(max(fft_size, 2)) + 17 * batch_size * out_channels * in_channels * fft_size
+    return fft < im2col
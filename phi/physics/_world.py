@@ -6,7 +6,9 @@ Worlds also facilitate referencing states when performing a forward simulation.
 A default World, called `world` is provided for convenience.
 """
 import inspect
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypeVar
 
 from phi import geom
@@ -463,40 +465,123 @@ CollectiveState = StateCollection
 
 class CollectivePhysics(Physics):
 
-    def __init__(self):
+    def __init__(self, max_workers=1):
+        """
+        Steps all states of a `StateCollection`, resolving blocking dependencies between them.
+
+        The states are ordered by their blocking dependencies into levels of a directed acyclic graph.
+        This schedule is cached and only recomputed when states are added or removed or their tags or dependencies change.
+        States in the same level do not depend on each other and are stepped concurrently if `max_workers > 1`.
+
+        Args:
+          max_workers: Maximum number of threads used to step independent states concurrently.
+            Concurrent stepping requires the `Physics` of all states to be thread-safe.
+        """
         Physics.__init__(self, {})
         self.physics = {}  # map from name to Physics
+        self.max_workers = max_workers
+        self.step_times = {}
+        """ Wall-clock time in seconds spent in `Physics.step()` for each state during the last step, mapping state names to times. """
+        self._schedule_key = None
+        self._schedule = None
+        self._executor = None
+        self._executor_workers = None
 
     def step(self, state_collection, dt=1.0, **dependent_states):
         assert len(dependent_states) == 0
         if len(state_collection) == 0:
             return state_collection
-        unhandled_states = list(state_collection.values())
         next_states = {}
-        partial_next_state_collection = StateCollection(next_states)
+        step_times = {}
+        for level in self.schedule(state_collection):
+            partial_next_state_collection = StateCollection(next_states)
+            states = [state_collection[name] for name in level]
+            if self.max_workers > 1 and len(states) > 1:
+                executor = self._get_executor()
+                results = list(executor.map(lambda state: self._timed_substep(state, state_collection, dt, partial_next_state_collection), states))
+            else:
+                results = [self._timed_substep(state, state_collection, dt, partial_next_state_collection) for state in states]
+            for state, (next_state, step_time) in zip(states, results):
+                physics = self.for_(state)
+                assert next_state is not None, "step() called on %s returned None for state '%s'" % (type(physics).__name__, state)
+                assert isinstance(next_state, State), "step() called on %s dit not return a State but '%s' for state '%s'" % (type(physics).__name__, next_state, state)
+                assert next_state.name == state.name, "The state name must remain constant during step(). Caused by '%s' on state '%s'." % (type(physics).__name__, state)
+                next_states[next_state.name] = next_state
+                step_times[next_state.name] = step_time
+        self.step_times = step_times
+        return StateCollection([next_states[name] for name in state_collection])
 
-        for sweep in range(len(state_collection)):
-            for state in tuple(unhandled_states):
+    def schedule(self, state_collection):
+        """
+        Computes the order in which the states of `state_collection` are stepped.
+
+        The result is cached for subsequent calls with states of the same names, tags and blocking dependencies.
+
+        Args:
+          state_collection: `StateCollection`
+
+        Returns:
+          `tuple` of levels, each a `tuple` of state names.
+            The states of one level only have blocking dependencies on states of previous levels.
+        """
+        dependencies = {name: tuple(self.for_(state).blocking_dependencies) for name, state in state_collection.items()}
+        key = tuple((name, state.tags, tuple((d.tag, d.state_name) for d in dependencies[name])) for name, state in state_collection.items())
+        if key != self._schedule_key:
+            self._schedule = self._build_schedule(state_collection, dependencies)
+            self._schedule_key = key
+        return self._schedule
+
+    def _build_schedule(self, state_collection, dependencies):
+        names_by_tag = {}
+        for name, state in state_collection.items():
+            for tag in state.tags:
+                names_by_tag.setdefault(tag, []).append(name)
+        required = {}  # name -> names of states that must be stepped before
+        for name, state_dependencies in dependencies.items():
+            required[name] = set()
+            for dependency in state_dependencies:
+                if dependency.state_name is not None:
+                    required[name].add(dependency.state_name)
+                else:
+                    required[name].update(names_by_tag.get(dependency.tag, ()))
+        dependents = {name: [] for name in state_collection}
+        for name, names in required.items():
+            for required_name in names:
+                dependents[required_name].append(name)
+        remaining = {name: len(names) for name, names in required.items()}
+        level = [name for name in state_collection if remaining[name] == 0]
+        levels = []
+        while level:
+            levels.append(tuple(level))
+            next_level = []
+            for name in level:
+                for dependent in dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+        if sum(len(level) for level in levels) < len(state_collection):
+            unhandled_states = [state for name, state in state_collection.items() if remaining[name] > 0]
+            errstr = 'Cyclic blocking_dependencies in simulation: %s' % unhandled_states
+            for state in unhandled_states:
                 physics = self.for_(state)
-                if self._all_dependencies_fulfilled(physics.blocking_dependencies, state_collection, partial_next_state_collection):
-                    next_state = self.substep(state, state_collection, dt, partial_next_state_collection=partial_next_state_collection)
-                    assert next_state is not None, "step() called on %s returned None for state '%s'" % (type(physics).__name__, state)
-                    assert isinstance(next_state, State), "step() called on %s dit not return a State but '%s' for state '%s'" % (type(physics).__name__, next_state, state)
-                    assert next_state.name == state.name, "The state name must remain constant during step(). Caused by '%s' on state '%s'." % (type(physics).__name__, state)
-                    next_states[next_state.name] = next_state
-                    unhandled_states.remove(state)
-            partial_next_state_collection = StateCollection(next_states)
-            if len(unhandled_states) == 0:
-                ordered_states = [partial_next_state_collection[state] for state in state_collection]
-                return StateCollection(ordered_states)
-
-        # Error
-        errstr = 'Cyclic blocking_dependencies in simulation: %s' % unhandled_states
-        for state in tuple(unhandled_states):
-            physics = self.for_(state)
-            state_dict = self._gather_dependencies(physics.blocking_dependencies, state_collection, {})
-            errstr += '\nState "%s" with physics "%s" depends on %s' % (state, physics, state_dict)
-        raise AssertionError(errstr)
+                state_dict = self._gather_dependencies(physics.blocking_dependencies, state_collection, {})
+                errstr += '\nState "%s" with physics "%s" depends on %s' % (state, physics, state_dict)
+            raise AssertionError(errstr)
+        return tuple(levels)
+
+    def _timed_substep(self, state, state_collection, dt, partial_next_state_collection):
+        t = time.perf_counter()
+        next_state = self.substep(state, state_collection, dt, partial_next_state_collection=partial_next_state_collection)
+        return next_state, time.perf_counter() - t
+
+    def _get_executor(self):
+        if self._executor is None or self._executor_workers != self.max_workers:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._executor_workers = self.max_workers
+        return self._executor
 
     def substep(self, state, state_collection, dt, override_physics=None, partial_next_state_collection=None):
         physics = self.for_(state) if override_physics is None else override_physics
@@ -523,18 +608,6 @@ class CollectivePhysics(Physics):
             result_dict[statedependency.parameter_name] = value
         return result_dict
 
-    def _all_dependencies_fulfilled(self, dependencies, all_states, computed_states):
-        state_dict = self._gather_dependencies(dependencies, all_states, {})
-        for name, states in state_dict.items():
-            if isinstance(states, tuple):
-                for state in states:
-                    if state.name not in computed_states:
-                        return False
-            else:  # single state
-                if states.name not in computed_states:
-                    return False
-        return True
-
     def for_(self, state):
         return self.physics[state.name] if state.name in self.physics else state.default_physics()
 
@@ -69,7 +69,7 @@ def points(field: PointCloud, velocity: Field, dt: float, integrator=euler):
     Each point moves by an amount equal to the local velocity times `dt`.
 
     Args:
-        field: point cloud to be advected
+        field: point cloud to be advected. Inactive points, see `phi.field.PointCloud.active`, are not moved.
         velocity: velocity sampled at the same points as the point cloud
         dt: Euler step time increment
         integrator: ODE integrator for solving the movement.
@@ -78,7 +78,14 @@ def points(field: PointCloud, velocity: Field, dt: float, integrator=euler):
         Advected point cloud
     """
     new_elements = integrator(field.elements, velocity, dt)
-    return field.with_elements(new_elements)
+    return _with_active_moved(field, new_elements)
+
+
+def _with_active_moved(cloud: PointCloud, new_elements: Geometry) -> PointCloud:
+    """ Replaces the elements of `cloud`, keeping inactive points at their previous positions. """
+    if isinstance(cloud, PointCloud) and cloud.active is not None:
+        new_elements = cloud.elements.shifted(math.where(cloud.active, new_elements.center - cloud.elements.center, 0))
+    return cloud.with_elements(new_elements)
 
 
 def semi_lagrangian(field: GridType,
@@ -201,4 +208,4 @@ def runge_kutta_4(cloud: SampledField, velocity: Field, dt: float, accessible: F
     # --- Combine points with RK4 scheme ---
     vel = (1/6.) * (vel_k1 + 2 * (vel_k2 + vel_k3) + vel_k4)
     new_points = points.shifted(dt * vel)
-    return cloud.with_elements(new_points)
+    return _with_active_moved(cloud, new_points)
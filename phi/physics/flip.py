@@ -22,7 +22,8 @@ def make_incompressible(velocity: StaggeredGrid,
         domain: Domain object
         particles: `PointCloud` holding the current positions of the particles
         obstacles: Sequence of `phi.physics.Obstacle` objects or binary StaggeredGrid marking through-flow cell faces
-        solve: Parameters for the pressure solve_linear
+        solve: Parameters for the pressure solve_linear.
+            Pass a `phi.math.SolverContext` to start each solve from the pressure of the previous call.
 
     Returns:
       velocity: divergence-free velocity of type `type(velocity)`
@@ -107,7 +108,7 @@ def map_velocity_to_particles(previous_particle_velocity: PointCloud,
     return previous_particle_velocity.with_values(velocities)
 
 
-def respect_boundaries(particles: PointCloud, domain: Domain, not_accessible: list, offset: float = 0.5) -> PointCloud:
+def respect_boundaries(particles: PointCloud, domain: Domain, not_accessible: list, offset: float = 0.5, sort: bool = False) -> PointCloud:
     """
     Enforces boundary conditions by correcting possible errors of the advection step and shifting particles out of 
     obstacles or back into the domain.
@@ -117,6 +118,8 @@ def respect_boundaries(particles: PointCloud, domain: Domain, not_accessible: li
         domain: Domain for which any particles outside should get shifted inwards
         not_accessible: List of Obstacle or Geometry objects where any particles inside should get shifted outwards
         offset: Minimum distance between particles and domain boundary / obstacle surface after particles have been shifted.
+        sort: Whether to reorder the particles by the grid cells of `domain`, see `PointCloud.sorted_by_cell()`.
+            Sorting every few steps keeps the following grid transfers cache-friendly.
 
     Returns:
         PointCloud where all particles are inside the domain / outside of obstacles.
@@ -127,4 +130,5 @@ def respect_boundaries(particles: PointCloud, domain: Domain, not_accessible: li
             obj = obj.geometry
         new_positions = obj.push(new_positions, shift_amount=offset)
     new_positions = (~domain.bounds).push(new_positions, shift_amount=offset)
-    return particles.with_elements(Sphere(new_positions, math.mean(particles.bounds.size) * 0.005))
+    particles = particles.with_elements(Sphere(new_positions, math.mean(particles.bounds.size) * 0.005))
+    return particles.sorted_by_cell(domain.bounds, domain.resolution) if sort else particles
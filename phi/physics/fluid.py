@@ -4,8 +4,8 @@ Definition of Fluid, IncompressibleFlow as well as fluid-related functions.
 from typing import Tuple
 
 from phi import math, field
-from phi.field import SoftGeometryMask, AngularVelocity, Grid, divergence, spatial_gradient, where, HardGeometryMask, CenteredGrid
-from phi.geom import union
+from phi.field import SoftGeometryMask, AngularVelocity, Grid, divergence, spatial_gradient, where, HardGeometryMask, CenteredGrid, AMRGrid
+from phi.geom._box import cached_grid_geometry
 from ..math import extrapolation
 from ..math._tensors import copy_with
 from ..math.extrapolation import combine_sides
@@ -19,19 +19,29 @@ def make_incompressible(velocity: Grid,
     
     This method is similar to :func:`field.divergence_free()` but differs in how the boundary conditions are specified.
 
+    For an `AMRGrid` velocity, the composite pressure equation is solved on all levels at once.
+    Obstacles are not supported in this case.
+
     Args:
         velocity: Vector field sampled on a grid
         obstacles: List of Obstacles to specify boundary conditions inside the domain (Default value = ())
-        solve: Parameters for the pressure solve as.
+        solve: Parameters for the pressure solve as `phi.math.Solve`.
+            Pass a `phi.math.SolverContext` to start each solve from the pressure of the previous call.
 
     Returns:
         velocity: divergence-free velocity of type `type(velocity)`
-        pressure: solved pressure field, `CenteredGrid`
+        pressure: solved pressure field, `CenteredGrid` or `AMRGrid`
     """
     assert isinstance(obstacles, (tuple, list)), f"obstacles must be a tuple or list but got {type(obstacles)}"
+    if isinstance(velocity, AMRGrid):
+        assert not obstacles, "Obstacles are not supported for AMR grids"
+        return _make_incompressible_amr(velocity, solve)
     input_velocity = velocity
     accessible_extrapolation = _accessible_extrapolation(input_velocity.extrapolation)
-    active = CenteredGrid(HardGeometryMask(~union(*[obstacle.geometry for obstacle in obstacles])), resolution=velocity.resolution, bounds=velocity.bounds, extrapolation=extrapolation.NONE)
+    active = CenteredGrid(1, resolution=velocity.resolution, bounds=velocity.bounds, extrapolation=extrapolation.NONE)
+    for obstacle in obstacles:
+        active = active - _obstacle_mask(obstacle, active, soft=False)
+    active = active.with_values(math.maximum(active.values, 0))
     accessible = active.with_extrapolation(accessible_extrapolation)
     hard_bcs = field.stagger(accessible, math.minimum, input_velocity.extrapolation, type=type(velocity))
     velocity = apply_boundary_conditions(velocity, obstacles)
@@ -65,6 +75,28 @@ def masked_laplace(pressure: CenteredGrid, hard_bcs: Grid, active: CenteredGrid)
     return lap
 
 
+def _make_incompressible_amr(velocity: AMRGrid, solve: math.Solve) -> Tuple[AMRGrid, AMRGrid]:
+    """
+    Composite projection. Covered cells are excluded from the solve and obtain their pressure by averaging down.
+    The pressure gradient is evaluated with zero ghost values at the domain boundary.
+    This makes the volume-weighted composite operator symmetric and the projected velocity divergence-free with respect to `divergence()`.
+    """
+    assert isinstance(velocity.extrapolation, math.extrapolation.ConstantExtrapolation), f"AMR projection requires a constant velocity extrapolation but got {velocity.extrapolation}"
+    div = divergence(velocity)
+    if solve.x0 is None:
+        solve = copy_with(solve, x0=div.with_values(math.zeros_like(div.values)).with_extrapolation(math.extrapolation.ZERO))
+    weights = velocity.cell_volumes * math.to_float(~velocity.covered)
+    pressure = math.solve_linear(_composite_laplace, y=div.with_values(div.values * weights), solve=solve)
+    pressure = pressure.average_down()
+    velocity = velocity - spatial_gradient(pressure)
+    return velocity, pressure
+
+
+def _composite_laplace(pressure: AMRGrid):
+    """ Divergence of the pressure gradient multiplied by the cell volumes. This operator is symmetric and its rows and columns of covered cells are zero. """
+    return pressure._gradient(math.channel('vector'), average_down=False)._divergence(volume_weighted=True)
+
+
 def _balance_divergence(div, active):
     return div - active * (field.mean(div) / field.mean(active))
 
@@ -84,7 +116,7 @@ def apply_boundary_conditions(velocity: Grid, obstacles: tuple or list):
     """
     # velocity = field.bake_extrapolation(velocity)  # TODO we should bake only for divergence but keep correct extrapolation for velocity. However, obstacles should override extrapolation.
     for obstacle in obstacles:
-        obs_mask = SoftGeometryMask(obstacle.geometry, balance=1) >> velocity
+        obs_mask = _obstacle_mask(obstacle, velocity, soft=True)
         if obstacle.is_stationary:
             velocity = (1 - obs_mask) * velocity
         else:
@@ -93,6 +125,28 @@ def apply_boundary_conditions(velocity: Grid, obstacles: tuple or list):
     return velocity
 
 
+def _obstacle_mask(obstacle, like: Grid, soft: bool) -> Grid:
+    """
+    Samples the geometry of `obstacle` at the sample points of `like`.
+    Only cells near the obstacle are evaluated, see `HardGeometryMask`.
+    Masks of stationary obstacles are cached as long as the same geometry object is used, moving obstacles are re-sampled within their current bounding box.
+
+    Args:
+        obstacle: `Obstacle` to rasterize.
+        like: Grid defining the sample points.
+        soft: If `True`, samples a `SoftGeometryMask` with `balance=1`, else a `HardGeometryMask`.
+
+    Returns:
+        Mask of same type as `like`.
+    """
+    mask = SoftGeometryMask(obstacle.geometry, balance=1) if soft else HardGeometryMask(obstacle.geometry)
+    if not obstacle.is_stationary:
+        return mask >> like
+    # the cache entry holds a reference to the geometry, so its id cannot be reused while the entry exists
+    _, values = cached_grid_geometry('obstacle_mask', like.resolution, like.bounds, lambda: (obstacle.geometry, (mask >> like).values), id(obstacle.geometry), soft, type(like), like.extrapolation)
+    return like.with_values(values)
+
+
 def _pressure_extrapolation(vext: math.Extrapolation):
     if vext == extrapolation.PERIODIC:
         return extrapolation.PERIODIC
@@ -0,0 +1,185 @@
+"""
+Exponential time integrators for stiff problems on periodic grids.
+
+The PDE is split into a linear part *L*, which is diagonal in Fourier space and solved exactly, and a non-linear remainder *N*,
+
+    du/dt = L u + N(u)
+
+This allows much larger time steps than explicit schemes when *L* is stiff, e.g. for (hyper-)diffusion.
+
+Examples:
+
+* etdrk4 (exponential time differencing, 4th order)
+* if_rk4 (integrating-factor Runge-Kutta, 4th order)
+"""
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from phi import math
+from phi.field import Grid
+from phi.math import Tensor
+
+
+def wavenumbers(grid: Grid) -> Tensor:
+    """
+    Angular wave numbers *k* of the Fourier modes of `grid`, measured in physical units.
+
+    Args:
+        grid: Periodic `Grid`.
+
+    Returns:
+        Real `Tensor` with the spatial dimensions of `grid` and a `vector` dimension.
+    """
+    return 2 * math.PI * math.fftfreq(grid.resolution, grid.dx)
+
+
+def laplace_symbol(grid: Grid, order: int = 1) -> Tensor:
+    """
+    Fourier symbol of the Laplace operator raised to the power `order`, i.e. *(-|k|²)<sup>order</sup>*.
+
+    Multiply with a coefficient to obtain the linear part of (hyper-)diffusion, e.g. `nu * laplace_symbol(grid, 3)` for `nu * Δ³ u`.
+
+    Args:
+        grid: Periodic `Grid`.
+        order: Power of the Laplace operator.
+
+    Returns:
+        Real `Tensor` with the spatial dimensions of `grid`.
+    """
+    return (-math.vec_squared(wavenumbers(grid))) ** order
+
+
+def etdrk4(state: Grid or tuple,
+           dt: float,
+           linear: Tensor or float or tuple,
+           nonlinear: Callable,
+           contour_points: int = 32) -> Grid or tuple:
+    """
+    Advances `state` by `dt` using the fourth-order exponential time differencing Runge-Kutta scheme (ETDRK4) of Cox and Matthews.
+
+    The linear part is integrated exactly in Fourier space.
+    The ETDRK4 coefficients are evaluated using the contour integral method of Kassam and Trefethen which is stable for small and large *L dt*.
+    They are cached for the last used pairs of `linear` and `dt`, so repeated steps only cost four evaluations of `nonlinear` and the FFTs.
+
+    Args:
+        state: Periodic `Grid` or tuple/list of periodic grids with the same resolution.
+        dt: Time increment.
+        linear: Fourier symbol of the linear operator *L* as `Tensor` with the spatial dimensions of the grids, e.g. created using `laplace_symbol()`.
+            Pass a tuple to use a different operator for each grid in `state`.
+        nonlinear: Function `nonlinear(state)` computing the time derivative *N(u)* without the linear part.
+            Takes and returns the same structure as `state`.
+        contour_points: Number of points on the complex contour used to evaluate the coefficients.
+
+    Returns:
+        `state` at time `t + dt`.
+    """
+    coefficients = [_etdrk4_coefficients(l, dt, contour_points) for l in _per_grid(linear, state)]
+    u = _spectrum(state)
+    nu = _spectrum(nonlinear(state))
+    a = [e2 * u_ + q * n_ for (e, e2, q, f1, f2, f3), u_, n_ in zip(coefficients, u, nu)]
+    na = _spectrum(nonlinear(_to_grids(a, state)))
+    b = [e2 * u_ + q * n_ for (e, e2, q, f1, f2, f3), u_, n_ in zip(coefficients, u, na)]
+    nb = _spectrum(nonlinear(_to_grids(b, state)))
+    c = [e2 * a_ + q * (2 * nb_ - nu_) for (e, e2, q, f1, f2, f3), a_, nb_, nu_ in zip(coefficients, a, nb, nu)]
+    nc = _spectrum(nonlinear(_to_grids(c, state)))
+    result = [e * u_ + f1 * nu_ + 2 * f2 * (na_ + nb_) + f3 * nc_ for (e, e2, q, f1, f2, f3), u_, nu_, na_, nb_, nc_ in zip(coefficients, u, nu, na, nb, nc)]
+    return _to_grids(result, state)
+
+
+def if_rk4(state: Grid or tuple,
+           dt: float,
+           linear: Tensor or float or tuple,
+           nonlinear: Callable) -> Grid or tuple:
+    """
+    Advances `state` by `dt` using the classical Runge-Kutta scheme applied to the integrating-factor transformed equation.
+
+    The linear part is integrated exactly in Fourier space.
+    Compared to `etdrk4()`, this scheme is cheaper to set up but less accurate when the non-linear part varies on time scales similar to the linear part.
+
+    Args:
+        state: Periodic `Grid` or tuple/list of periodic grids with the same resolution.
+        dt: Time increment.
+        linear: Fourier symbol of the linear operator *L* as `Tensor` with the spatial dimensions of the grids, e.g. created using `laplace_symbol()`.
+            Pass a tuple to use a different operator for each grid in `state`.
+        nonlinear: Function `nonlinear(state)` computing the time derivative *N(u)* without the linear part.
+            Takes and returns the same structure as `state`.
+
+    Returns:
+        `state` at time `t + dt`.
+    """
+    factors = [(math.exp(l * dt), math.exp(l * dt / 2)) for l in _per_grid(linear, state)]
+    u = _spectrum(state)
+    k1 = _spectrum(nonlinear(state))
+    a = [e2 * (u_ + dt / 2 * k_) for (e, e2), u_, k_ in zip(factors, u, k1)]
+    k2 = _spectrum(nonlinear(_to_grids(a, state)))
+    b = [e2 * u_ + dt / 2 * k_ for (e, e2), u_, k_ in zip(factors, u, k2)]
+    k3 = _spectrum(nonlinear(_to_grids(b, state)))
+    c = [e * u_ + dt * e2 * k_ for (e, e2), u_, k_ in zip(factors, u, k3)]
+    k4 = _spectrum(nonlinear(_to_grids(c, state)))
+    result = [e * u_ + dt / 6 * (e * k1_ + 2 * e2 * (k2_ + k3_) + k4_) for (e, e2), u_, k1_, k2_, k3_, k4_ in zip(factors, u, k1, k2, k3, k4)]
+    return _to_grids(result, state)
+
+
+def _grids(state: Grid or tuple) -> tuple:
+    grids = tuple(state) if isinstance(state, (tuple, list)) else (state,)
+    for grid in grids:
+        assert isinstance(grid, Grid), f"Spectral time integration requires grids but got {type(grid)}"
+        assert grid.extrapolation == math.extrapolation.PERIODIC, "Spectral time integration can only be applied to periodic grids."
+    return grids
+
+
+def _per_grid(linear, state: Grid or tuple) -> tuple:
+    count = len(_grids(state))
+    if isinstance(linear, (tuple, list)):
+        assert len(linear) == count, f"Got {len(linear)} linear operators for {count} grids"
+        return tuple(linear)
+    return (linear,) * count
+
+
+def _spectrum(state: Grid or tuple) -> list:
+    return [math.fft(grid.values) for grid in _grids(state)]
+
+
+def _to_grids(spectra: list, like: Grid or tuple) -> Grid or tuple:
+    grids = [grid.with_values(math.real(math.ifft(k))) for grid, k in zip(_grids(like), spectra)]
+    if isinstance(like, (tuple, list)):
+        return type(like)(grids)
+    return grids[0]
+
+
+COEFFICIENT_CACHE_SIZE = 16
+_COEFFICIENT_CACHE = OrderedDict()  # (id(linear), dt, contour_points) -> (linear, coefficients)
+
+
+def _etdrk4_coefficients(linear: Tensor or float, dt: float, contour_points: int) -> tuple:
+    """
+    Returns `(E, E2, Q, f1, f2, f3)` as defined by Kassam and Trefethen.
+    Coefficients for concrete values of `linear` and `dt` are cached.
+    """
+    cacheable = isinstance(dt, (int, float)) and (not isinstance(linear, Tensor) or math.all_available(linear))
+    key = (id(linear), dt, contour_points)
+    if cacheable and key in _COEFFICIENT_CACHE and _COEFFICIENT_CACHE[key][0] is linear:
+        _COEFFICIENT_CACHE.move_to_end(key)
+        return _COEFFICIENT_CACHE[key][1]
+    lh = math.wrap(linear) * dt
+    roots = math.wrap(np.exp(1j * np.pi * (np.arange(1, contour_points + 1) - 0.5) / contour_points), math.batch('_contour'))
+    lr = lh + roots  # points on circles around each eigenvalue, avoiding cancellation errors for small |L dt|
+
+    def contour_mean(x):
+        return math.real(math.mean(x, '_contour'))
+
+    coefficients = (
+        math.exp(lh),
+        math.exp(lh / 2),
+        dt * contour_mean((math.exp(lr / 2) - 1) / lr),
+        dt * contour_mean((-4 - lr + math.exp(lr) * (4 - 3 * lr + lr ** 2)) / lr ** 3),
+        dt * contour_mean((2 + lr + math.exp(lr) * (-2 + lr)) / lr ** 3),
+        dt * contour_mean((-4 - 3 * lr - lr ** 2 + math.exp(lr) * (4 - lr)) / lr ** 3),
+    )
+    if cacheable:
+        _COEFFICIENT_CACHE[key] = (linear, coefficients)
+        while len(_COEFFICIENT_CACHE) > COEFFICIENT_CACHE_SIZE:
+            _COEFFICIENT_CACHE.popitem(last=False)
+    return coefficients
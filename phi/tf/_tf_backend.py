@@ -263,15 +263,16 @@ class TFBackend(Backend):
     def exp(self, x):
         return tf.exp(x)
 
-    def conv(self, value, kernel, zero_padding=True):
+    def conv(self, value, kernel, zero_padding=True, strides=1):
         value = self.to_float(value)
         kernel = self.to_float(kernel)  # should use auto_cast but TensorFlow only supports DT_HALF, DT_BFLOAT16, DT_FLOAT, DT_DOUBLE, DT_INT32
         if zero_padding:
             value_padding = [[0, 0]] * 2 + [[s // 2, (s - 1) // 2] for s in kernel.shape[3:]]
             value = tf.pad(value, value_padding)
-        convf = {3: partial(tf.nn.conv1d, stride=1),
-                 4: partial(tf.nn.conv2d, strides=[1, 1, 1, 1]),
-                 5: partial(tf.nn.conv3d, strides=[1, 1, 1, 1, 1])}[len(value.shape)]
+        strides = [strides] * (len(value.shape) - 2) if isinstance(strides, int) else list(strides)
+        convf = {3: partial(tf.nn.conv1d, stride=strides[0]),
+                 4: partial(tf.nn.conv2d, strides=[1, *strides, 1]),
+                 5: partial(tf.nn.conv3d, strides=[1, *strides, 1])}[len(value.shape)]
         value = tf.transpose(value, [0, *range(2, self.ndims(value)), 1])  # could use data_format='NC...' but it's supported neither on CPU and for int tensors
         kernel = tf.transpose(kernel, [0, *range(3, self.ndims(kernel)), 2, 1])
         if kernel.shape[0] == 1:
@@ -332,10 +333,12 @@ class TFBackend(Backend):
         return tf.reduce_all(boolean_tensor, axis=axis, keepdims=keepdims)
 
     def scatter(self, base_grid, indices, values, mode: str):
+        if mode == 'mean':
+            return Backend.scatter(self, base_grid, indices, values, mode)
         base_grid, values = self.auto_cast(base_grid, values)
         indices = self.as_tensor(indices)
         batch_size = combined_dim(combined_dim(indices.shape[0], values.shape[0]), base_grid.shape[0])
-        scatter = tf.tensor_scatter_nd_add if mode == 'add' else tf.tensor_scatter_nd_update
+        scatter = {'add': tf.tensor_scatter_nd_add, 'update': tf.tensor_scatter_nd_update, 'max': tf.tensor_scatter_nd_max, 'min': tf.tensor_scatter_nd_min}[mode]
         result = []
         for b in range(batch_size):
             b_grid = base_grid[b, ...]
@@ -369,6 +372,29 @@ class TFBackend(Backend):
         else:
             raise NotImplementedError('n-dimensional inverse FFT not implemented.')
 
+    def rfft(self, x):
+        rank = len(x.shape) - 2
+        assert rank >= 1
+        if rank == 1:
+            return tf.stack([tf.signal.rfft(c) for c in tf.unstack(x, axis=-1)], axis=-1)
+        elif rank == 2:
+            return tf.stack([tf.signal.rfft2d(c) for c in tf.unstack(x, axis=-1)], axis=-1)
+        elif rank == 3:
+            return tf.stack([tf.signal.rfft3d(c) for c in tf.unstack(x, axis=-1)], axis=-1)
+        else:
+            raise NotImplementedError('n-dimensional real FFT not implemented.')
+
+    def irfft(self, k, resolution: tuple):
+        rank = len(resolution)
+        if rank == 1:
+            return tf.stack([tf.signal.irfft(c, fft_length=resolution) for c in tf.unstack(k, axis=-1)], axis=-1)
+        elif rank == 2:
+            return tf.stack([tf.signal.irfft2d(c, fft_length=resolution) for c in tf.unstack(k, axis=-1)], axis=-1)
+        elif rank == 3:
+            return tf.stack([tf.signal.irfft3d(c, fft_length=resolution) for c in tf.unstack(k, axis=-1)], axis=-1)
+        else:
+            raise NotImplementedError('n-dimensional inverse real FFT not implemented.')
+
     def imag(self, complex):
         return tf.math.imag(complex)
 
@@ -91,6 +91,11 @@ class TorchBackend(Backend):
         else:
             return tensor.cpu().numpy()
 
+    def host_buffer(self, shape: tuple, dtype: DType) -> np.ndarray:
+        if self.get_default_device().device_type == 'GPU':
+            return torch.empty(shape, dtype=to_torch_dtype(dtype), pin_memory=True).numpy()
+        return Backend.host_buffer(self, shape, dtype)
+
     def to_dlpack(self, tensor):
         from torch.utils import dlpack
         return dlpack.to_dlpack(tensor)
@@ -122,6 +127,15 @@ class TorchBackend(Backend):
     flip = torch.flip
     seed = staticmethod(torch.manual_seed)
 
+    def get_random_state(self):
+        return torch.get_rng_state(), torch.cuda.get_rng_state_all() if torch.cuda.is_available() else None
+
+    def set_random_state(self, state):
+        cpu_state, cuda_states = state
+        torch.set_rng_state(cpu_state)
+        if cuda_states is not None and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all(cuda_states)
+
     def jit_compile(self, f: Callable) -> Callable:
         return JITFunction(f)
 
@@ -430,7 +444,7 @@ class TorchBackend(Backend):
         else:
             return self.maximum(minimum, self.minimum(x, maximum))
 
-    def conv(self, value, kernel, zero_padding=True):
+    def conv(self, value, kernel, zero_padding=True, strides=1):
         value = self.as_tensor(value)
         kernel = self.as_tensor(kernel)
         value, kernel = self.auto_cast(value, kernel)
@@ -445,11 +459,11 @@ class TorchBackend(Backend):
             padding = 0
         convf = {3: torchf.conv1d, 4: torchf.conv2d, 5: torchf.conv3d}[len(value.shape)]
         if kernel.shape[0] == 1:
-            result = convf(value, kernel[0, ...], padding=padding)
+            result = convf(value, kernel[0, ...], padding=padding, stride=strides)
         else:
             result = []
             for b in range(kernel.shape[0]):
-                result.append(convf(value[b:b+1, ...], kernel[b, ...], padding=padding))
+                result.append(convf(value[b:b+1, ...], kernel[b, ...], padding=padding, stride=strides))
             result = torch.cat(result, 0)
         return result
 
@@ -500,6 +514,8 @@ class TorchBackend(Backend):
         # return torch.masked_select(x_, mask_)
 
     def scatter(self, base_grid, indices, values, mode: str):
+        if mode == 'mean':
+            return Backend.scatter(self, base_grid, indices, values, mode)
         base_grid, values = self.auto_cast(base_grid, values)
         indices = self.as_tensor(indices)
         batch_size = combined_dim(combined_dim(indices.shape[0], values.shape[0]), base_grid.shape[0])
@@ -517,7 +533,10 @@ class TorchBackend(Backend):
             indices = torch.sum(indices * ravel, dim=-1, keepdim=True)
         base_grid_flat = torch.reshape(base_grid, [base_grid.shape[0], -1, base_grid.shape[-1]])
         indices = indices.long().repeat([1, 1, values.shape[-1]])
-        result = scatter(base_grid_flat, dim=1, index=indices, src=values)
+        if mode in ('max', 'min'):
+            result = torch.scatter_reduce(base_grid_flat, dim=1, index=indices, src=values, reduce='a' + mode)
+        else:
+            result = scatter(base_grid_flat, dim=1, index=indices, src=values)
         return torch.reshape(result, base_grid.shape)
 
     def fft(self, x):
@@ -544,6 +563,12 @@ class TorchBackend(Backend):
             k = torch.fft.ifft(k, dim=i)
         return k
 
+    def rfft(self, x):
+        return torch.fft.rfftn(x, dim=tuple(range(1, len(x.shape) - 1)))
+
+    def irfft(self, k, resolution: tuple):
+        return torch.fft.irfftn(k, s=tuple(resolution), dim=tuple(range(1, len(resolution) + 1)))
+
     def imag(self, x):
         dtype = self.dtype(x)
         if dtype.kind == complex:
@@ -8,8 +8,8 @@ Use `plot()` to plot fields using Matplotlib.
 See the user interface documentation at https://tum-pbs.github.io/PhiFlow/Visualization.html
 """
 from ._viewer import Viewer
-from ._matplotlib import plot, animate, plot_scalars, savefig
 from ._vis import view, control, show
+from ._matplotlib import plot, animate, plot_scalars, savefig  # matplotlib is only imported once these functions are called
 
 __all__ = [key for key in globals().keys() if not key.startswith('_')]
 
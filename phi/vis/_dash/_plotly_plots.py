@@ -51,9 +51,13 @@ def _plot(field: SampledField,
             zmin = 0
         if not numpy.isfinite(zmax):
             zmax = 0
+        fx, fy = -(-len(x) // size[0]), -(-len(y) // size[1])  # at most one cell per pixel
+        if fx > 1 or fy > 1:
+            values = block_mean(values, (fy, fx))
+            x, y = block_mean(x, (fx,)), block_mean(y, (fy,))
         color_scale = get_div_map(zmin, zmax, equal_scale=True, colormap=colormap)
         # color_bar = graph_objects.heatmap.ColorBar(x=1.15)   , colorbar=color_bar
-        fig.add_heatmap(row=row, col=col, x=x, y=y, z=values, zauto=False, zmin=zmin, zmax=zmax, colorscale=color_scale, showscale=show_color_bar)
+        fig.add_heatmap(row=row, col=col, x=x, y=y, z=values.astype(numpy.float32), zauto=False, zmin=zmin, zmax=zmax, colorscale=color_scale, showscale=show_color_bar)
         fig.update_xaxes(scaleanchor='y', scaleratio=1, constrain='domain')
         fig.update_yaxes(constrain='domain')
     elif field.spatial_rank == 2 and isinstance(field, Grid):  # vector field
@@ -68,33 +72,38 @@ def _plot(field: SampledField,
         # result = figure_factory.create_quiver(x, y, data_x, data_y, scale=1.0)  # 7 points per arrow
         # result.update_xaxes(range=x_range)
         # result.update_yaxes(range=y_range)
-        y = y.flatten()
-        x = x.flatten()
-        data_y = data_y.flatten()
-        data_x = data_x.flatten()
-        lines_y = numpy.stack([y, y + data_y, [None] * len(x)], -1).flatten()  # 3 points per arrow
-        lines_x = numpy.stack([x, x + data_x, [None] * len(x)], -1).flatten()
+        sx = -(-x.shape[0] // max(1, size[0] // MIN_ARROW_SPACING))
+        sy = -(-x.shape[1] // max(1, size[1] // MIN_ARROW_SPACING))
+        x, y, data_x, data_y = [a[::sx, ::sy].flatten() for a in (x, y, data_x, data_y)]
+        gaps = numpy.full(len(x), numpy.nan)
+        lines_y = numpy.stack([y, y + data_y, gaps], -1).flatten().astype(numpy.float32)  # 3 points per arrow, NaN separates arrows
+        lines_x = numpy.stack([x, x + data_x, gaps], -1).flatten().astype(numpy.float32)
         fig.add_scatter(x=lines_x, y=lines_y, mode='lines', row=row, col=col)
         fig.update_xaxes(range=x_range)
         fig.update_yaxes(range=y_range)
         fig.update_layout(showlegend=False)
     elif field.spatial_rank == 2 and isinstance(field, PointCloud):
         x, y = [d.numpy() for d in field.points.vector.unstack_spatial('x,y')]
-        color = [str(d) for d in field.color.points.unstack(len(x))]
         if field.bounds:
             lower_x, lower_y = [float(d) for d in field.bounds.lower.vector.unstack_spatial('x,y')]
             upper_x, upper_y = [float(d) for d in field.bounds.upper.vector.unstack_spatial('x,y')]
         else:
             lower_x, lower_y = [numpy.min(x), numpy.min(y)]
             upper_x, upper_y = [numpy.max(x), numpy.max(y)]
+        stride = -(-len(x) // max(1, size[0] * size[1] // PIXELS_PER_POINT))
+        color = field.color
+        if color.shape.volume == 1 or (color.shape.rank == 1 and numpy.all(color.numpy() == color.numpy().flatten()[0])):
+            color = str(color.numpy().flatten()[0])
+        else:
+            color = [str(c) for c in color.numpy().flatten()[::stride]]
         radius = field.elements.bounding_radius() * size[1] / (upper_y - lower_y)
         radius = math.maximum(radius, 2)
         if radius.rank == 0:
             marker_size = 2 * float(radius)
         else:
-            marker_size = (2 * radius).unstack(radius.shape.collection.name)
+            marker_size = (2 * radius).numpy().flatten()[::stride]
         marker = graph_objects.scatter.Marker(size=marker_size, color=color, sizemode='diameter')
-        fig.add_scatter(mode='markers', x=x, y=y, marker=marker, row=row, col=col)
+        fig.add_scatter(mode='markers', x=x[::stride].astype(numpy.float32), y=y[::stride].astype(numpy.float32), marker=marker, row=row, col=col)
         fig.update_xaxes(range=[lower_x, upper_x])
         fig.update_yaxes(range=[lower_y, upper_y])
         fig.update_layout(showlegend=False)
@@ -102,6 +111,24 @@ def _plot(field: SampledField,
         raise NotImplementedError(f"No figure recipe for {field}")
 
 
+MIN_ARROW_SPACING = 8
+""" Minimum distance between two arrows of a vector field plot in pixels. Larger vector fields are plotted strided. """
+PIXELS_PER_POINT = 16
+""" Minimum number of pixels per plotted point of a `PointCloud`. Larger point clouds are subsampled. """
+
+
+def block_mean(values: numpy.ndarray, factors: tuple) -> numpy.ndarray:
+    """
+    Reduces the resolution of `values` by averaging blocks of size `factors`, ignoring NaN values.
+    If the size of a dimension is not divisible by its factor, the last block is smaller.
+    """
+    padded = numpy.pad(values.astype(numpy.float64), [(0, -size % f) for size, f in zip(values.shape, factors)], constant_values=numpy.nan)
+    blocks = padded.reshape(sum([(size // f, f) for size, f in zip(padded.shape, factors)], ()))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN blocks
+        return numpy.nanmean(blocks, axis=tuple(range(1, 2 * len(factors), 2)))
+
+
 def real_values(field: SampledField):
     return field.values if field.values.dtype.kind != complex else abs(field.values)
 
@@ -1,8 +1,9 @@
 import traceback
 
+import dash
 import dash_core_components as dcc
 import dash_html_components as html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
 from plotly import graph_objects
 
 from ._plotly_plots import plot
@@ -49,33 +50,41 @@ def build_viewer(app: DashApp, height: int, initial_field_name: str, id: str, vi
                 webglviewer.Webglviewer(id=id+'-webgl', sky=default_sky(), material_type='LIGHT_SMOKE', representation_type='DENSITY')
             ]
         else:
-            return dcc.Graph(figure={}, id=id + '-graph', style={'height': '100%'})
+            return [
+                dcc.Graph(figure={}, id=id + '-graph', style={'height': '100%'}),
+                dcc.Store(id=id + '-frame-key'),  # key of the frame displayed in this session, used to avoid re-sending unchanged figures
+            ]
 
-    @app.dash.callback(Output(id+'-graph', 'figure'), (Input(f'{id}-field-select', 'value'), STEP_COMPLETE, REFRESH_INTERVAL, *all_view_settings(app, viewer_group), *all_controls(app), *all_actions(app)))
+    @app.dash.callback([Output(id+'-graph', 'figure'), Output(id+'-frame-key', 'data')], (Input(f'{id}-field-select', 'value'), STEP_COMPLETE, REFRESH_INTERVAL, *all_view_settings(app, viewer_group), *all_controls(app), *all_actions(app)), [State(id+'-frame-key', 'data')])
     def update_figure(field, _0, _1, *settings):
+        *settings, last_key = settings
         if field is None or field == 'None':
             fig = graph_objects.Figure()
             fig.update_layout(title_text="None", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-            return fig
+            return fig, None
+        frame_key = [field, app.model.steps, app.model.revision, repr(settings)]
+        if last_key == frame_key:
+            return dash.no_update, dash.no_update
         selection = parse_view_settings(app, *settings)
         value = app.model.get_field(field, selection['select'])
         if not isinstance(value, SampledField):
             fig = graph_objects.Figure()
             fig.update_layout(title_text=f"{field} = {value}", paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-            return fig
+            return fig, None
         try:
             value = select_channel(value, selection.get('component', None))
         except ValueError as err:
             fig = graph_objects.Figure()
             fig.update_layout(title_text=str(err.args[0]), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-            return fig
+            return fig, None
         try:
-            return plot(value, size=(height, height), same_scale=False, colormap=app.config.get('colormap', None))
+            fig = plot(value, size=(height, height), same_scale=False, colormap=app.config.get('colormap', None))
+            return fig, frame_key
         except BaseException as err:
             traceback.print_exc()
             fig = graph_objects.Figure()
             fig.update_layout(title_text=repr(err), paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-            return fig
+            return fig, None
 
     @app.dash.callback(Output(id+'-webgl', 'data'), (Input(id+'-field-select', 'value'), Input(id+'-webgl-initializer', 'n_intervals'), STEP_COMPLETE, REFRESH_INTERVAL, *all_view_settings(app, viewer_group), *all_controls(app), *all_actions(app)))
     def update_webgl_data(field, _0, _1, _2, *settings):
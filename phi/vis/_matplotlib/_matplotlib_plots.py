@@ -2,10 +2,8 @@ import os
 from numbers import Number
 from typing import Callable
 
-import matplotlib.pyplot as plt
 import numpy
 import numpy as np
-from matplotlib import animation
 
 from phi import math
 from phi.geom import Sphere, BaseBox
@@ -36,6 +34,7 @@ def plot(field: SampledField, title=False, show_color_bar=True, size=(12, 5), sa
     Returns:
         [Matplotlib figure](https://matplotlib.org/stable/api/figure_api.html#matplotlib.figure.Figure).
     """
+    import matplotlib.pyplot as plt
     batch_size, b_values = _batch(field)
     fig, axes = plt.subplots(1, batch_size, figsize=size)
     axes = axes if isinstance(axes, np.ndarray) else [axes]
@@ -57,7 +56,7 @@ def plot(field: SampledField, title=False, show_color_bar=True, size=(12, 5), sa
 
 
 def animate(fields: SampledField, dim='frames',
-            show_color_bar=False, size=(8, 6), same_scale=True, repeat=True, interval=200, **plt_args) -> animation.Animation:
+            show_color_bar=False, size=(8, 6), same_scale=True, repeat=True, interval=200, **plt_args) -> 'matplotlib.animation.Animation':
     """
     Creates a Matplotlib animation from `fields`.
     `fields` may be a sequence of frames or a single `SampledField` instances with a `frames` dimension.
@@ -74,6 +73,8 @@ def animate(fields: SampledField, dim='frames',
     Returns:
         Matplotlib `Animation`
     """
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
     assert isinstance(fields, SampledField)
     assert dim in fields.shape, f"Animation dimension {dim} not present in data."
     fields = list(fields.unstack(dim))
@@ -94,6 +95,7 @@ def animate(fields: SampledField, dim='frames',
 
 
 def _plot(field, b_values, axes, batch_size, show_color_bar, same_scale, **plt_args):
+    import matplotlib.pyplot as plt
     if isinstance(field, Grid) and field.shape.channel.volume == 1:
         left, bottom = field.bounds.lower.vector.unstack_spatial('x,y')
         right, top = field.bounds.upper.vector.unstack_spatial('x,y')
@@ -173,6 +175,35 @@ def plot_scalars(scene: str or tuple or list or Scene or math.Tensor,
                  xlabel: str = None,
                  ylabel: str = None,
                  colors: math.Tensor = 'default'):
+    """
+    Plots the scalar curves logged by `Viewer.log_scalars()` in one or multiple scenes using Matplotlib.
+
+    Args:
+        scene: `Scene`, scene path or `Tensor` of scenes.
+        names: Names of the scalars to plot. Defaults to all logged scalars of the first scene.
+        reduce: Dimensions that are plotted into the same subplot. All other dimensions create separate subplots.
+        down: Dimensions along which subplots are arranged vertically.
+        smooth: Width of the uniform smoothing kernel. The smoothed curve is drawn on top of the raw curve.
+        smooth_alpha: Opacity of the raw curve if `smooth > 1`.
+        smooth_linewidth: Line width of the smoothed curve.
+        size: Figure (width, height) in inches.
+        transform: (Optional) Function mapping the stacked `(x, y)` data of each curve to the plotted `x, y`.
+        tight_layout: Whether to call `matplotlib.pyplot.tight_layout()`.
+        grid: Axes along which grid lines are drawn, e.g. `'y'` or `'xy'`.
+        log_scale: Axes using a logarithmic scale, e.g. `'y'` or `'xy'`.
+        legend: Location of the legend passed to Matplotlib or `None` to hide it.
+        xlim: (Optional) Limits of the x axis.
+        ylim: (Optional) Limits of the y axis.
+        titles: Whether to show subplot titles or a `str` to use as title of all subplots.
+        labels: (Optional) Curve labels for the legend.
+        xlabel: (Optional) Label of the x axis.
+        ylabel: (Optional) Label of the y axis.
+        colors: Curve colors or `'default'` to use the Matplotlib color cycle.
+
+    Returns:
+        [Matplotlib figure](https://matplotlib.org/stable/api/figure_api.html#matplotlib.figure.Figure).
+    """
+    import matplotlib.pyplot as plt
     scene = Scene.at(scene)
     additional_reduce = ()
     if names is None:
@@ -259,4 +290,12 @@ def plot_scalars(scene: str or tuple or list or Scene or math.Tensor,
 
 
 def savefig(filename: str, transparent=True):
+    """
+    Saves the current Matplotlib figure to `filename`.
+
+    Args:
+        filename: Path of the image file. The format is determined from the extension.
+        transparent: Whether the figure background is transparent.
+    """
+    import matplotlib.pyplot as plt
     plt.savefig(filename, transparent=transparent)
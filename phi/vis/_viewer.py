@@ -1,16 +1,21 @@
 import itertools
+import os
 import sys
+import tempfile
 import time
 import warnings
 from threading import Event
-from typing import Tuple
+from typing import Tuple, Callable
+
+import numpy as np
 
 from ._log import SceneLog
 from ._user_namespace import UserNamespace
 from ._vis_base import VisModel, Control, Action
 from .. import field
 from ..field import Scene, SampledField
-from ..math import batch
+from ..math import batch, Shape
+from ..math._tensors import NativeTensor, disassemble_tree, assemble_tree
 
 
 def create_viewer(namespace: UserNamespace,
@@ -109,6 +114,7 @@ class Viewer(VisModel):
 
     def set_control_value(self, name, value):
         self.namespace.set_variable(name, value)
+        self.revision += 1
 
     @property
     def actions(self) -> tuple:
@@ -118,10 +124,11 @@ class Viewer(VisModel):
         for action, fun in self._actions.items():
             if action.name == name:
                 fun()
+                self.revision += 1
                 return
         raise KeyError(name)
 
-    def range(self, *args, warmup=0, **rec_dim):
+    def range(self, *args, warmup=0, rec_memory: int = None, **rec_dim):
         """
         Similarly to `range()`, returns a generator that can be used in a `for` loop.
 
@@ -144,6 +151,9 @@ class Viewer(VisModel):
             **rec_dim: Can be used instead of `*args` to record values along a new batch dimension of this name.
                 The recorded values can be accessed as `Viewer.rec.<name>` or `Viewer.rec['<name>']`.
             warmup: Number of uncounted loop iterations to perform before `step()` is invoked for the first time.
+            rec_memory: Number of most recent frames per field to keep in memory when recording.
+                Older frames are moved to memory-mapped files in a temporary directory.
+                If `None`, all frames are kept in memory.
 
         Yields:
             Step count of `Viewer`.
@@ -160,7 +170,7 @@ class Viewer(VisModel):
             rec_dim_name = next(iter(rec_dim.keys()))
             size = rec_dim[rec_dim_name]
             assert isinstance(size, int)
-            self._rec = Record(rec_dim_name)
+            self._rec = Record(rec_dim_name, memory_frames=rec_memory)
             self._rec.append(self.initial_field_values, warn_missing=False)
             args = [size]
             self.growing_dims = [rec_dim_name]
@@ -258,18 +268,36 @@ class AsyncViewer(Viewer):
 
 
 class Record:
+    """
+    Stores the values of fields recorded by `Viewer.range()`.
 
-    def __init__(self, dim: str or None):
+    Only the most recent `memory_frames` frames of each field are kept in memory.
+    Older frames are written to memory-mapped files in a temporary directory and read back lazily when accessed.
+    """
+
+    def __init__(self, dim: str or None, memory_frames: int = None):
+        """
+        Args:
+            dim: Name of the batch dimension along which frames are stacked.
+            memory_frames: Number of most recent frames to keep in memory per field. If `None`, all frames are kept in memory.
+        """
         self.dim = dim
+        self.memory_frames = memory_frames
         self.history = {}
+        self._directory = None
 
     def append(self, variables: dict, warn_missing=True):
         if not self.history:
-            self.history = {name: [] for name in variables.keys()}
+            self.history = {name: _FieldHistory(name, self._get_directory) for name in variables.keys()}
         for name, val in variables.items():
-            self.history[name].append(val)
+            self.history[name].append(val, self.memory_frames)
             if val is None and warn_missing:
-                warnings.warn(f"None value encountered for variable '{name}' at step {self.viewer.steps}. This value will not show up in the recording.")
+                warnings.warn(f"None value encountered for variable '{name}' at frame {len(self.history[name]) - 1}. This value will not show up in the recording.")
+
+    def _get_directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.TemporaryDirectory(prefix='phi_rec_')
+        return self._directory.name
 
     @property
     def recorded_fields(self):
@@ -282,12 +310,10 @@ class Record:
         return len(self.history[name])
 
     def __getattr__(self, item: str):
+        if item.startswith('_'):
+            raise AttributeError(item)
         assert item in self.history, f"No recording available for '{item}'. The following fields were recorded: {self.recorded_fields}"
-        snapshots = [v for v in self.history[item] if v is not None]
-        if snapshots:
-            return field.stack(snapshots, batch(self.dim))
-        else:
-            return None
+        return self.history[item].stacked(batch(self.dim))
 
     def __getitem__(self, item):
         assert isinstance(item, str)
@@ -295,3 +321,86 @@ class Record:
 
     def __repr__(self):
         return ", ".join([f"{name} ({len(values)})" for name, values in self.history.items()])
+
+
+class _FieldHistory:
+    """
+    Frames of one recorded field.
+    Frames that leave the in-memory window are moved to memory-mapped files, one file per tensor of the field.
+    Frames whose structure or shapes differ from the first spilled frame remain in memory.
+    """
+
+    def __init__(self, name: str, get_directory: Callable):
+        self.name = name
+        self._get_directory = get_directory
+        self._frames = []  # value, None or int (row in memory-mapped files)
+        self._tree = None
+        self._shapes = None
+        self._files = None
+        self._maps = None
+        self._rows = 0
+        self._stacked = None  # (dim, lazily stacked field), invalidated when frames are added or spilled
+
+    def append(self, value, memory_frames: int or None):
+        self._frames.append(value)
+        self._stacked = None
+        if memory_frames is not None and len(self._frames) > memory_frames:
+            self._spill(len(self._frames) - memory_frames - 1)
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __getitem__(self, frame: int):
+        value = self._frames[frame]
+        if isinstance(value, int):
+            return assemble_tree(self._tree, [NativeTensor(m[value], shape) for m, shape in zip(self._maps, self._shapes)])
+        return value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._frames)))
+
+    def stacked(self, dim: Shape):
+        """
+        Lazily stacks all recorded frames along `dim`.
+        Spilled frames are views of the memory-mapped files and are only read when the corresponding values are used.
+        The lazy stack is cached until the next frame is recorded or spilled.
+        """
+        if self._stacked is not None and self._stacked[0] == dim:
+            return self._stacked[1]
+        views = [m[:self._rows] for m in self._maps] if self._rows else None
+        snapshots = []
+        for value in self._frames:
+            if isinstance(value, int):
+                value = assemble_tree(self._tree, [NativeTensor(v[value], shape) for v, shape in zip(views, self._shapes)])
+            if value is not None:
+                snapshots.append(value)
+        stacked = field.stack(snapshots, dim) if snapshots else None
+        self._stacked = (dim, stacked)
+        return stacked
+
+    def _spill(self, frame: int):
+        value = self._frames[frame]
+        if value is None or isinstance(value, int):
+            return
+        tree, tensors = disassemble_tree(value)
+        shapes = [t.shape for t in tensors]
+        arrays = [t.numpy(t.shape.names) for t in tensors]
+        if self._tree is None:
+            self._tree, self._shapes = tree, shapes
+            directory = self._get_directory()
+            self._files = [os.path.join(directory, f"{self.name}_{i}.dat") for i in range(len(arrays))]
+            self._maps = [np.memmap(file, dtype=a.dtype, mode='w+', shape=(1, *a.shape)) for file, a in zip(self._files, arrays)]
+        elif shapes != self._shapes or any(m.dtype != a.dtype for m, a in zip(self._maps, arrays)):
+            return  # keep in memory
+        if self._rows == self._maps[0].shape[0]:
+            self._maps = [self._grow(file, m, 2 * self._rows) for file, m in zip(self._files, self._maps)]
+        for m, a in zip(self._maps, arrays):
+            m[self._rows] = a
+        self._frames[frame] = self._rows
+        self._stacked = None
+        self._rows += 1
+
+    @staticmethod
+    def _grow(file: str, mmap: np.memmap, rows: int) -> np.memmap:
+        mmap.flush()
+        return np.memmap(file, dtype=mmap.dtype, mode='r+', shape=(rows, *mmap.shape[1:]))
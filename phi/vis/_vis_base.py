@@ -78,6 +78,8 @@ class VisModel:
         self.uses_existing_scene = scene.exist_properties() if scene is not None else False
         self.steps = 0
         """ Counts the number of times `step()` has been called. May be set by the user. """
+        self.revision = 0
+        """ Incremented whenever the model state changes without a step, e.g. when a control is set or an action is run. """
         self.progress_lock = Lock()
         self.pre_step = []  # callback(vis)
         self.post_step = []  # callback(vis)
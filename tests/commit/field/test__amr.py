@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import numpy as np
+
+from phi import field, math
+from phi.field import AMRGrid, CenteredGrid
+from phi.geom import Box, Sphere
+from phi.math import extrapolation, spatial, channel, collection
+from phi.physics import fluid
+
+
+def _refine(grid):
+    return grid.values > 0.5
+
+
+class AMRGridTest(TestCase):
+
+    def test_hierarchy(self):
+        grid = AMRGrid(Sphere((8, 8), radius=2), extrapolation.ZERO, x=16, y=16, criterion=_refine, levels=3, block_size=4)
+        self.assertEqual(3, grid.level_count)
+        self.assertEqual(1, len(grid.levels[0]))
+        self.assertEqual(spatial(x=16, y=16), grid.levels[0][0].resolution)
+        fine = sum(patch.resolution.volume for patch in grid.levels[2])
+        self.assertEqual(grid.shape.get_size('cells'), sum(patch.resolution.volume for level in grid.levels for patch in level))
+        self.assertLess(fine, 64 ** 2 / 4)
+        for patch in grid.levels[2]:
+            self.assertTrue(np.all(patch.bounds.lower.numpy() >= 2) and np.all(patch.bounds.upper.numpy() <= 14))
+        uncovered = math.sum(grid.cell_volumes * math.to_float(~grid.covered))
+        math.assert_close(16 * 16, uncovered)
+
+    def test_average_down(self):
+        grid = AMRGrid(lambda x: math.sin(x.vector[0] / 3) * x.vector[1], x=16, y=16, criterion=lambda g: math.abs(g.values) > 4, levels=2, block_size=4)
+        grid = grid.with_values(grid.values * 2).average_down()
+        coarse, = grid.levels[0]
+        for patch in grid.levels[1]:
+            (x0, y0), (x1, y1) = patch.bounds.lower.numpy().astype(int), patch.bounds.upper.numpy().astype(int)
+            math.assert_close(field.downsample2x(patch).values, coarse.values.x[x0:x1].y[y0:y1], abs_tolerance=1e-5)
+
+    def test_dense_and_regrid(self):
+        linear = lambda x: x.vector[0] + 2 * x.vector[1]
+        dense = CenteredGrid(linear, extrapolation.BOUNDARY, x=16, y=16)
+        grid = AMRGrid(linear, extrapolation.BOUNDARY, x=16, y=16, criterion=lambda g: g.values > 30, levels=2, block_size=4)
+        math.assert_close(dense.values, CenteredGrid(grid, extrapolation.BOUNDARY, x=16, y=16).values, abs_tolerance=1e-4)
+        regridded = grid.regrid(lambda g: math.vec_squared(g.points - 8) < 4, levels=2)
+        self.assertEqual(2, regridded.level_count)
+        math.assert_close(dense.values, regridded.levels[0][0].values, abs_tolerance=1e-4)
+        for patch in regridded.levels[1]:
+            math.assert_close(linear(patch.points), patch.values, abs_tolerance=1e-4)
+
+    def test_divergence_conservative(self):
+        with math.precision(64):
+            grid = AMRGrid(lambda x: math.exp(-math.vec_squared(x - 8) / 4) * math.stack([x.vector[1], -x.vector[0]], channel('vector')), extrapolation.ZERO, x=16, y=16, criterion=lambda g: field.vec_abs(g).values > 1, levels=2, block_size=4)
+            div = field.divergence(grid)
+            net = math.sum(div.values * div.cell_volumes * math.to_float(~div.covered))
+            math.assert_close(0, net, abs_tolerance=1e-6)
+            constant = grid.with_values(math.ones(grid.shape)).with_extrapolation(extrapolation.BOUNDARY)
+            math.assert_close(0, field.divergence(constant).values, field.spatial_gradient(constant.vector[0]).values, field.laplace(constant).values, abs_tolerance=1e-9)
+
+    def test_make_incompressible(self):
+        with math.precision(64):
+            velocity = AMRGrid(lambda x: math.exp(-math.vec_squared(x - (10, 8)) / 8) * math.stack([x.vector[1] - 6, x.vector[0] - 8], channel('vector')), extrapolation.ZERO, x=16, y=16, criterion=lambda g: field.vec_abs(g).values > 1, levels=2, block_size=4)
+            self.assertGreater(math.mean(field.divergence(velocity).values ** 2), 1e-2)
+            velocity, pressure = fluid.make_incompressible(velocity, solve=math.Solve('CG', 1e-8, 1e-8, max_iterations=1000))
+            self.assertIsInstance(velocity, AMRGrid)
+            self.assertIsInstance(pressure, AMRGrid)
+            div = field.divergence(velocity)
+            math.assert_close(0, div.values * math.to_float(~div.covered), abs_tolerance=1e-5)
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from phi import math, field
+from phi.field import CenteredGrid, StaggeredGrid, PointCloud, Noise
+from phi.geom import Box, Sphere
+from phi.math import extrapolation, collection, channel
+from phi.physics._boundaries import Obstacle
+
+
+class TestCheckpoint(TestCase):
+
+    def test_write_read(self):
+        state = dict(velocity=StaggeredGrid(Noise(vector=2), extrapolation.ZERO, x=16, y=12),
+                     smoke=CenteredGrid(Noise(), extrapolation.BOUNDARY, x=16, y=12),
+                     particles=PointCloud(Sphere(math.random_uniform(collection(points=5), channel(vector=2)), 1), bounds=Box[0:1, 0:1]),
+                     obstacles=[Obstacle(Box[1:2, 3:4])],
+                     time=(0.5, 'run'))
+        with tempfile.TemporaryDirectory() as directory:
+            file = field.write_checkpoint(state, os.path.join(directory, 'state'))
+            random_value = np.random.rand()
+            restored = field.read_checkpoint(file)
+            self.assertEqual(random_value, np.random.rand())
+            self.assertIsInstance(restored['smoke'].values.native('x,y'), np.memmap)
+            field.assert_close(state['velocity'], restored['velocity'])
+            field.assert_close(state['smoke'], restored['smoke'])
+            math.assert_close(state['particles'].points, restored['particles'].points)
+            self.assertEqual((0.5, 'run'), restored['time'])
+            self.assertEqual(state['obstacles'][0].geometry, restored['obstacles'][0].geometry)
+            del restored
+
+    def test_incremental(self):
+        state = [CenteredGrid(Noise(), extrapolation.ZERO, x=128, y=128), CenteredGrid(Noise(), extrapolation.ZERO, x=128, y=128)]
+        with tempfile.TemporaryDirectory() as directory:
+            full = field.write_checkpoint(state, os.path.join(directory, 'full'))
+            state[1] = state[1] * 2
+            incremental = field.write_checkpoint(state, os.path.join(directory, 'incremental'), base=full)
+            self.assertLess(os.path.getsize(incremental), os.path.getsize(full) * 0.6)
+            restored = field.read_checkpoint(incremental)
+            field.assert_close(state[0], restored[0])
+            field.assert_close(state[1], restored[1])
+            unchanged = field.write_checkpoint(restored, os.path.join(directory, 'unchanged'), base=incremental)
+            self.assertLess(os.path.getsize(unchanged), os.path.getsize(full) * 0.1)
+            restored = field.read_checkpoint(unchanged)
+            field.assert_close(state[0], restored[0])
+            field.assert_close(state[1], restored[1])
+            del restored
+
+    def test_rolling(self):
+        state = [CenteredGrid(Noise(), extrapolation.ZERO, x=32, y=32), CenteredGrid(Noise(), extrapolation.ZERO, x=32, y=32)]
+        expected = [grid.values.numpy('x,y') for grid in state]
+        with tempfile.TemporaryDirectory() as directory:
+            files = [os.path.join(directory, 'a'), os.path.join(directory, 'b')]
+            previous = field.write_checkpoint(state, files[0])
+            for i in range(1, 5):
+                state = [field.read_checkpoint(previous)[0], state[1] * 2]
+                expected[1] = expected[1] * 2
+                previous = field.write_checkpoint(state, files[i % 2], base=previous)
+                restored = field.read_checkpoint(previous)
+                np.testing.assert_equal(expected[0], restored[0].values.numpy('x,y'))
+                np.testing.assert_equal(expected[1], restored[1].values.numpy('x,y'))
+            del state, restored
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from phi import field
+from phi import field, math
 from phi.field import Noise, CenteredGrid, StaggeredGrid
 from phi.geom import Box, Sphere
 from phi.math import extrapolation, spatial, channel, batch
@@ -22,6 +22,18 @@ class GridTest(TestCase):
             self.assertEqual(g_boundary.shape, spatial(x=20, y=10) & channel(vector=2))
             self.assertEqual(g_boundary.values.vector[0].shape, spatial(x=21, y=10))
 
+    def test_staggered_grid_padded_layout(self):
+        for ext in (extrapolation.ZERO, extrapolation.BOUNDARY, extrapolation.PERIODIC):
+            v = StaggeredGrid(Noise(vector=2), ext, x=20, y=10)
+            result = v * v + (1, 2)
+            self.assertEqual(spatial(x=21, y=11) & channel(vector=2), result.padded_values().shape)
+            self.assertEqual(v.values.vector[0].shape, result.values.vector[0].shape)
+            math.assert_close(result.values.vector[0], v.values.vector[0] ** 2 + 1)
+            math.assert_close(result.values.vector[1], v.values.vector[1] ** 2 + 2)
+            centers = [CenteredGrid(v.vector[i], ext, x=20, y=10).values for i in range(2)]  # resampling each component
+            math.assert_close(result.at_centers().values.vector[0], CenteredGrid(result.vector[0], ext, x=20, y=10).values, abs_tolerance=1e-5)
+            math.assert_close(v.at_centers().values, math.stack(centers, channel('vector')), abs_tolerance=1e-5)
+
     def test_slice_staggered_grid_along_vector(self):
         v = Domain(x=10, y=20).staggered_grid(Noise(batch(batch=10)))
         x1 = v[{'vector': 0}]
@@ -55,3 +67,20 @@ class GridTest(TestCase):
         self.assertIsInstance(s1, CenteredGrid)
         self.assertEqual(s1.bounds, Box[1:2, 0:20])
         field.assert_close(s1, s2)
+
+    def test_grid_with_halo(self):
+        for ext in (extrapolation.ZERO, extrapolation.BOUNDARY, extrapolation.PERIODIC):
+            g = CenteredGrid(Noise(), ext, x=8, y=6)
+            h = g.with_halo(1)
+            field.assert_close(h, g)
+            field.assert_close(field.laplace(h), field.laplace(g))
+            field.assert_close(field.spatial_gradient(h, type=StaggeredGrid), field.spatial_gradient(g, type=StaggeredGrid))
+            field.assert_close(field.bake_extrapolation(h), field.bake_extrapolation(g))
+            s = StaggeredGrid(Noise(vector=2), ext, x=8, y=6)
+            sh = s.with_halo(1)
+            field.assert_close(sh, s)
+            field.assert_close(sh.at_centers(), s.at_centers())
+
+    def test_noise_tensor_scale(self):
+        grid = CenteredGrid(Noise(batch(b=2), scale=math.wrap([5., 10.], batch('b'))), extrapolation.ZERO, x=16, y=16)
+        self.assertEqual(('b', 'x', 'y'), grid.shape.names)
@@ -0,0 +1,98 @@
+from unittest import TestCase
+
+import numpy as np
+
+from phi import math
+from phi.field import PointCloud, CenteredGrid
+from phi.field._point_cloud import _morton_keys
+from phi.geom import Box, Sphere
+from phi.math import collection, channel, batch, spatial, extrapolation
+from phi.physics import advect
+
+
+class PointCloudTest(TestCase):
+
+    def test_morton_keys(self):
+        cells = np.array([[0, 0], [1, 0], [0, 1], [1, 1], [2, 0], [3, 3]])
+        np.testing.assert_equal(_morton_keys(cells, (4, 4)), [0, 1, 2, 3, 4, 15])
+
+    def test_sorted_by_cell(self):
+        box = Box[0:4, 0:4]
+        resolution = spatial(x=4, y=4)
+        points = math.random_uniform(batch(b=2), collection(points=100), channel(vector=2)) * 4
+        cloud = PointCloud(Sphere(points, math.random_uniform(collection(points=100))), values=math.vec_abs(points))
+        sorted_cloud = cloud.sorted_by_cell(box, resolution)
+        math.assert_close(sorted_cloud.values, math.vec_abs(sorted_cloud.points))
+        math.assert_close(math.sum(sorted_cloud.points, 'points'), math.sum(points, 'points'))
+        self.assertEqual(('b', 'points'), sorted_cloud.elements.radius.shape.names)  # permutation differs per batch
+        cells = math.reshaped_native(math.to_int32(math.floor(sorted_cloud.points)), [batch('b'), 'points', 'vector'])
+        for keys in _morton_keys(cells, (4, 4)):
+            self.assertTrue(np.all(np.diff(keys.astype(np.int64)) >= 0))
+        grid = CenteredGrid(0, extrapolation.ZERO, box, resolution)
+        math.assert_close((cloud >> grid).values, (sorted_cloud >> grid).values)
+
+    def test_remove_seed_compact(self):
+        box = Box[0:4, 0:4]
+        grid = CenteredGrid(0, extrapolation.ZERO, box, x=4, y=4)
+        points = math.tensor([[0.5, 0.5], [1.5, 0.5], [2.5, 2.5]], collection('points'), channel('vector'))
+        cloud = PointCloud(Sphere(points, 0.1), math.tensor([1., 2., 3.], collection('points')))
+        cloud = cloud.remove(math.tensor([False, True, False], collection('points')))
+        self.assertEqual(3, cloud.capacity)
+        self.assertEqual(2, cloud.count)
+        self.assertEqual(0, (cloud >> grid).values.y[0].x[1])
+        new_points = math.tensor([[3.5, 3.5], [0.5, 3.5]], collection('points'), channel('vector'))
+        seeded = cloud.seed(Sphere(new_points, 0.1), math.tensor([5., 6.], collection('points')))
+        self.assertEqual(6, seeded.capacity)  # amortized growth doubles the capacity
+        self.assertEqual(4, seeded.count)
+        math.assert_close([1, 5, 3, 6], seeded.values.points[:4])  # free slot is filled first
+        math.assert_close([[1, 0, 0, 0], [0, 0, 0, 0], [0, 0, 3, 0], [6, 0, 0, 5]], (seeded >> grid).values.numpy('y,x'))
+        reseeded = seeded.remove(math.tensor([True, False, False, False, False, False], collection('points'))).seed(Sphere(new_points, 0.1), 7.)
+        self.assertEqual(6, reseeded.capacity)
+        compact = reseeded.remove(math.tensor([False, True, False, False, False, False], collection('points'))).compact()
+        math.assert_close([True, True, True, True, False, False], compact.active)
+        math.assert_close([7, 3, 6, 7], compact.values.points[:4])
+
+    def test_seed_batched(self):
+        points = math.tensor([[[0.5, 0.5], [1.5, 0.5]], [[2.5, 2.5], [3.5, 3.5]]], batch('b'), collection('points'), channel('vector'))
+        cloud = PointCloud(Sphere(points, 0.1), 1.).remove(math.tensor([[False, True], [False, False]], batch('b'), collection('points')))
+        new_points = math.tensor([[[0.5, 1.5]], [[1.5, 1.5]]], batch('b'), collection('points'), channel('vector'))
+        seeded = cloud.seed(Sphere(new_points, 0.1), 2.)
+        self.assertEqual(4, seeded.capacity)
+        math.assert_close([2, 3], seeded.count)
+        math.assert_close([[1, 2, 0, 0], [1, 1, 2, 0]], seeded.values.numpy('b,points') * seeded.active.numpy('b,points'))
+        math.assert_close([0.5, 1.5], seeded.points.b[0].points[1])
+        seeded = seeded.seed(Sphere(math.tensor([[3.5, 0.5]], collection('points'), channel('vector')), 0.1))  # unbatched elements, default values
+        math.assert_close([3, 4], seeded.count)
+        math.assert_close([3.5, 0.5], seeded.points.b[1].points[3])
+
+    def test_sample_inactive(self):
+        grid = CenteredGrid(math.tensor([1., 0.], channel('vector')), extrapolation.ZERO, Box[0:4, 0:4], x=4, y=4)
+        points = math.tensor([[0.5, 0.5], [1.5, 0.5]], collection('points'), channel('vector'))
+        cloud = PointCloud(Sphere(points, 0.1), math.tensor([[2., 2.], [3., 3.]], collection('points'), channel('vector')), active=math.tensor([True, False], collection('points')))
+        sampled = grid >> cloud
+        math.assert_close([[1, 0], [3, 3]], sampled.values)
+        math.assert_close(cloud.active, sampled.active)
+
+    def test_advect_inactive(self):
+        box = Box[0:4, 0:4]
+        velocity = CenteredGrid(math.tensor([1., 0.], channel('vector')), extrapolation.ZERO, box, x=4, y=4)
+        points = math.tensor([[0.5, 0.5], [1.5, 0.5]], collection('points'), channel('vector'))
+        cloud = PointCloud(Sphere(points, 0.1), active=math.tensor([True, False], collection('points')))
+        advected = advect.points(cloud, velocity, 0.5)
+        math.assert_close([[1, 0.5], [1.5, 0.5]], advected.points)
+        math.assert_close(cloud.active, advected.active)
+
+    def test_scatter_plan_not_reused_after_assemble_tree(self):
+        from phi.math._tensors import disassemble_tree, assemble_tree
+        grid = CenteredGrid(0, extrapolation.ZERO, Box[0:4, 0:4], x=4, y=4)
+        cloud = PointCloud(Sphere(math.tensor([[0.5, 0.5]], collection('points'), channel('vector')), 0.1))
+        math.assert_close(1, (cloud >> grid).values.y[0].x[0])
+        key, tensors = disassemble_tree(cloud)
+        moved = assemble_tree(key, [t + 2 if 'vector' in t.shape else t for t in tensors])
+        math.assert_close(0, (moved >> grid).values.y[0].x[0])
+        math.assert_close(1, (moved >> grid).values.y[2].x[2])
+        copies = [assemble_tree(key, [t + 1 if 'vector' in t.shape else t for t in tensors]) for _ in range(5)]
+        for copy in copies:
+            math.assert_close(1, (copy >> grid).values.y[1].x[1])
+            self.assertEqual(1, len(copy._scatter_plans))
+        self.assertEqual(1, len(cloud._scatter_plans))
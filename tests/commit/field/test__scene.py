@@ -87,6 +87,22 @@ class TestScene(TestCase):
         field.assert_close(vel, vel__)
         scene.remove()
 
+    def test_write_read_uncompressed(self):
+        DOMAIN = Domain(x=32, y=32, boundaries=CLOSED)
+        smoke = DOMAIN.scalar_grid(1) * math.random_uniform(batch(count=2))
+        vel = DOMAIN.staggered_grid(2) * math.random_uniform(batch(count=2))
+        scene = Scene.create(DIR)
+        for compress in (True, False):
+            field.write(smoke, join(scene.path, f'smoke_{compress}.npz'), compress=compress)
+            field.write(vel, join(scene.path, f'vel_{compress}.npz'), compress=compress)
+            for mmap in (False, True):
+                field.assert_close(smoke, field.read(join(scene.path, f'smoke_{compress}.npz'), mmap=mmap))
+                field.assert_close(vel, field.read(join(scene.path, f'vel_{compress}.npz'), mmap=mmap))
+        loaded = field.read(join(scene.path, 'smoke_False.npz'))
+        field.write(smoke[{'x': slice(0, 4)}], join(scene.path, 'smoke_False.npz'), compress=False)  # overwriting must not affect fields read without mmap
+        field.assert_close(smoke, loaded)
+        scene.remove()
+
     def test_write_read_batch_matching(self):
         DOMAIN = Domain(x=32, y=32, boundaries=CLOSED)
         smoke = DOMAIN.scalar_grid(1) * math.random_uniform(batch(count=2))
@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+import numpy as np
+
+from phi import field, math
+from phi.field import Noise, CenteredGrid, SparseGrid, PointCloud
+from phi.geom import Box, Sphere, Point
+from phi.math import extrapolation, spatial, channel, collection
+from phi.physics import advect
+
+
+class SparseGridTest(TestCase):
+
+    def test_dense_conversion(self):
+        dense = CenteredGrid(Box[17:30, 9:14], extrapolation.ZERO, x=64, y=32)
+        sparse = SparseGrid(dense, tile_size=8, dilation=0)
+        self.assertEqual(collection(tiles=2) & spatial(x=8, y=8), sparse.shape)
+        self.assertEqual(2 / 32, sparse.active_fraction)
+        field.assert_close(dense, sparse.to_dense(), CenteredGrid(sparse, extrapolation.ZERO, x=64, y=32))
+
+    def test_activation(self):
+        resolution = spatial(x=32, y=32)
+        points = PointCloud(Point(math.tensor([(2, 2), (20, 10)], collection('points'), channel('vector'))))
+        self.assertEqual([[0, 0], [2, 1]], SparseGrid(0, resolution=resolution, active=points, dilation=0).tiles.numpy('tiles,vector').tolist())
+        self.assertEqual(11, SparseGrid(0, resolution=resolution, active=points, dilation=1).tiles.tiles.size)
+        self.assertEqual([[1, 1], [1, 2], [2, 1], [2, 2]], SparseGrid(0, resolution=resolution, active=Box[10:20, 10:20], dilation=0).tiles.numpy('tiles,vector').tolist())
+        sparse = SparseGrid(Sphere((16, 16), radius=3), resolution=resolution, active=points, dilation=0)
+        self.assertEqual(2, sparse.tiles.tiles.size)
+        self.assertEqual(sparse.tiles.shape, SparseGrid(sparse * 2, active=sparse).tiles.shape)
+
+    def test_sample_and_operators_match_dense(self):
+        dense = CenteredGrid(Noise(), extrapolation.ZERO, x=32, y=24, bounds=Box[0:64, 0:48])
+        sparse = SparseGrid(dense, tile_size=8, threshold=-1)  # activate all tiles
+        points = Point(math.random_uniform(collection(points=20), channel(vector=2)) * (60, 44) + 2)
+        math.assert_close(field.sample(dense, points), field.sample(sparse, points), abs_tolerance=1e-5)
+        gradient = field.spatial_gradient(sparse)
+        field.assert_close(field.spatial_gradient(dense), gradient.to_dense(), abs_tolerance=1e-5)
+        field.assert_close(field.divergence(field.spatial_gradient(dense)), field.divergence(gradient).to_dense(), abs_tolerance=1e-5)
+        velocity = CenteredGrid((1, 0.5), extrapolation.ZERO, x=32, y=24, bounds=Box[0:64, 0:48])
+        field.assert_close(advect.semi_lagrangian(dense, velocity, 1), advect.semi_lagrangian(sparse, velocity, 1).to_dense(), abs_tolerance=1e-5)
+
+    def test_operators_on_active_tiles(self):
+        dense = CenteredGrid(Sphere((12, 12), radius=4), extrapolation.ZERO, x=64, y=64)
+        sparse = SparseGrid(dense, tile_size=8, dilation=1)
+        self.assertLess(sparse.active_fraction, 0.2)
+        laplace = field.laplace(sparse)
+        np.testing.assert_allclose(field.laplace(dense).values.numpy('x,y'), laplace.to_dense().values.numpy('x,y'), atol=1e-5)
+        velocity = CenteredGrid((1, 0.5), extrapolation.ZERO, x=64, y=64)
+        field.assert_close(advect.semi_lagrangian(dense, velocity, 1), advect.semi_lagrangian(sparse, velocity, 1).to_dense(), abs_tolerance=1e-5)
+
+    def test_laplace_dx(self):
+        dense = CenteredGrid(lambda x: math.vec_squared(x), extrapolation.BOUNDARY, x=16, y=16, bounds=Box[0:32, 0:32])
+        sparse = SparseGrid(dense, tile_size=8)
+        math.assert_close(4, field.laplace(dense).values.x[1:-1].y[1:-1])  # d²/dx² + d²/dy² of x² + y²
+        np.testing.assert_allclose(field.laplace(dense).values.numpy('x,y')[1:-1, 1:-1], field.laplace(sparse).to_dense().values.numpy('x,y')[1:-1, 1:-1], atol=1e-4)
+
+    def test_solve_linear(self):
+        sparse = SparseGrid(Sphere((12, 12), radius=4), x=64, y=64, active=Sphere((12, 12), radius=4))
+        solution = field.solve_linear(field.laplace, sparse, math.Solve('CG', 1e-5, 1e-5, x0=0 * sparse))
+        self.assertIsInstance(solution, SparseGrid)
+        math.assert_close(sparse.values, field.laplace(solution).values, abs_tolerance=1e-3)
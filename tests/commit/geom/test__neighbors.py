@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+import numpy as np
+
+from phi import math
+from phi.geom import NeighborIndex
+from phi.math import batch, channel, collection
+
+
+def brute_force_distances(points: np.ndarray, queries: np.ndarray):
+    return np.linalg.norm(queries[:, None, :] - points[None, :, :], axis=-1)
+
+
+class TestNeighborIndex(TestCase):
+
+    def test_radius_search(self):
+        points = math.random_uniform(batch(b=2), collection(points=200), channel(vector=3))
+        index = NeighborIndex(points, 0.1)
+        indices, distances, count = index.radius_search(0.15)
+        for b in range(2):
+            p = points.b[b].numpy('points,vector')
+            expected = brute_force_distances(p, p) <= 0.15
+            np.testing.assert_equal(count.b[b].numpy(), expected.sum(1))
+            idx = indices.b[b].numpy('points,neighbors')
+            for i in range(len(p)):
+                self.assertEqual(set(idx[i][idx[i] >= 0]), set(np.flatnonzero(expected[i])))
+                self.assertEqual(idx[i, 0], i)
+        sorted_distances = np.where(np.isinf(distances.numpy('b,points,neighbors')), 10, distances.numpy('b,points,neighbors'))
+        self.assertTrue(np.all(np.diff(sorted_distances, axis=-1) >= 0))
+
+    def test_1d(self):
+        points = math.random_uniform(collection(points=100), channel(vector=1))
+        index = NeighborIndex(points, 0.05)
+        p = points.numpy('points,vector')
+        d = brute_force_distances(p, p)
+        _, _, count = index.radius_search(0.05)
+        np.testing.assert_equal(count.numpy('points'), (d <= 0.05).sum(1))
+        indices, _ = index.nearest(3)
+        np.testing.assert_equal(indices.numpy('points,neighbors'), np.argsort(d, axis=1, kind='stable')[:, :3])
+        values = math.random_normal(collection(points=100))
+        expected = np.where(d <= 0.05, 1., 0) @ values.numpy('points')
+        np.testing.assert_allclose(index.kernel_sum(values, lambda r: 1, 0.05).numpy('points'), expected, rtol=1e-5, atol=1e-6)
+
+    def test_nearest_with_query(self):
+        points = math.random_uniform(collection(points=300), channel(vector=2))
+        query = math.random_uniform(collection(q=20), channel(vector=2)) * 2 - 0.5
+        indices, distances = NeighborIndex(points, 0.05).nearest(5, query)
+        d = brute_force_distances(points.numpy('points,vector'), query.numpy('q,vector'))
+        np.testing.assert_equal(indices.numpy('q,neighbors'), np.argsort(d, axis=1)[:, :5])
+        np.testing.assert_allclose(distances.numpy('q,neighbors'), np.sort(d, axis=1)[:, :5], rtol=1e-5)
+
+    def test_update_and_kernel_sum(self):
+        points = math.random_uniform(collection(points=100), channel(vector=2))
+        index = NeighborIndex(points, 0.2)
+        moved = points + math.random_normal(points.shape) * 0.05
+        index = index.update(moved)
+        values = math.random_normal(collection(points=100))
+        result = index.kernel_sum(values, lambda r: 1 - r / 0.2, 0.2)
+        p = moved.numpy('points,vector')
+        d = brute_force_distances(p, p)
+        expected = np.where(d <= 0.2, 1 - d / 0.2, 0) @ values.numpy('points')
+        np.testing.assert_allclose(result.numpy('points'), expected, rtol=1e-5, atol=1e-6)
+
+    def test_point_cloud_neighbor_index(self):
+        from phi.field import PointCloud
+        from phi.geom import Sphere
+        cloud = PointCloud(Sphere(math.random_uniform(collection(points=50), channel(vector=2)), 0))
+        index = cloud.neighbor_index(0.1)
+        moved = cloud.with_elements(cloud.elements.shifted(math.wrap((0.01, 0), channel('vector'))))
+        updated = moved.neighbor_index(0.1, previous=index)
+        math.assert_close(updated.radius_search(0.2)[2], index.radius_search(0.2)[2])
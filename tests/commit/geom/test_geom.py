@@ -1,7 +1,9 @@
 from unittest import TestCase
 
+import numpy as np
+
 from phi import math
-from phi.geom import Box, Sphere, stack
+from phi.geom import Box, Sphere, stack, GridCell, union
 from phi.math import batch, channel, spatial
 
 
@@ -27,3 +29,41 @@ class TestGeom(TestCase):
     def test_stack_volume(self):
         u = stack([Box[0:1, 0:1], Box[0:2, 0:2]], batch('batch'))
         math.assert_close(u.volume, [1, 4])
+
+    def test_grid_cell_center_cached(self):
+        cells = GridCell(spatial(x=4, y=3), Box[0:4, 0:6])
+        center = cells.center
+        self.assertIs(center, GridCell(spatial(x=4, y=3), Box[0:4, 0:6]).center)
+        math.assert_close(center.x[0].y[0], (0.5, 1))
+        math.assert_close(GridCell(spatial(x=4, y=3), Box[1:5, 0:6]).center.x[0].y[0], (1.5, 1))
+        with math.precision(64):
+            self.assertEqual(64, GridCell(spatial(x=4, y=3), Box[0:4, 0:6]).center.dtype.precision)
+
+    def test_union_bvh(self):
+        np.random.seed(0)
+        centers = np.random.rand(100, 2) * 10
+        spheres = [Sphere(math.tensor(c, channel('vector')), radius=0.5) for c in centers[:50]]
+        boxes = [Box(math.tensor(c, channel('vector')), math.tensor(c + 1, channel('vector'))) for c in centers[50:]]
+        points = math.tensor(np.random.rand(20, 20, 2) * 10, spatial('x,y'), channel('vector'))
+        accelerated = union(spheres + boxes)
+        inside = accelerated.lies_inside(points)
+        distance = accelerated.approximate_signed_distance(points)
+        self.assertIsNotNone(accelerated._bvh)
+        math.assert_close(inside, math.any([g.lies_inside(points) for g in spheres + boxes], dim=0))
+        math.assert_close(distance, math.min([g.approximate_signed_distance(points) for g in spheres + boxes], dim=0), abs_tolerance=1e-5)
+        shifted = accelerated.shifted(math.tensor([1, 0], channel('vector')))
+        math.assert_close(shifted.lies_inside(points + math.tensor([1, 0], channel('vector'))), inside)
+        inside_boxes = union(boxes).lies_inside(points)
+        pushed = union(boxes).push(points, shift_amount=0.01)
+        math.assert_close(math.where(inside_boxes, 0, pushed - points), 0)
+        self.assertTrue(math.all(math.where(inside_boxes, math.vec_squared(pushed - points) > 0, True)))
+        stacked = stack(boxes, batch('boxes'))
+        math.assert_close(stacked.lies_inside(points), math.stack([b.lies_inside(points) for b in boxes], batch('boxes')))
+
+    def test_union_bvh_rotated(self):
+        np.random.seed(1)
+        centers = np.random.rand(32, 2) * 20
+        geometries = [Box(math.tensor(c - 1, channel('vector')), math.tensor(c + 1, channel('vector'))).rotated(math.PI / 4) for c in centers]
+        points = math.tensor(np.random.rand(20, 20, 2) * 30 - 5, spatial('x,y'), channel('vector'))
+        distance = union(geometries).approximate_signed_distance(points)
+        math.assert_close(distance, math.min([g.approximate_signed_distance(points) for g in geometries], dim=0), abs_tolerance=1e-5)
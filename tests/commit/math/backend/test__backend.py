@@ -3,7 +3,9 @@ from unittest import TestCase
 import numpy
 
 import phi
-from phi.math.backend import ComputeDevice, convert
+from phi import math
+from phi.math.backend import ComputeDevice, convert, choose_backend, Backend, NoBackendFound, NUMPY
+from phi.math.backend import _backend
 
 
 BACKENDS = phi.detect_backends()
@@ -26,3 +28,62 @@ class TestBackends(TestCase):
                 np1 = source_backend.numpy(data)
                 np2 = target_backend.numpy(converted)
                 numpy.testing.assert_equal(np1, np2)
+
+    def test_choose_backend_cache(self):
+        class Custom:
+            pass
+
+        class CustomBackend(Backend):
+            def __init__(self):
+                Backend.__init__(self, 'Custom', default_device=None)
+
+            def is_tensor(self, x, only_native=False):
+                return isinstance(x, Custom)
+
+        self.assertRaises(NoBackendFound, lambda: choose_backend(Custom()))
+        custom = CustomBackend()
+        _backend.BACKENDS.append(custom)
+        try:
+            self.assertIs(custom, choose_backend(Custom()))
+        finally:
+            _backend.BACKENDS.remove(custom)
+        self.assertRaises(NoBackendFound, lambda: choose_backend(Custom()))
+        self.assertRaises(NoBackendFound, lambda: choose_backend(numpy.array([Custom()])))
+        self.assertIs(NUMPY, choose_backend(numpy.zeros(2)))
+        self.assertIs(NUMPY, choose_backend((1, 2)))
+        for backend in BACKENDS:
+            with backend:
+                self.assertIs(backend, choose_backend(1.5, prefer_default=True))
+
+    def test_choose_backend_cache_reorder(self):
+        class Custom:
+            pass
+
+        class CustomBackend(Backend):
+            def is_tensor(self, x, only_native=False):
+                return isinstance(x, Custom)
+
+        first, second = CustomBackend('First', default_device=None), CustomBackend('Second', default_device=None)
+        _backend.BACKENDS.extend([first, second])
+        try:
+            self.assertIs(first, choose_backend(Custom()))
+            _backend.BACKENDS.reverse()
+            self.assertIs(second, choose_backend(Custom()))
+            _backend.BACKENDS.sort(key=lambda b: b.name != 'First')
+            self.assertIs(first, choose_backend(Custom()))
+            version = _backend.BACKENDS.version
+            _backend.BACKENDS *= 1
+            self.assertEqual(version + 1, _backend.BACKENDS.version)
+        finally:
+            _backend.BACKENDS.remove(first)
+            _backend.BACKENDS.remove(second)
+
+    def test_scatter_broadcast_base_grid(self):
+        for backend in BACKENDS:
+            base_grid = backend.zeros((1, 2, 1, 1))
+            indices = backend.as_tensor(numpy.array([[[0, 0]], [[1, 0]], [[0, 0]]]))
+            values = backend.ones((3, 1, 1))
+            for mode in ('add', 'update', 'mean', 'max', 'min'):
+                result = backend.numpy(backend.scatter(base_grid, indices, values if mode != 'min' else -values, mode))
+                expected = [[1, 0], [0, 1], [1, 0]] if mode != 'min' else [[-1, 0], [0, -1], [-1, 0]]
+                numpy.testing.assert_equal(expected, result[..., 0, 0], err_msg=f"{backend} {mode}")
@@ -3,8 +3,9 @@ from unittest import TestCase
 import phi
 from phi import math, field
 from phi.field import CenteredGrid
-from phi.math import Solve, Diverged, wrap, tensor, SolveTape, extrapolation, spatial, batch, channel
+from phi.math import Solve, Diverged, NotConverged, wrap, tensor, SolveTape, extrapolation, spatial, batch, channel
 from phi.math.backend import Backend
+from phi.math._tensors import copy_with
 
 BACKENDS = phi.detect_backends()
 
@@ -217,6 +218,109 @@ class TestFunctional(TestCase):
             assert solves[0] == solves[solve]
             math.assert_close(solves[solve].residual.values, 0, abs_tolerance=1e-3)
 
+    def test_linear_solve_iterative_refinement(self):
+        y = CenteredGrid(1, extrapolation.ZERO, x=3) * (1, 2)
+        x0 = CenteredGrid(0, extrapolation.ZERO, x=3)
+        with math.precision(64):
+            for method in ['CG', 'CG-adaptive', 'auto']:
+                solve = math.Solve(method, 1e-10, 0, x0=x0, max_iterations=100, inner_precision=32)
+                with math.SolveTape() as solves:
+                    x = field.solve_linear(math.jit_compile_linear(field.laplace), y, solve)
+                math.assert_close(x.values, [[-1.5, -2, -1.5], [-3, -4, -3]], abs_tolerance=1e-9)
+                self.assertEqual(math.DType(float, 64), x.values.dtype)
+                assert (solves[solve].refinements >= 1).all
+                x = field.solve_linear(field.laplace, y, solve)
+                math.assert_close(x.values, math.wrap([[-1.5, -2, -1.5], [-3, -4, -3]], channel('vector'), spatial('x')), abs_tolerance=1e-9)
+
+    def test_linear_solve_iterative_refinement_inner_precision(self):
+        y = CenteredGrid(1, extrapolation.ZERO, x=3) * (1, 2)
+        x0 = CenteredGrid(0, extrapolation.ZERO, x=3)
+        dtypes = set()
+
+        def laplace(x):
+            dtypes.add(x.values.dtype)
+            return field.laplace(x)
+
+        with math.precision(64):
+            solve = math.Solve('CG', 1e-10, 0, x0=x0, max_iterations=100, inner_precision=32)
+            with math.SolveTape() as solves:
+                x = field.solve_linear(laplace, y, solve)
+        math.assert_close(x.values, math.wrap([[-1.5, -2, -1.5], [-3, -4, -3]], channel('vector'), spatial('x')), abs_tolerance=1e-9)
+        self.assertEqual({math.DType(float, 32), math.DType(float, 64)}, dtypes)  # inner matvecs at 32 bit, residuals at 64 bit
+        self.assertIn('32 → 64 bit', solves[solve].method)
+
+    def test_linear_solve_iterative_refinement_jit(self):
+        @math.jit_compile
+        def solve_poisson(y: CenteredGrid) -> CenteredGrid:
+            solve = math.Solve('CG', 1e-5, 0, x0=y * 0, max_iterations=100, inner_precision=16)
+            return field.solve_linear(field.laplace, y, solve)
+
+        y = CenteredGrid(1, extrapolation.ZERO, x=3) * (1, 2)
+        for backend in BACKENDS:
+            with backend:
+                x = solve_poisson(y)  # falls back to a direct solve when traced
+                math.assert_close(x.values, math.wrap([[-1.5, -2, -1.5], [-3, -4, -3]], channel('vector'), spatial('x')), abs_tolerance=1e-4)
+
+    def test_solver_context_warm_start(self):
+        y = CenteredGrid(1, extrapolation.ZERO, x=3) * (1, 2)
+        x0 = CenteredGrid(0, extrapolation.ZERO, x=3)
+        expected = math.wrap([[-1.5, -2, -1.5], [-3, -4, -3]], channel('vector'), spatial('x'))
+        for f in [math.jit_compile_linear(field.laplace), field.laplace]:
+            solve = math.SolverContext('CG', 0, 1e-3, x0=x0, max_iterations=100)
+            self.assertIs(x0, solve.x0)
+            x = field.solve_linear(f, y, solve)
+            math.assert_close(x.values, expected, abs_tolerance=1e-3)
+            self.assertIs(x, solve.x0)
+            x = field.solve_linear(f, y, solve)
+            math.assert_close(x.values, expected, abs_tolerance=1e-3)
+            self.assertEqual(2, solve.solve_count)
+            self.assertLess(solve.iterations[1], solve.iterations[0])
+            self.assertLess(solve.mean_iterations, solve.iterations[0])
+            solve.reset()
+            self.assertIs(x0, solve.x0)
+
+    def test_solver_context_extrapolation(self):
+        x0 = CenteredGrid(0, extrapolation.ZERO, x=3)
+        solve = math.SolverContext('CG', 1e-5, 1e-5, x0=x0, extrapolate=True)
+        for scale in (1, 2):
+            field.solve_linear(math.jit_compile_linear(field.laplace), CenteredGrid(scale, extrapolation.ZERO, x=3), solve)
+        math.assert_close(solve.x0.values, [-4.5, -6, -4.5], abs_tolerance=1e-3)
+        solve = copy_with(solve, x0=None)
+        math.assert_close(solve.x0.values, [-4.5, -6, -4.5], abs_tolerance=1e-3)
+
+    def test_solver_context_tensor_x0(self):
+        y = math.ones(spatial(x=3))
+        solve = math.SolverContext('CG', 1e-5, 1e-5, x0=math.zeros(spatial(x=3)))
+        for _ in range(2):
+            math.assert_close(math.solve_linear(lambda x: 2 * x, y, solve), 0.5)
+        self.assertEqual(2, solve.solve_count)
+        self.assertEqual(0, solve.iterations[1])
+        solve = math.SolverContext('CG', 1e-5, 1e-5)
+        math.solve_linear(lambda x: 2 * x, y, copy_with(solve, x0=math.zeros(spatial(x=3))))
+        math.assert_close(math.solve_linear(lambda x: 2 * x, y, solve), 0.5)
+        self.assertEqual(2, solve.solve_count)
+
+    def test_solver_context_skip_diverged(self):
+        x0 = math.zeros(spatial(x=2))
+        solve = math.SolverContext('CG', 0, 1e-3, x0=x0, max_iterations=100, suppress=[Diverged, NotConverged])
+        math.solve_linear(math.jit_compile_linear(math.laplace), math.ones(spatial(x=2)) * (1, 2), solve)
+        self.assertEqual(0, solve.solve_count)
+        self.assertIs(x0, solve.x0)
+
+    def test_solver_context_tree(self):
+        for backend in BACKENDS:
+            if backend.supports(Backend.functional_gradient):
+                with backend:
+                    solve = math.SolverContext('L-BFGS-B', 0, 1e-5, x0=(math.zeros(spatial(x=2)), math.zeros()), extrapolate=True)
+                    for scale in (1, 2):
+                        x, offset = math.minimize(lambda x, offset: math.l2_loss(x - scale) + math.l2_loss(offset - scale), solve)
+                        math.assert_close(x, scale, abs_tolerance=1e-3, msg=backend.name)
+                        math.assert_close(offset, scale, abs_tolerance=1e-3, msg=backend.name)
+                    x, offset = solve.x0
+                    math.assert_close(x, 3, abs_tolerance=1e-2, msg=backend.name)
+                    math.assert_close(offset, 3, abs_tolerance=1e-2, msg=backend.name)
+                    self.assertEqual(2, solve.solve_count)
+
     def test_solve_diverge(self):
         y = math.ones(spatial(x=2)) * (1, 2)
         x0 = math.zeros(spatial(x=2))
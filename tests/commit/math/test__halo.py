@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from phi import math
+from phi.math import extrapolation, spatial, channel, batch
+from phi.math._halo import HaloTensor
+
+
+class TestHalo(TestCase):
+
+    def test_pad_reads_halo(self):
+        extrapolations = [extrapolation.ZERO, extrapolation.ONE, extrapolation.BOUNDARY, extrapolation.PERIODIC, extrapolation.SYMMETRIC, extrapolation.REFLECT,
+                          extrapolation.combine_sides(x=extrapolation.PERIODIC, y=extrapolation.ZERO)]
+        for ext in extrapolations:
+            for width in (1, 2):
+                v = math.random_normal(batch(b=2), spatial(x=5, y=4), channel(vector=2))
+                h = math.with_halo(v, ext, width)
+                self.assertIsInstance(h, HaloTensor)
+                math.assert_close(h, v)
+                for widths in [{'x': (1, 1), 'y': (width, 0)}, {'x': (0, width)}, {'x': (-1, width)}]:
+                    math.assert_close(math.pad(h, widths, ext), math.pad(v, widths, ext))
+                math.assert_close(math.laplace(h, padding=ext), math.laplace(v, padding=ext))
+
+    def test_pad_returns_view(self):
+        v = math.random_normal(spatial(x=4, y=3))
+        h = math.with_halo(v, extrapolation.BOUNDARY, 2)
+        padded = math.pad(h, {'x': (1, 1), 'y': (1, 1)}, extrapolation.BOUNDARY)
+        self.assertIs(padded.native('x,y').base, h._padded.native('x,y'))
+        self.assertNotIsInstance(math.pad(h, {'x': (1, 1)}, extrapolation.ZERO), HaloTensor)
+        self.assertNotIsInstance(h * 2, HaloTensor)
+
+    def test_reuse_buffer(self):
+        v = math.random_normal(spatial(x=4, y=3))
+        h1 = math.with_halo(v, extrapolation.PERIODIC, 1)
+        h2 = math.with_halo(v + 1, extrapolation.PERIODIC, 1, reuse=h1)
+        self.assertIs(h1._padded.native('x,y'), h2._padded.native('x,y'))
+        math.assert_close(math.pad(h2, {'x': (1, 1), 'y': (1, 1)}, extrapolation.PERIODIC), math.pad(v + 1, {'x': (1, 1), 'y': (1, 1)}, extrapolation.PERIODIC))
@@ -49,6 +49,15 @@ class TestMathNDNumpy(TestCase):
         for case_dict in [dict(zip(cases, v)) for v in product(*cases.values())]:
             laplace = math.laplace(meshgrid, **case_dict)
 
+    def test_laplace_dx(self):
+        x = math.meshgrid(x=8, y=6)
+        quadratic = math.vec_squared(x * (0.5, 2))  # 0.25 x² + 4 y²
+        laplace = math.laplace(quadratic, dx=1)
+        math.assert_close(laplace.x[1:-1].y[1:-1], 2 * 0.25 + 2 * 4)
+        spacing = math.laplace(quadratic, dx=(2, 0.5))
+        math.assert_close(spacing.x[1:-1].y[1:-1], 2 * 0.25 / 4 + 2 * 4 / 0.25)
+        math.assert_close(math.laplace(quadratic, dx=0.5).x[1:-1].y[1:-1], 4 * laplace.x[1:-1].y[1:-1])
+
     # Fourier Poisson
 
     def test_downsample2x(self):
@@ -220,6 +229,14 @@ class TestMathNDNumpy(TestCase):
             #     print(f"{variation_str}\n{params}")
             #     raise AssertionError(e, f"{variation_str}\n{params}")
 
+    def test_fourier_poisson_real_complex(self):
+        values = math.random_normal(batch(b=2), spatial(x=16, y=15))
+        values -= math.mean(values, values.shape.spatial)
+        laplace = math.fourier_laplace(values, 0.5)
+        math.assert_close(math.real(math.fourier_laplace(math.to_complex(values), 0.5)), laplace, abs_tolerance=1e-3)
+        math.assert_close(math.fourier_poisson(laplace, 0.5), values, abs_tolerance=1e-5)
+        math.assert_close(math.real(math.fourier_poisson(math.to_complex(laplace), 0.5)), values, abs_tolerance=1e-5)
+        self.assertEqual(values.dtype, laplace.dtype)
 
     # Arakawa
 
@@ -345,6 +345,30 @@ class TestMathFunctions(TestCase):
                 updated = math.scatter(base, indices, values, mode='add', outside_handling='undefined')
                 math.assert_close(updated, math.tensor([[23, 1, 1], [13, 1, 14]], spatial('y,x')))
 
+    def test_scatter_mean_max_min_2d_batched(self):
+        for backend in BACKENDS:
+            with backend:
+                base = math.ones(spatial(x=3, y=2)) * math.tensor([1, -1], batch('batch'))
+                indices = math.wrap([(0, 0), (0, 0), (0, 1), (2, 1)], collection('points'), channel('vector'))
+                values = math.wrap([[4, 2, 12, -5], [4, 2, -12, 5]], batch('batch'), collection('points'))
+                updated = math.scatter(base, indices, values, mode='mean', outside_handling='undefined')
+                math.assert_close(updated, math.tensor([[[3, 1, 1], [12, 1, -5]], [[3, -1, -1], [-12, -1, 5]]], batch('batch'), spatial('y,x')), msg=backend.name)
+                updated = math.scatter(base, indices, values, mode='max', outside_handling='undefined')
+                math.assert_close(updated, math.tensor([[[4, 1, 1], [12, 1, 1]], [[4, -1, -1], [-1, -1, 5]]], batch('batch'), spatial('y,x')), msg=backend.name)
+                updated = math.scatter(base, indices, values, mode='min', outside_handling='undefined')
+                math.assert_close(updated, math.tensor([[[1, 1, 1], [1, 1, -5]], [[-1, -1, -1], [-12, -1, -1]]], batch('batch'), spatial('y,x')), msg=backend.name)
+
+    def test_gather_batched(self):
+        for backend in BACKENDS:
+            with backend:
+                values = math.tensor([[0, 1, 2], [10, 11, 12]], batch('batch'), spatial('x'))
+                indices = math.wrap([(2,), (0,)], collection('points'), channel('vector'))
+                math.assert_close(math.gather(values, indices), math.tensor([[2, 0], [12, 10]], batch('batch'), collection('points')), msg=backend.name)
+                indices = math.wrap([[(2,), (0,)], [(1,), (1,)]], batch('batch'), collection('points'), channel('vector'))
+                math.assert_close(math.gather(values, indices), math.tensor([[2, 0], [11, 11]], batch('batch'), collection('points')), msg=backend.name)
+                values = math.tensor([0, 1, 2], spatial('x'))
+                math.assert_close(math.gather(values, indices), math.tensor([[2, 0], [1, 1]], batch('batch'), collection('points')), msg=backend.name)
+
     def test_scatter_2d_clamp(self):
         base = math.ones(spatial(x=3, y=2))
         indices = math.wrap([(-1, 0), (0, 2), (4, 3)], collection('points'), channel('vector'))
@@ -462,8 +486,45 @@ class TestMathFunctions(TestCase):
                     [[1, 2, 3], [11, 12, 13]]], channel('out'), batch('batch'), spatial('x'))
                 math.assert_close(math.convolve(x, kernel, math.extrapolation.ZERO), expected, msg=backend.name)
 
-    # def test_convolution_2d(self):  # TODO
-    #     pass
+    def test_convolution_2d(self):
+        for backend in BACKENDS:
+            with backend:
+                for size in (3, 15):  # the NumPy backend uses im2col for small and FFT for large kernels
+                    x = math.random_normal(batch(batch=2), spatial(x=24, y=20), channel(vector=2))
+                    kernel = math.random_normal(spatial(x=size, y=size), channel(vector=2, out=3))
+                    expected = sum([x.x[i:i + 25 - size].y[j:j + 21 - size] * kernel.x[i].y[j] for i in range(size) for j in range(size)])
+                    expected = math.sum(expected, 'vector')
+                    math.assert_close(math.convolve(x, kernel), expected, abs_tolerance=1e-3, msg=backend.name)
+                    math.assert_close(math.convolve(x, kernel, strides={'x': 2, 'y': 3}), expected.x[::2].y[::3], abs_tolerance=1e-3, msg=backend.name)
+                    padded = math.pad(x, {'x': (size // 2, size // 2), 'y': (size // 2, size // 2)}, math.extrapolation.ZERO)
+                    math.assert_close(math.convolve(x, kernel, math.extrapolation.ZERO), math.convolve(padded, kernel), abs_tolerance=1e-3, msg=backend.name)
+                    for extrapolation in (math.extrapolation.PERIODIC, math.extrapolation.BOUNDARY):
+                        padded = math.pad(x, {'x': (size // 2, size // 2), 'y': (size // 2, size // 2)}, extrapolation)
+                        result = math.convolve(x, kernel, extrapolation)
+                        self.assertEqual(x.shape.spatial, result.shape.spatial)
+                        math.assert_close(result, math.convolve(padded, kernel), abs_tolerance=1e-3, msg=f"{backend.name} {extrapolation}")
+
+    def test_convolution_vs_scipy(self):
+        import scipy.signal
+        from phi.math.backend import NUMPY
+        value = np.random.randn(2, 3, 16, 12).astype(np.float32)
+        kernel = np.random.randn(1, 4, 3, 3, 3).astype(np.float32)
+        expected = [[sum([scipy.signal.correlate(value[b, i], kernel[0, o, i], mode='same') for i in range(3)]) for o in range(4)] for b in range(2)]
+        np.testing.assert_allclose(NUMPY.conv(value, kernel, zero_padding=True), np.array(expected), rtol=1e-3, atol=1e-3)
+
+    def test_convolution_im2col_chunks(self):
+        from phi.math.backend import _numpy_backend
+        value = np.random.randn(3, 2, 9, 8).astype(np.float32)
+        kernel = np.random.randn(3, 4, 2, 3, 3).astype(np.float32)
+        expected = _numpy_backend._im2col_conv(value, kernel, (1, 1))
+        strided = _numpy_backend._im2col_conv(value, kernel[:1], (2, 3))
+        chunk_bytes = _numpy_backend._IM2COL_CHUNK_BYTES
+        try:
+            for _numpy_backend._IM2COL_CHUNK_BYTES in (1, 3 * 432, 7 * 432, 14 * 432):  # 432 bytes per output row: single rows, three rows, one and two batch entries
+                np.testing.assert_allclose(expected, _numpy_backend._im2col_conv(value, kernel, (1, 1)), rtol=1e-5, atol=1e-5)
+                np.testing.assert_allclose(strided, _numpy_backend._im2col_conv(value, kernel[:1], (2, 3)), rtol=1e-5, atol=1e-5)
+        finally:
+            _numpy_backend._IM2COL_CHUNK_BYTES = chunk_bytes
 
     def test_reshaped_native(self):
         a = math.random_uniform(channel(vector=2) & spatial(x=4, y=3))
@@ -0,0 +1,66 @@
+import os
+from unittest import TestCase, skipUnless
+
+import numpy
+
+from phi import math, field
+from phi.field import CenteredGrid
+from phi.math import extrapolation, spatial, batch
+
+
+def _square_and_increment(x):
+    return x ** 2, x + 1
+
+
+def _scaled_laplace(grid, factor):
+    return field.laplace(grid) * factor
+
+
+def _fail_on_three(x):
+    if math.all(x == 3):
+        raise ValueError("three")
+    return x * 2
+
+
+class TestParallel(TestCase):
+
+    def test_parallel_map_tensors(self):
+        x = math.range(batch('b'), 5) * math.ones(spatial(x=3))
+        for workers in (0, 2):
+            sq, inc = math.parallel_map(_square_and_increment, x, dim='b', workers=workers)
+            math.assert_close(sq, x ** 2)
+            math.assert_close(inc, x + 1)
+            self.assertEqual(x.shape, sq.shape)
+
+    def test_parallel_map_fields(self):
+        grid = CenteredGrid(math.random_normal(batch(b=4), spatial(x=8, y=8)), extrapolation.ZERO)
+        factor = math.wrap([1, 2, 3, 4], batch('b'))
+        result = field.parallel_map(_scaled_laplace, grid, factor, dim=batch('b'), workers=2)
+        self.assertIsInstance(result, CenteredGrid)
+        field.assert_close(result, field.laplace(grid) * factor)
+
+    def test_parallel_map_dim_position(self):
+        x = math.tensor(numpy.arange(15).reshape((3, 5)), spatial('x'), batch('b'))
+        for workers in (0, 2):
+            sq, inc = math.parallel_map(_square_and_increment, x, dim='b', workers=workers)
+            self.assertEqual(x.shape, sq.shape)
+            math.assert_close(sq, x ** 2)
+
+    def test_parallel_map_without_shared_memory(self):
+        from phi.math import _parallel
+        shared_memory = _parallel.SharedMemory
+        _parallel.SharedMemory = None  # as on Python < 3.8
+        try:
+            x = math.range(batch('b'), 5) * math.ones(spatial(x=3))
+            sq, inc = math.parallel_map(_square_and_increment, x, dim='b', workers=2)
+            math.assert_close(sq, x ** 2)
+        finally:
+            _parallel.SharedMemory = shared_memory
+
+    @skipUnless(os.path.isdir('/dev/shm'), "Shared memory blocks are listed in /dev/shm on Linux only")
+    def test_parallel_map_error_releases_shared_memory(self):
+        before = set(os.listdir('/dev/shm'))
+        x = math.range(batch('b'), 8) * math.ones(spatial(x=100))
+        with self.assertRaises(ValueError):
+            math.parallel_map(_fail_on_three, x, dim='b', workers=2)
+        self.assertEqual(set(), set(os.listdir('/dev/shm')) - before)
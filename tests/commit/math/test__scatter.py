@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import phi
+from phi import math
+from phi.math import spatial, channel, batch, collection
+from phi.math.backend import choose_backend, Backend
+
+
+BACKENDS = phi.detect_backends()
+
+
+class TestScatterPlan(TestCase):
+
+    def test_scatter_matches_math_scatter(self):
+        resolution = spatial(x=6, y=5)
+        indices = math.random_uniform(collection(points=40), channel(vector=2)) * (8, 7) - 1
+        values = math.random_normal(batch(b=2), collection(points=40), channel(vector=2))
+        plan = math.ScatterPlan(resolution, indices)
+        base = math.random_normal(batch(b=2), resolution, channel(vector=2))
+        for mode in ('add', 'mean', 'max', 'min'):
+            math.assert_close(plan.scatter(values, mode, base), math.scatter(base, indices, values, mode=mode), msg=mode)
+        math.assert_close(plan.scatter(values), math.scatter(math.zeros(resolution), indices, values, mode='add'))
+        counts = plan.scatter(1)
+        self.assertEqual(plan.occupied_cells, math.sum(counts > 0, 'x,y').sum)
+
+    def test_scatter_batched_indices(self):
+        resolution = spatial(x=6, y=5)
+        indices = math.random_uniform(batch(b=2), collection(points=40), channel(vector=2)) * (8, 7) - 1
+        values = math.random_normal(batch(b=2), collection(points=40))
+        plan = math.ScatterPlan(resolution, indices)
+        for mode in ('add', 'mean'):
+            scattered = plan.scatter(values, mode, math.zeros(resolution))
+            for b in range(2):
+                math.assert_close(scattered.b[b], math.scatter(math.zeros(resolution), indices.b[b], values.b[b], mode=mode), msg=mode)
+
+    def test_scatter_default_base(self):
+        resolution = spatial(x=6, y=5)
+        indices = math.to_int32(math.random_uniform(collection(points=10), channel(vector=2)) * (6, 5))
+        values = -1 - math.random_uniform(collection(points=10))
+        plan = math.ScatterPlan(resolution, indices)
+        for mode in ('add', 'mean', 'max', 'min', 'update'):
+            expected = math.scatter(resolution, indices, values, mode=mode)
+            math.assert_close(math.where(math.isfinite(expected), expected, 0), math.where(math.isfinite(expected), plan.scatter(values, mode), 0), msg=mode)
+            math.assert_close(math.isfinite(expected), math.isfinite(plan.scatter(values, mode)), msg=mode)
+
+    def test_scatter_update_uses_last(self):
+        plan = math.ScatterPlan(spatial(x=4), math.wrap([1, 2, 1], collection('points')))
+        math.assert_close(plan.scatter(math.wrap([5, 6, 7], collection('points')), 'update', math.ones(spatial(x=4))), [1, 7, 6, 1])
+
+    def test_gather_adjoint(self):
+        resolution = spatial(x=6, y=5)
+        indices = math.random_uniform(collection(points=30), channel(vector=2)) * (8, 7) - 1
+        plan = math.ScatterPlan(resolution, indices)
+        grid = math.random_normal(resolution)
+        values = math.random_normal(collection(points=30))
+        gathered = plan.gather(grid)
+        inside = math.min((math.round(indices) >= 0) & (math.round(indices) < (6, 5)), 'vector')
+        math.assert_close(gathered, math.where(inside, math.gather(grid, math.to_int32(math.clip(math.round(indices), 0, (5, 4)))), 0))
+        math.assert_close(math.sum(gathered * values), math.sum(plan.scatter(values) * grid))
+
+    def test_numpy_indices_other_backend_values(self):
+        resolution = spatial(x=6, y=5)
+        indices = math.random_uniform(collection(points=30), channel(vector=2)) * (8, 7) - 1
+        plan = math.ScatterPlan(resolution, indices)
+        values = math.random_normal(collection(points=30))
+        base = math.zeros(resolution)
+        expected = {mode: math.scatter(base, indices, values, mode=mode) for mode in ('add', 'mean', 'max')}
+        weights = math.random_normal(resolution)
+        expected_grad = plan.gather(weights)
+        for backend in BACKENDS:
+            with backend:
+                backend_values, backend_base = math.tensor(values), math.tensor(base)
+                for mode, expected_grid in expected.items():
+                    scattered = plan.scatter(backend_values, mode, backend_base)
+                    self.assertIs(backend, choose_backend(scattered.native(scattered.shape.names)), msg=f"{backend} {mode}")
+                    math.assert_close(scattered, expected_grid, msg=f"{backend} {mode}")
+                gathered = plan.gather(backend_base + 1)
+                self.assertIs(backend, choose_backend(gathered.native(gathered.shape.names)), msg=backend.name)
+                if backend.supports(Backend.functional_gradient):
+                    grad, = math.functional_gradient(lambda v: math.sum(plan.scatter(v, 'add', backend_base) * weights), get_output=False)(backend_values)
+                    math.assert_close(grad, expected_grad, msg=backend.name)
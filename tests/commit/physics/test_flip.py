@@ -47,3 +47,12 @@ class FlipTest(TestCase):
         assert math.all(~(~DOMAIN.bounds).lies_inside(PARTICLES.points))
 
 
+
+    def test_respect_boundaries_sorted(self):
+        DOMAIN = Domain(x=16, y=16, boundaries=STICKY, bounds=Box[0:16, 0:16])
+        PARTICLES = DOMAIN.distribute_points(union(Box[2:14, 2:8])) * (1, 0)
+        sorted_particles = flip.respect_boundaries(PARTICLES, DOMAIN, [], sort=True)
+        math.assert_close((PARTICLES >> DOMAIN.staggered_grid()).values, (sorted_particles >> DOMAIN.staggered_grid()).values)
+        state = dict(particles=sorted_particles, domain=DOMAIN, dt=0.05, accessible=DOMAIN.accessible_mask([], type=StaggeredGrid))
+        state = step(**state)
+        self.assertEqual(PARTICLES.points.shape, state['particles'].points.shape)
@@ -3,10 +3,11 @@ from unittest import TestCase
 import phi
 from phi import math, field
 from phi.geom import Box, Sphere
-from phi.field import StaggeredGrid, CenteredGrid, divergence, Noise
+from phi.field import StaggeredGrid, CenteredGrid, divergence, Noise, HardGeometryMask, SoftGeometryMask
 from phi.math import batch
 from phi.math.backend import Backend
 from phi.physics import fluid
+from phi.physics._boundaries import Obstacle
 
 
 BACKENDS = phi.detect_backends()
@@ -45,6 +46,18 @@ class FluidTest(TestCase):
         self._test_make_incompressible(StaggeredGrid, math.extrapolation.PERIODIC)
         self._test_make_incompressible(StaggeredGrid, math.extrapolation.PERIODIC, batch3=3, batch2=2)
 
+    def test_make_incompressible_obstacles(self):
+        obstacles = [Obstacle(Sphere(center=(30, 40), radius=10)), Obstacle(Box[60:70, 10:80], velocity=(1, 0))]
+        velocity = StaggeredGrid(Noise(vector=2), math.extrapolation.ZERO, x=32, y=32, bounds=Box[0:100, 0:100])
+        grid = CenteredGrid(0, math.extrapolation.ZERO, x=32, y=32, bounds=Box[0:100, 0:100])
+        for obstacle in obstacles:  # culled sampling must match sampling all cells
+            for mask in (HardGeometryMask(obstacle.geometry), SoftGeometryMask(obstacle.geometry, balance=1)):
+                math.assert_close((mask >> grid).values, mask._sample_all(grid.elements))
+        v1, _ = fluid.make_incompressible(velocity, obstacles)
+        v2, _ = fluid.make_incompressible(velocity, obstacles)  # uses cached mask of stationary obstacle
+        field.assert_close(v1, v2)
+        math.assert_close(field.sample(v1, Sphere(center=(30, 40), radius=1)), 0, abs_tolerance=1e-5)
+
     def test_make_incompressible_gradients_equal_tf_torch(self):
         velocity0 = StaggeredGrid(Noise(), math.extrapolation.ZERO, x=16, y=16, bounds=Box[0:100, 0:100])
         grads = []
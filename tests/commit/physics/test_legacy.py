@@ -41,6 +41,23 @@ class TestLegacyPhysics(TestCase):
         world.step(dt=0.5)
         assert fluid.age == fan.age == obstacle.age == 1.5
 
+    def test_collective_physics_schedule(self):
+        world = World()
+        fluid = world.add(Fluid(Domain(x=16, y=16)), physics=IncompressibleFlow())
+        inflow = world.add(Inflow(Sphere((8, 8), radius=4)))
+        fan = world.add(Fan(Sphere((10, 8), 5), [-1, 0]))
+        schedule = world.physics.schedule(world.state)
+        self.assertEqual(2, len(schedule))
+        self.assertEqual((fluid.state.name,), schedule[-1])
+        self.assertIn(inflow.state.name, schedule[0])
+        self.assertIn(fan.state.name, schedule[0])
+        self.assertIs(schedule, world.physics.schedule(world.state))
+        world.physics.max_workers = 4
+        world.step()
+        world.step()
+        self.assertEqual(set(world.state.keys()), set(world.physics.step_times.keys()))
+        assert fluid.age == fan.age == inflow.age == 2
+
     def test_properties_dict(self):
         world = World()
         world.add(Fluid(Domain(x=16, y=16)), physics=IncompressibleFlow())
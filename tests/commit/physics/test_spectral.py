@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from phi import math
+from phi.field import CenteredGrid, Noise
+from phi.geom import Box
+from phi.math import extrapolation, batch
+from phi.physics import diffuse, spectral
+
+
+class TestSpectral(TestCase):
+
+    def test_linear_part_exact(self):
+        grid = CenteredGrid(Noise(batch(batch=2)), extrapolation.PERIODIC, x=16, y=8, bounds=Box[0:16, 0:8])
+        linear = 0.5 * spectral.laplace_symbol(grid)
+        for integrator in (spectral.etdrk4, spectral.if_rk4):
+            result = integrator(grid, 2, linear, lambda u: u * 0)
+            math.assert_close(result.values, diffuse.fourier(grid, 0.5, 2).values, abs_tolerance=1e-5)
+
+    def test_constant_forcing(self):
+        with math.precision(64):
+            u0 = CenteredGrid(Noise(), extrapolation.PERIODIC, x=32, bounds=Box[0:10])
+            forcing = CenteredGrid(Noise(), extrapolation.PERIODIC, x=32, bounds=Box[0:10])
+            linear = -0.1 + 0.2 * spectral.laplace_symbol(u0)
+            # exact solution of du/dt = L u + f
+            exact = math.real(math.ifft(math.exp(linear) * math.fft(u0.values) + (math.exp(linear) - 1) / linear * math.fft(forcing.values)))
+            u, f = spectral.etdrk4((u0, forcing), 1, (linear, 0), lambda state: (state[1], state[1] * 0))
+            math.assert_close(u.values, exact, abs_tolerance=1e-8)
+            math.assert_close(f.values, forcing.values)
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from os.path import dirname, abspath
+from unittest import TestCase
+
+PROJECT_DIR = dirname(dirname(dirname(abspath(__file__))))
+HEAVY_MODULES = ('matplotlib', 'plotly', 'dash', 'scipy.signal', 'scipy.sparse', 'scipy.fft', 'torch', 'tensorflow', 'jax')
+
+
+def _run(code: str) -> list:
+    return subprocess.check_output([sys.executable, '-c', code], cwd=PROJECT_DIR, universal_newlines=True).strip().split('\n')
+
+
+class TestImportTime(TestCase):
+
+    def test_flow_import_is_lazy(self):
+        time, loaded = _run(f"import sys, time\n"
+                            f"start = time.perf_counter()\n"
+                            f"from phi.flow import *\n"
+                            f"print(time.perf_counter() - start)\n"
+                            f"print([m for m in {HEAVY_MODULES} if m in sys.modules])")
+        print(f"from phi.flow import *: {float(time) * 1000:.0f} ms")
+        self.assertEqual('[]', loaded)
+
+    def test_lazy_attributes(self):
+        before, after = _run("import sys, os, tempfile\n"
+                             "from phi import vis\n"
+                             "from phi.vis import *\n"
+                             "assert callable(plot) and callable(vis.savefig)\n"
+                             "print('matplotlib' in sys.modules)\n"
+                             "vis.savefig(os.path.join(tempfile.mkdtemp(), 'empty.png'))\n"
+                             "print('matplotlib' in sys.modules)")
+        self.assertEqual(('False', 'True'), (before, after))
@@ -33,3 +33,24 @@ class TestTorchBackend(TestCase):
         self.assertFalse(TORCH.is_tensor(tensorflow.zeros(4), only_native=True))
         self.assertFalse(TORCH.is_tensor([0, 1, 2, 3], only_native=True))
         self.assertFalse(TORCH.is_tensor(np.zeros(4), only_native=True))
+
+    def test_point_cloud_jit_remove_seed(self):
+        from phi.field import PointCloud
+        from phi.geom import Sphere
+        from phi.math import collection, channel
+
+        @math.jit_compile
+        def step(cloud: PointCloud) -> PointCloud:
+            return cloud.with_elements(cloud.elements.shifted(cloud.values))
+
+        with TORCH:
+            points = math.tensor([[0., 0.], [1., 1.], [2., 2.], [3., 3.]], collection('points'), channel('vector'))
+            active = math.tensor([True, True, True, False], collection('points'))
+            cloud = PointCloud(Sphere(points, 0.1), math.ones(collection(points=4), channel(vector=2)), active=active)
+            cloud = step(cloud)
+            cloud = cloud.remove(math.tensor([False, True, False, False], collection('points')))
+            cloud = step(cloud)
+            cloud = cloud.seed(Sphere(math.tensor([[5., 5.], [6., 6.]], collection('points'), channel('vector')), 0.1), 1.)
+            cloud = step(cloud)
+            self.assertEqual(4, cloud.capacity)
+            self.assertEqual(1, len(step.traces))
@@ -0,0 +1,32 @@
+import types
+from unittest import TestCase
+
+from phi.field import CenteredGrid
+from phi.math import extrapolation
+from phi.vis._user_namespace import ModuleNamespace
+from phi.vis._viewer import Viewer
+
+
+class TestDashViewer(TestCase):
+
+    def test_update_figure_frame_key(self):
+        import dash
+        import dash_html_components as html
+        from phi.vis._dash.dash_app import DashApp
+        from phi.vis._dash.viewer import build_viewer
+        module = types.ModuleType('dash_viewer_test')
+        module.grid = CenteredGrid(1, extrapolation.ZERO, x=4, y=3)
+        viewer = Viewer(ModuleNamespace(module), {'grid': module.grid}, 'test', "", None, (), {}, False)
+        app = DashApp(viewer, {}, html.Div())
+        build_viewer(app, 200, 'grid', 'viewer_0', 'viewer')
+        callback, = [c['callback'] for key, c in app.dash.callback_map.items() if 'viewer_0-frame-key.data' in key]
+        update_figure = callback.__wrapped__
+        settings = ('2D', 0, None)  # projection, component, refresh
+        fig, key = update_figure('grid', None, None, *settings, None)
+        self.assertIsNotNone(key)
+        self.assertNotEqual(dash.no_update, fig)
+        self.assertEqual((dash.no_update, dash.no_update), update_figure('grid', None, None, *settings, key))
+        viewer.run_action('reset')  # increments the revision
+        fig2, key2 = update_figure('grid', None, None, *settings, key)
+        self.assertNotEqual(key, key2)
+        self.assertNotEqual(dash.no_update, fig2)
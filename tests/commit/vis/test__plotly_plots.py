@@ -40,3 +40,11 @@ class TestMatplotlibPlots(TestCase):
         fig = plot(cloud)
         assert isinstance(fig, plotly.graph_objs.Figure)
         fig.show()
+
+    def test_plot_large_grid_level_of_detail(self):
+        grid = CenteredGrid(Noise(), extrapolation.ZERO, x=256, y=100, bounds=Box(0, [1, 1]))
+        fig = plot(grid, size=(64, 64))
+        self.assertEqual((50, 64), fig.data[0].z.shape)
+        vector_grid = CenteredGrid(Noise(vector=2), extrapolation.ZERO, x=256, y=256, bounds=Box(0, [1, 1]))
+        fig = plot(vector_grid, size=(64, 64))
+        self.assertEqual(8 * 8 * 3, len(fig.data[0].x))
@@ -0,0 +1,52 @@
+import tracemalloc
+import types
+from unittest import TestCase
+
+from phi import field, math
+from phi.field import CenteredGrid, Noise
+from phi.math import extrapolation, batch
+from phi.vis._user_namespace import ModuleNamespace
+from phi.vis._viewer import Record, Viewer
+
+
+class TestViewer(TestCase):
+
+    def test_record_memory_window(self):
+        rec = Record('frames', memory_frames=2)
+        grid = CenteredGrid(Noise(), extrapolation.ZERO, x=8, y=8)
+        frames = [grid * i for i in range(7)]
+        for frame in frames:
+            rec.append({'grid': frame})
+        self.assertEqual(7, rec.recording_size('grid'))
+        stacked = rec.grid
+        self.assertIs(stacked, rec.grid)
+        math.assert_close(stacked.values, field.stack(frames, batch('frames')).values)
+        math.assert_close(rec.get_snapshot('grid', 1).values, frames[1].values)
+        rec.append({'grid': grid})
+        self.assertIsNot(stacked, rec.grid)
+        self.assertEqual(8, rec.grid.shape.get_size('frames'))
+
+    def test_revision_on_control_and_action(self):
+        module = types.ModuleType('viewer_test')
+        module.value = 0
+        viewer = Viewer(ModuleNamespace(module), {'value': 0}, 'test', "", None, (), {}, False)
+        viewer.set_control_value('value', 1)
+        self.assertEqual(1, viewer.revision)
+        viewer.run_action('reset')
+        self.assertEqual(2, viewer.revision)
+        self.assertEqual(0, viewer.steps)
+
+    def test_record_spilled_frames_not_loaded(self):
+        rec = Record('frames', memory_frames=2)
+        grid = CenteredGrid(0, extrapolation.ZERO, x=256, y=256)
+        for i in range(20):
+            rec.append({'grid': grid + i})
+        frame_bytes = 256 * 256 * 4
+        tracemalloc.start()
+        try:
+            stacked = rec.grid
+            math.assert_close(stacked.values.frames[5], 5)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 4 * frame_bytes)
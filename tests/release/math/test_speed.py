@@ -0,0 +1,59 @@
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from phi import math
+from phi.math import channel
+
+
+class TestSpeed(TestCase):
+
+    def test_choose_backend_cached(self):
+        from phi.math.backend import choose_backend
+        from phi.math.backend._backend import _choose_backend
+        values = (np.ones(4), 1.5)
+        start = time.perf_counter()
+        for _ in range(10000):
+            choose_backend(*values)
+        cached_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(10000):
+            _choose_backend(values, False)
+        uncached_time = time.perf_counter() - start
+        print(f"choose_backend: {cached_time * 100:.3f} us cached, {uncached_time * 100:.3f} us uncached")
+        self.assertLess(cached_time, uncached_time)
+
+    def test_np_speed_sorted_particles(self):
+        from phi.field import PointCloud, CenteredGrid
+        from phi.geom import Box, Sphere
+        from phi.math import collection, extrapolation
+        box = Box[0:1, 0:1, 0:1]
+        grid = CenteredGrid(0, extrapolation.ZERO, box, x=128, y=128, z=128)
+        points = math.random_uniform(collection(points=10 ** 6), channel(vector=3))
+        cloud = PointCloud(Sphere(points, 0), math.random_normal(collection(points=10 ** 6)))
+        sorted_cloud = cloud.sorted_by_cell(box, grid.resolution)
+
+        def transfer(c: PointCloud):
+            start = time.perf_counter()
+            sampled = PointCloud(c.elements, c.values) >> grid  # new PointCloud to exclude cached scatter plans
+            sampled >> c
+            return time.perf_counter() - start
+
+        unsorted_time, sorted_time = transfer(cloud), transfer(sorted_cloud)
+        print(f"scatter + gather of 10^6 particles: {unsorted_time * 1000:.1f} ms unsorted, {sorted_time * 1000:.1f} ms sorted")
+        self.assertLess(sorted_time, unsorted_time)
+
+    def test_np_speed_conv(self):
+        import scipy.signal
+        from phi.math.backend import NUMPY
+        value = np.random.randn(4, 16, 64, 64).astype(np.float32)
+        kernel = np.random.randn(1, 16, 16, 3, 3).astype(np.float32)
+        start = time.perf_counter()
+        NUMPY.conv(value, kernel, zero_padding=True)
+        conv_time = time.perf_counter() - start
+        start = time.perf_counter()
+        [[sum([scipy.signal.correlate(value[b, i], kernel[0, o, i], mode='same') for i in range(16)]) for o in range(16)] for b in range(4)]
+        loop_time = time.perf_counter() - start
+        print(f"conv: {conv_time * 1000:.1f} ms batched, {loop_time * 1000:.1f} ms per channel pair")
+        self.assertLess(conv_time, loop_time)
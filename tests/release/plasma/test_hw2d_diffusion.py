@@ -0,0 +1,24 @@
+from unittest import TestCase
+
+import numpy as np
+
+from phi import math, field
+from phi.field import CenteredGrid
+from phi.geom import Box
+from phi.math import extrapolation, spatial
+from .numpy_reference import periodic_laplace_func
+
+
+class TestHW2DDiffusion(TestCase):
+
+    def test_hyperdiffusion_vs_numpy(self):
+        """ The repeated `field.laplace` of `phi_version` and `demos/hw2d.py` must match the NumPy reference for dx != 1. """
+        with math.precision(64):
+            L, N = 2 * np.pi / 0.15, 3
+            values = np.random.randn(64, 64)
+            grid = CenteredGrid(math.tensor(values, spatial('x,y')), extrapolation.PERIODIC, Box[0:L, 0:L])
+            reference = values
+            for _ in range(N):
+                grid = field.laplace(grid)
+                reference = periodic_laplace_func(reference, L / 64)
+            math.assert_close(grid.values, math.tensor(reference, spatial('x,y')), rel_tolerance=1e-9)
@@ -0,0 +1,86 @@
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from phi import math, field
+from phi.field import CenteredGrid
+from phi.geom import Box
+from phi.math import extrapolation, spatial
+from phi.physics import spectral
+
+# Hasegawa-Wakatani parameters as in demos/hw2d.py
+K0 = 0.15
+RESOLUTION = 64
+C1 = 0.1
+ARAKAWA_COEFF = 1
+KAPPA_COEFF = 1
+NU = 0.0005
+N = 3
+L = 2 * np.pi / K0
+DX = L / RESOLUTION
+END_TIME = 2.
+
+
+def initial_state():
+    np.random.seed(0)
+    domain = dict(extrapolation=extrapolation.PERIODIC, bounds=Box[0:L, 0:L])
+    density = CenteredGrid(math.tensor(np.random.randn(RESOLUTION, RESOLUTION) / 100, spatial('x,y')), **domain)
+    omega = CenteredGrid(math.tensor(np.random.randn(RESOLUTION, RESOLUTION) / 100, spatial('x,y')), **domain)
+    return density, omega
+
+
+def nonlinear(state):
+    """ Hasegawa-Wakatani time derivative without hyperdiffusion. """
+    density, omega = state
+    phi = omega.with_values(math.fourier_poisson(omega.values, DX))
+    dy_phi = field.spatial_gradient(phi).vector['y']
+    diff = phi - density
+    d_omega = C1 * diff - ARAKAWA_COEFF * omega.with_values(math._nd._periodic_2d_arakawa_poisson_bracket(phi.values, omega.values, DX))
+    d_density = C1 * diff - ARAKAWA_COEFF * density.with_values(math._nd._periodic_2d_arakawa_poisson_bracket(phi.values, density.values, DX)) - KAPPA_COEFF * dy_phi
+    return d_density, d_omega
+
+
+def hyperdiffusion_symbol(grid):
+    return (-1) ** (N + 1) * NU * spectral.laplace_symbol(grid, N)
+
+
+def rk4(state, dt):
+    """ Explicit reference integrator. The hyperdiffusion is evaluated in Fourier space to match the operator of the spectral integrators. """
+    def derivative(state):
+        return tuple(n + u.with_values(math.real(math.ifft(math.fft(u.values) * hyperdiffusion_symbol(u)))) for n, u in zip(nonlinear(state), state))
+
+    def add(state, delta, factor):
+        return tuple(u + factor * d for u, d in zip(state, delta))
+
+    k1 = derivative(state)
+    k2 = derivative(add(state, k1, dt / 2))
+    k3 = derivative(add(state, k2, dt / 2))
+    k4 = derivative(add(state, k3, dt))
+    return tuple(u + dt / 6 * (d1 + 2 * d2 + 2 * d3 + d4) for u, d1, d2, d3, d4 in zip(state, k1, k2, k3, k4))
+
+
+def run(step, dt):
+    state = initial_state()
+    t0 = time.perf_counter()
+    for _ in range(int(round(END_TIME / dt))):
+        state = step(state, dt)
+    return state, time.perf_counter() - t0
+
+
+class TestHW2DSpectral(TestCase):
+
+    def test_hw2d_exponential_integrators(self):
+        with math.precision(64):
+            linear = hyperdiffusion_symbol(initial_state()[0])
+            reference, reference_time = run(rk4, 0.01)
+            print(f"RK4       dt=0.01   {reference_time:.3f} s")
+            for dt, tolerance in ((0.1, 1e-6), (0.25, 1e-5), (0.5, 2e-3)):
+                for name, integrator in [('ETDRK4', spectral.etdrk4), ('IF-RK4', spectral.if_rk4)]:
+                    result, duration = run(lambda state, dt: integrator(state, dt, linear, nonlinear), dt)
+                    error = max(float(math.max(abs(r.values - ref.values))) for r, ref in zip(result, reference))
+                    scale = max(float(math.max(abs(ref.values))) for ref in reference)
+                    print(f"{name:<9} dt={dt:<6} {duration:.3f} s  relative error {error / scale:.2e}")
+                    self.assertLess(error / scale, tolerance)
+            unstable, _ = run(rk4, 0.1)
+            self.assertFalse(np.max(np.abs(unstable[0].values.numpy('x,y'))) < 1, "Explicit RK4 is expected to be unstable at dt=0.1")